@@ -5,17 +5,38 @@ from .fill_mode import fill_mode
 from .fill_constant import fill_constant
 from .forward_fill import forward_fill
 from .backward_fill import backward_fill
+from .impute import impute
 from .normalize_columns import normalize_columns
 from .combine_datasets import combine_datasets
+from .join_datasets import join_datasets
+from .lazy_io import scan_data, collect_data, normalize_key_expr, sample_data
 from .duplicate import duplicate
-from .standardize_dates import standardize_dates
+from .near_duplicates import near_duplicates
+from .name_keys import name_keys, name_key_expr
+from .dates_standardization import dates_standardization
+from .date_parser import parse_dates, parse_dates_expr, detect_date_formats
 from .country_standardization import country_standardization
-from .translate_categories import translate_categories
-from .numbers_standardization import numbers_standardization
+from .translate_categories import translate_categories, translate_categories_expr
+from .category_dictionaries import (
+    register_category_dictionary,
+    list_category_dictionaries,
+    compile_category_dictionaries,
+)
+from .numbers_standardization import standardize_numbers as numbers_standardization
+from .numbers_standardization import standardize_numbers_expr
 from .outlier_handler import outlier_handler
 from .outlier_isolation import outlier_isolation
+from .isolation_model import (
+    fit_isolation_model,
+    save_isolation_model,
+    load_isolation_model,
+    score_isolation_model,
+)
 from .auto_text_cleaner import auto_text_cleaner
+from .cleaning_pipeline import CleaningPipeline
 from .geocode import geocode
+from .geocode_cache import GeocodeCache
+from .gazetteer import Gazetteer
 from .admin_boundaries import admin_boundaries
 
 
@@ -28,16 +49,40 @@ __all__ = [
     "fill_constant",
     "forward_fill",
     "backward_fill",
+    "impute",
     "normalize_columns",
     "combine_datasets",
+    "join_datasets",
+    "scan_data",
+    "collect_data",
+    "normalize_key_expr",
+    "sample_data",
     "duplicate",
+    "near_duplicates",
+    "name_keys",
+    "name_key_expr",
     "dates_standardization",
+    "parse_dates",
+    "parse_dates_expr",
+    "detect_date_formats",
     "country_standardization",
     "translate_categories",
+    "translate_categories_expr",
+    "register_category_dictionary",
+    "list_category_dictionaries",
+    "compile_category_dictionaries",
     "numbers_standardization",
+    "standardize_numbers_expr",
     "outlier_handler",
     "outlier_isolation",
+    "fit_isolation_model",
+    "save_isolation_model",
+    "load_isolation_model",
+    "score_isolation_model",
     "auto_text_cleaner",
+    "CleaningPipeline",
     "geocode",
+    "GeocodeCache",
+    "Gazetteer",
     "admin_boundaries",
 ]
@@ -1,26 +1,75 @@
+import hashlib
+import os
+from difflib import SequenceMatcher
+import numpy as np
 import polars as pl
-from fuzzywuzzy import process
+from .category_dictionaries import normalize_category_expr
+from .name_keys import name_key_expr
 
-def admin_boundaries(df, country_col="country", adm1_col="province", adm2_col="district", threshold=80):
+# Score given to matches found through the phonetic name key
+PHONETIC_MATCH_SCORE = 95
+
+DEFAULT_ADMIN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "huda")
+
+# OCHA COD naming (ADM2 table carries the names and P-codes of its parents)
+DEFAULT_REFERENCE_COLUMNS = {
+    "adm0": ("ADM0_EN", "ADM0_PCODE"),
+    "adm1": ("ADM1_EN", "ADM1_PCODE"),
+    "adm2": ("ADM2_EN", "ADM2_PCODE"),
+}
+
+
+def admin_boundaries(
+    df,
+    country_col="country",
+    adm1_col="province",
+    adm2_col="district",
+    threshold=80,
+    reference=None,
+    reference_columns=None,
+    cache_dir=DEFAULT_ADMIN_CACHE_DIR,
+):
     """
-    🗺 Autonomous Admin Boundaries Resolver (ADM0–ADM2)
-    =====================================================
+    🗺 Admin Boundaries Resolver (ADM0–ADM2)
+    =========================================
 
     💡 What it does:
     ----------------
-    - Automatically detects and fixes inconsistent spellings of provinces and districts
-    - Works without any external reference dataset
-    - Uses fuzzy string matching to map similar names together
-    - Adds standardized ADM columns: 'adm0', 'adm1', 'adm2'
+    - Fixes inconsistent spellings of countries, provinces and districts
+    - With a `reference` admin hierarchy (e.g. OCHA COD table with P-codes):
+      matches every name to the official name and adds P-code columns
+    - Without a reference: maps rare spellings to the most frequent similar
+      spelling found in the data itself
+    - Adds standardized columns: 'Admin_0_Name', 'Admin_1_Name', 'Admin_2_Name'
+      (+ 'Admin_0_Pcode', 'Admin_1_Pcode', 'Admin_2_Pcode' with a reference)
+
+    ⚡ How it stays fast:
+    ---------------------
+    - Only unique (parent, name) values are matched, never every row
+    - Exact normalized names are resolved with a hash join first, then names
+      with the same phonetic key ("Mazar-i-Sharif" = "مزار شریف", see `name_keys`;
+      scored 95, so skipped when `threshold` is above 95)
+    - Fuzzy candidates are blocked by parent admin unit (districts of the
+      matched province only) and by a normalized/phonetic prefix key
+    - Each block is scored at once as a character-bigram similarity matrix (NumPy);
+      only the top few candidates per name get a final edit-distance ratio
+    - Matches are cached on disk per reference table and reused across runs
 
     🧾 Parameters:
     ----------------
     - df : pl.DataFrame
         Dataset with country, province, and district columns
-    - country_col, adm1_col, adm2_col : str
-        Columns containing country, province, and district names
+    - country_col, adm1_col, adm2_col : str | None
+        Columns containing country, province, and district names (None → skip level)
     - threshold : int
-        Fuzzy matching threshold (0–100) for considering names as similar
+        Similarity threshold (0–100) for accepting a fuzzy match
+    - reference : str | pl.DataFrame | None
+        Admin hierarchy table (CSV / Parquet path or DataFrame), one row per ADM2
+    - reference_columns : dict | None
+        {"adm0": (name_col, pcode_col), "adm1": (...), "adm2": (...)};
+        defaults to ADM0_EN / ADM0_PCODE ... ADM2_EN / ADM2_PCODE
+    - cache_dir : str | None
+        Folder for the persistent match cache (None → no cache)
 
     🧠 Example Usage:
     -----------------
@@ -32,41 +81,274 @@ def admin_boundaries(df, country_col="country", adm1_col="province", adm2_col="d
         "district": ["Kabul", "Kabool", "Herat"]
     })
 
+    # Against the official hierarchy (recommended)
+    df_clean = admin_boundaries(df, reference="afg_adm2_cod.csv")
+
+    # Data-driven only
     df_clean = admin_boundaries(df, country_col = "country", adm1_col = "province", adm2_col = "district", threshold=80)
     print(df_clean)
     """
     try:
-        # ✅ Normalize text
-        df = df.with_columns([
-            pl.col(country_col).str.strip_chars().str.to_lowercase().alias("adm0_raw"),
-            pl.col(adm1_col).str.strip_chars().str.to_lowercase().alias("adm1_raw"),
-            pl.col(adm2_col).str.strip_chars().str.to_lowercase().alias("adm2_raw"),
-        ])
-
-        # ✅ Create unique lists for matching
-        unique_countries = df["adm0_raw"].unique().to_list()
-        unique_provinces = df["adm1_raw"].unique().to_list()
-        unique_districts = df["adm2_raw"].unique().to_list()
-
-        # ✅ Define fuzzy match function
-        def match_name(name, choices, threshold=threshold):
-            if name is None or name == "":
-                return None
-            match = process.extractOne(name, choices)
-            if match and match[1] >= threshold:
-                return match[0]
-            return name
-
-        # ✅ Apply matching using Polars map_elements (NOT apply)
-        df = df.with_columns([
-            pl.col("adm0_raw").map_elements(lambda x: match_name(x, unique_countries), return_dtype=pl.Utf8).alias("Admin_0_Name"),
-            pl.col("adm1_raw").map_elements(lambda x: match_name(x, unique_provinces), return_dtype=pl.Utf8).alias("Admin_1_Name"),
-            pl.col("adm2_raw").map_elements(lambda x: match_name(x, unique_districts), return_dtype=pl.Utf8).alias("Admin_2_Name"),
-        ])
-
-        print("✅ Administrative boundaries resolved autonomously (ADM0–ADM2)")
-        return df.drop(["adm0_raw", "adm1_raw", "adm2_raw"])
+        levels = [("adm0", country_col), ("adm1", adm1_col), ("adm2", adm2_col)]
+        levels = [(lvl, col) for lvl, col in levels if col is not None and col in df.columns]
+        if not levels:
+            raise ValueError("No admin columns found in the dataset.")
+
+        ref = _load_reference(reference, reference_columns) if reference is not None else None
+        cache = _MatchCache(cache_dir, ref, threshold) if (ref is not None and cache_dir) else None
+
+        parent_col = None
+        work = df.with_row_index("__huda_row")
+
+        for lvl, col in levels:
+            n = lvl[-1]
+            key_col, name_col, pcode_col = f"__huda_key_{n}", f"Admin_{n}_Name", f"Admin_{n}_Pcode"
+
+            # Parent of this level: matched P-code (or name) of the level above, "" if none
+            parent = pl.col(parent_col).cast(pl.Utf8).fill_null("") if parent_col else pl.lit("")
+            work = work.with_columns([_key_expr(pl.col(col)).alias(key_col), parent.alias("__huda_parent")])
+            queries = (
+                work.select([
+                    pl.col("__huda_parent").alias("parent"),
+                    pl.col(key_col).alias("key"),
+                    pl.col(col).cast(pl.Utf8).str.strip_chars().alias("raw"),
+                ])
+                .filter(pl.col("key").is_not_null() & (pl.col("key") != ""))
+                .group_by(["parent", "key"])
+                .agg([pl.len().alias("count"), pl.col("raw").mode().first().alias("raw")])
+            )
+
+            if ref is not None:
+                matches = cache.lookup(lvl, queries) if cache else None
+                todo = queries if matches is None else queries.join(matches.select(["parent", "key"]), on=["parent", "key"], how="anti")
+                new = _match_reference(todo, ref[lvl], threshold)
+                if cache:
+                    cache.store(lvl, new)
+                matches = new if matches is None else pl.concat([matches, new])
+                next_parent = pcode_col
+            else:
+                matches = _match_self(queries, threshold)
+                next_parent = name_col
+
+            work = work.join(
+                matches.select([
+                    pl.col("parent").alias("__huda_parent"),
+                    pl.col("key").alias(key_col),
+                    pl.col("name").alias(name_col),
+                    *([pl.col("pcode").alias(pcode_col)] if ref is not None else []),
+                ]),
+                on=["__huda_parent", key_col],
+                how="left",
+            ).drop([key_col, "__huda_parent"])
+            parent_col = next_parent
+
+        if cache:
+            cache.save()
+
+        df_out = work.sort("__huda_row").drop("__huda_row")
+        df_out = df_out.select([c for c in df_out.columns if not c.startswith("__huda_")])
+        print("✅ Administrative boundaries resolved (ADM0–ADM2)" + (" against reference hierarchy" if ref is not None else ""))
+        return df_out
 
     except Exception as e:
         print("⚠️ Error resolving admin boundaries:", e)
         return df
+
+
+def _key_expr(expr):
+    """Normalized matching key: case, punctuation, letter variants and spaces unified."""
+    return normalize_category_expr(expr).str.replace_all(" ", "")
+
+
+def _block_key(key):
+    """Coarse phonetic prefix (first sound class) used to block fuzzy candidates."""
+    if not key:
+        return ""
+    c = key[0]
+    classes = {"a": "aeiouy", "k": "ckq", "s": "sz", "w": "vw", "g": "gj", "d": "dt", "b": "bp"}
+    for k, members in classes.items():
+        if c in members:
+            return k
+    return c
+
+
+def _bigram_matrix(keys, vocab):
+    mat = np.zeros((len(keys), len(vocab)), dtype=np.float32)
+    for i, key in enumerate(keys):
+        padded = f"^{key}$"
+        for j in range(len(padded) - 1):
+            mat[i, vocab[padded[j:j + 2]]] = 1.0
+    return mat
+
+
+def _similarity(query_keys, cand_keys):
+    """Dice similarity (0–100) of character-bigram sets, for all pairs in one matrix product."""
+    vocab = {}
+    for key in list(query_keys) + list(cand_keys):
+        padded = f"^{key}$"
+        for j in range(len(padded) - 1):
+            vocab.setdefault(padded[j:j + 2], len(vocab))
+    q = _bigram_matrix(query_keys, vocab)
+    c = _bigram_matrix(cand_keys, vocab)
+    inter = q @ c.T
+    sizes = q.sum(axis=1)[:, None] + c.sum(axis=1)[None, :]
+    return 200.0 * inter / np.maximum(sizes, 1.0)
+
+
+def _best_matches(query_keys, cand_keys, allowed=None, top_k=3):
+    """
+    Best candidate per query: shortlist the top-k by bigram matrix similarity,
+    then score the shortlist with the edit-based ratio (0–100, fuzzywuzzy scale).
+    """
+    sims = _similarity(query_keys, cand_keys)
+    if allowed is not None:
+        sims = np.where(allowed, sims, -1.0)
+    k = min(top_k, sims.shape[1])
+    shortlist = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+
+    best_idx = np.full(len(query_keys), -1)
+    best_score = np.zeros(len(query_keys))
+    for i, q in enumerate(query_keys):
+        for j in shortlist[i]:
+            if sims[i, j] < 0:
+                continue
+            score = 100.0 * SequenceMatcher(None, q, cand_keys[j]).ratio()
+            if score > best_score[i]:
+                best_idx[i], best_score[i] = j, score
+    return best_idx, best_score
+
+
+def _match_reference(queries, candidates, threshold):
+    """Match unique (parent, key) queries to reference candidates (parent, key, name, pcode)."""
+    schema = {"parent": pl.Utf8, "key": pl.Utf8, "name": pl.Utf8, "pcode": pl.Utf8, "score": pl.Float64}
+    if queries.height == 0:
+        return pl.DataFrame(schema=schema)
+
+    # 1️⃣ Exact normalized names → one hash join
+    exact = queries.join(candidates, on=["parent", "key"], how="inner").select(
+        ["parent", "key", "name", "pcode", pl.lit(100.0).alias("score")]
+    )
+    rest = queries.join(exact.select(["parent", "key"]), on=["parent", "key"], how="anti")
+
+    # 2️⃣ Same phonetic key ("Mazar-e-Sharif" = "مزار شریف") → another hash join,
+    #    only where the key identifies one unit within the parent, and only when
+    #    the caller's threshold accepts the score given to phonetic matches
+    if threshold <= PHONETIC_MATCH_SCORE:
+        unique_sounds = candidates.filter(pl.len().over(["parent", "phonetic"]) == 1)
+        phonetic = (
+            rest.with_columns(name_key_expr(pl.col("raw"), "phonetic").alias("phonetic"))
+            .join(unique_sounds.drop("key"), on=["parent", "phonetic"], how="inner")
+            .select(["parent", "key", "name", "pcode", pl.lit(float(PHONETIC_MATCH_SCORE)).alias("score")])
+        )
+        exact = pl.concat([exact, phonetic])
+        rest = rest.join(phonetic.select(["parent", "key"]), on=["parent", "key"], how="anti")
+
+    # 3️⃣ Fuzzy: blocked by parent unit + phonetic prefix, scored per block as a matrix
+    rows = []
+    cand_by_parent = {p[0]: g for p, g in candidates.partition_by("parent", as_dict=True).items()}
+    rest = rest.with_columns(pl.col("key").map_elements(_block_key, return_dtype=pl.Utf8).alias("block"))
+    for (parent, block), group in rest.partition_by(["parent", "block"], as_dict=True).items():
+        # Unknown / unmatched parent → all candidates of this level
+        pool = cand_by_parent.get(parent, candidates) if parent else candidates
+        keys = group["key"].to_list()
+        pool_keys = pool["key"].to_list()
+        blocked = [i for i, k in enumerate(pool_keys) if _block_key(k) == block]
+
+        best_idx = np.full(len(keys), -1)
+        best_score = np.zeros(len(keys))
+        if blocked:
+            idx, best_score = _best_matches(keys, [pool_keys[i] for i in blocked])
+            best_idx = np.where(idx >= 0, np.asarray(blocked)[idx], -1)
+
+        # Fall back to the whole parent block for names whose prefix block failed
+        retry = np.where(best_score < threshold)[0]
+        if len(retry) and len(pool_keys) > len(blocked):
+            idx, score = _best_matches([keys[i] for i in retry], pool_keys)
+            better = score > best_score[retry]
+            best_idx[retry[better]] = idx[better]
+            best_score[retry[better]] = score[better]
+
+        names, pcodes = pool["name"].to_list(), pool["pcode"].to_list()
+        for k, i, s in zip(keys, best_idx, best_score):
+            ok = i >= 0 and s >= threshold
+            rows.append((parent, k, names[i] if ok else None, pcodes[i] if ok else None, float(s)))
+
+    fuzzy = pl.DataFrame(rows, schema=schema, orient="row")
+    return pl.concat([exact, fuzzy])
+
+
+def _match_self(queries, threshold):
+    """No reference: map each spelling to the most frequent similar spelling in its parent group."""
+    rows = []
+    for (parent,), group in queries.partition_by(["parent"], as_dict=True).items():
+        keys, raws, counts = group["key"].to_list(), group["raw"].to_list(), np.asarray(group["count"].to_list())
+        # Only map towards strictly more frequent spellings (never onto itself)
+        allowed = counts[None, :] > counts[:, None]
+        best, score = _best_matches(keys, keys, allowed=allowed)
+        target = [int(best[i]) if best[i] >= 0 and score[i] >= threshold else i for i in range(len(keys))]
+        # Follow chains (a → b → c) to their final spelling
+        for i in range(len(target)):
+            seen = {i}
+            while target[target[i]] != target[i] and target[target[i]] not in seen:
+                seen.add(target[i])
+                target[i] = target[target[i]]
+        rows += [(parent, keys[i], raws[target[i]]) for i in range(len(keys))]
+    return pl.DataFrame(rows, schema={"parent": pl.Utf8, "key": pl.Utf8, "name": pl.Utf8}, orient="row")
+
+
+def _load_reference(reference, reference_columns):
+    """Split an ADM2-level reference table into per-level candidate tables."""
+    if isinstance(reference, str):
+        reference = pl.read_parquet(reference) if reference.endswith(".parquet") else pl.read_csv(reference)
+    cols = {**DEFAULT_REFERENCE_COLUMNS, **(reference_columns or {})}
+
+    levels = {}
+    parent_pcode = None
+    for lvl in ["adm0", "adm1", "adm2"]:
+        name_col, pcode_col = cols[lvl]
+        if name_col not in reference.columns:
+            continue
+        parent = pl.col(parent_pcode).cast(pl.Utf8) if parent_pcode else pl.lit("")
+        levels[lvl] = (
+            reference.select([
+                parent.alias("parent"),
+                _key_expr(pl.col(name_col)).alias("key"),
+                name_key_expr(pl.col(name_col).cast(pl.Utf8), "phonetic").alias("phonetic"),
+                pl.col(name_col).cast(pl.Utf8).alias("name"),
+                pl.col(pcode_col).cast(pl.Utf8).alias("pcode"),
+            ])
+            .unique(subset=["parent", "key"], keep="first", maintain_order=True)
+        )
+        parent_pcode = pcode_col
+    return levels
+
+
+class _MatchCache:
+    """Parquet cache of (level, parent, key) → match, one file per reference table + threshold."""
+
+    def __init__(self, cache_dir, ref, threshold):
+        digest = hashlib.sha1(str(threshold).encode())
+        for lvl in sorted(ref):
+            digest.update(ref[lvl].write_csv().encode("utf-8"))
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"admin_matches_{digest.hexdigest()[:16]}.parquet")
+        self.table = pl.read_parquet(self.path) if os.path.exists(self.path) else None
+        self.new = []
+
+    def lookup(self, lvl, queries):
+        if self.table is None:
+            return None
+        return (
+            self.table.filter(pl.col("level") == lvl).drop("level")
+            .join(queries.select(["parent", "key"]), on=["parent", "key"], how="semi")
+        )
+
+    def store(self, lvl, matches):
+        if matches.height:
+            self.new.append(matches.with_columns(pl.lit(lvl).alias("level")))
+
+    def save(self):
+        if not self.new:
+            return
+        frames = ([self.table] if self.table is not None else []) + [m.select(self.new[0].columns) for m in self.new]
+        pl.concat(frames, how="diagonal").write_parquet(self.path)
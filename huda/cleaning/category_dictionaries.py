@@ -0,0 +1,242 @@
+"""
+📚 Category Dictionaries (Dari, Pashto, Arabic, French, English)
+================================================================
+
+Registry of domain dictionaries used by `translate_categories`.
+
+Every dictionary maps a canonical label to the spellings we see in KoBo / 5W
+exports. Dictionaries are compiled once into a normalized-key lookup table
+(a small Polars DataFrame with `key` and `value` columns) and the compiled
+tables are cached until a dictionary is (re)registered.
+"""
+import re
+import polars as pl
+from typing import Dict, List, Optional, Union
+
+
+# 🔡 Character unification applied to both dictionary keys and data values.
+#    Arabic/Pashto letter variants → Dari form, Eastern digits → ASCII,
+#    diacritics, tatweel and zero-width characters removed, French accents dropped.
+_CHAR_MAP = {
+    "ي": "ی", "ى": "ی", "ئ": "ی", "ې": "ی", "ۍ": "ی", "ێ": "ی",
+    "ك": "ک", "ڪ": "ک",
+    "ة": "ه", "ۀ": "ه", "ە": "ه",
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و",
+    "ـ": "",
+    "ً": "", "ٌ": "", "ٍ": "", "َ": "",
+    "ُ": "", "ِ": "", "ّ": "", "ْ": "",
+    "‌": " ", "‍": "", "‏": "", "‎": "",
+    "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
+    "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
+    "۰": "0", "۱": "1", "۲": "2", "۳": "3", "۴": "4",
+    "۵": "5", "۶": "6", "۷": "7", "۸": "8", "۹": "9",
+    "é": "e", "è": "e", "ê": "e", "ë": "e",
+    "à": "a", "â": "a", "ä": "a",
+    "î": "i", "ï": "i", "ô": "o", "ö": "o",
+    "û": "u", "ù": "u", "ü": "u", "ç": "c",
+    "-": " ", "_": " ", "/": " ", ".": " ", "’": "'",
+}
+
+_TRANSLATION = str.maketrans(_CHAR_MAP)
+
+# 🌍 Built-in dictionaries: {canonical label: [variants in any language]}
+_BUILTIN_DICTIONARIES = {
+    "yes_no": {
+        "Yes": ["yes", "y", "true", "1", "بلی", "بله", "آره", "ه", "اووه", "هو", "نعم", "oui"],
+        "No": ["no", "n", "false", "0", "نخیر", "نی", "نه", "نه خیر", "لا", "non"],
+    },
+    "sex": {
+        "Male": ["male", "m", "man", "boy", "آقا", "مرد", "پسر", "نارینه", "سړی", "هلک",
+                 "ذكر", "رجل", "homme", "masculin", "garcon"],
+        "Female": ["female", "f", "woman", "girl", "خانم", "زن", "دختر", "ښځه", "ښځینه", "نجلۍ",
+                   "أنثى", "انثى", "امرأة", "femme", "feminin", "fille"],
+    },
+    "status": {
+        "Active": ["active", "on", "فعال", "فعاله", "نشط", "actif"],
+        "Inactive": ["inactive", "off", "غیرفعال", "غیر فعال", "غیر فعاله", "غير نشط", "inactif"],
+    },
+    "availability": {
+        "Available": ["available", "در دسترس", "شته", "متوفر", "متاح", "disponible"],
+        "Unavailable": ["unavailable", "not available", "در دسترس نیست", "نشته",
+                        "غير متوفر", "indisponible", "non disponible"],
+    },
+    "quality": {
+        "Poor": ["poor", "bad", "بد", "ضعیف", "خراب", "سيء", "mauvais", "faible"],
+        "Medium": ["medium", "average", "متوسط", "منځنی", "moyen"],
+        "Good": ["good", "خوب", "ښه", "جيد", "bon"],
+        "Excellent": ["excellent", "عالی", "ډیر ښه", "ممتاز"],
+    },
+    "sectors": {
+        "WASH": ["wash", "water sanitation and hygiene", "water sanitation hygiene",
+                 "آب و حفظ الصحه", "اوبه او حفظ الصحه", "المياه والصرف الصحي والنظافة",
+                 "eha", "eau hygiene et assainissement"],
+        "Health": ["health", "صحت", "صحی", "روغتیا", "صحة", "الصحة", "sante"],
+        "Education": ["education", "معارف", "تعلیم", "آموزش", "ښوونه", "زده کړه",
+                      "تعليم", "التعليم"],
+        "Food Security": ["food security", "fsac", "fsl", "food security and agriculture",
+                          "امنیت غذایی", "خوراکي امنیت", "الأمن الغذائي", "securite alimentaire"],
+        "Nutrition": ["nutrition", "تغذیه", "تغذي", "تغذیه وی", "التغذية"],
+        "Protection": ["protection", "حمایت", "محافظت", "ساتنه", "الحماية"],
+        "Shelter & NFI": ["shelter", "es nfi", "esnfi", "shelter and nfi", "emergency shelter",
+                          "سرپناه", "پناهگاه", "سرپناه و مواد غیرغذایی", "مأوى",
+                          "abri", "abris"],
+        "Logistics": ["logistics", "لوجستیک", "لوژستیک", "اللوجستيات", "logistique"],
+    },
+    "displacement_status": {
+        "IDP": ["idp", "idps", "internally displaced", "internally displaced person",
+                "بیجاشده داخلی", "بیجا شده داخلی", "بیجا شده", "بی جا شده",
+                "داخلي بی ځایه شوی", "بی ځایه شوی", "نازح", "نازح داخليا",
+                "pdi", "deplace interne", "deplace"],
+        "Returnee": ["returnee", "returnees", "returned", "عودت کننده", "عودت کنندگان",
+                     "راستانه شوی", "بیرته راستانه شوی", "عائد", "العائدون",
+                     "rapatrie", "retourne"],
+        "Refugee": ["refugee", "refugees", "مهاجر", "پناهنده", "کډوال", "لاجئ", "لاجئون",
+                    "refugie"],
+        "Host Community": ["host community", "host", "جامعه میزبان", "کوربه ټولنه",
+                           "المجتمع المضيف", "communaute d'accueil", "communaute hote"],
+    },
+}
+
+_CATEGORY_DICTIONARIES: Dict[str, Dict[str, List[str]]] = {}
+_COMPILED_CACHE: Dict[tuple, pl.DataFrame] = {}
+
+
+def normalize_category_key(value) -> Optional[str]:
+    """
+    🔑 Normalize a raw category value into a lookup key (pure Python).
+
+    Must stay in sync with `normalize_category_expr`, which applies the
+    same rules natively to Polars columns.
+
+    Example:
+    --------
+        normalize_category_key("  Oui ")      # → "oui"
+        normalize_category_key("غير فعال")    # → "غیر فعال"
+    """
+    if value is None:
+        return None
+    key = str(value).lower().translate(_TRANSLATION)
+    return re.sub(r"\s+", " ", key).strip()
+
+
+def normalize_category_expr(expr: pl.Expr) -> pl.Expr:
+    """
+    🔑 Polars-native version of `normalize_category_key` (vectorized).
+    """
+    return (
+        expr.cast(pl.Utf8)
+        .str.to_lowercase()
+        .str.replace_many(list(_CHAR_MAP.keys()), list(_CHAR_MAP.values()))
+        .str.replace_all(r"\s+", " ")
+        .str.strip_chars()
+    )
+
+
+def register_category_dictionary(name: str, mapping: Dict[str, Union[str, List[str]]], replace: bool = False):
+    """
+    📝 Register (or extend) a domain dictionary used by `translate_categories`.
+
+    Parameters:
+    -----------
+    name : str
+        Dictionary name, e.g. "sectors", "sex", "yes_no", "displacement_status"
+        or any name of your own.
+    mapping : dict
+        Either {canonical: [variants]} or {variant: canonical}.
+        Canonical labels always map to themselves.
+    replace : bool
+        True → replace an existing dictionary with the same name.
+        False (default) → merge new variants into it.
+
+    Example:
+    --------
+        from huda.cleaning import register_category_dictionary, translate_categories
+
+        register_category_dictionary("modality", {
+            "Cash": ["cash", "پول نقد", "نغدې پیسې", "نقد", "especes"],
+            "In-kind": ["in kind", "جنسی", "عیني", "en nature"],
+        })
+
+        df_clean = translate_categories(df, columns="modality", dictionaries=["modality"])
+    """
+    grouped = _as_canonical_groups(mapping)
+
+    if replace or name not in _CATEGORY_DICTIONARIES:
+        _CATEGORY_DICTIONARIES[name] = {}
+    target = _CATEGORY_DICTIONARIES[name]
+    for canonical, variants in grouped.items():
+        target.setdefault(canonical, [])
+        target[canonical].extend(v for v in variants if v not in target[canonical])
+
+    # New variants invalidate every compiled table
+    _COMPILED_CACHE.clear()
+
+
+def list_category_dictionaries() -> List[str]:
+    """📋 Names of all registered dictionaries (built-in first, in registration order)."""
+    return list(_CATEGORY_DICTIONARIES.keys())
+
+
+def compile_category_dictionaries(dictionaries=None) -> pl.DataFrame:
+    """
+    ⚙️ Compile one or more dictionaries into a normalized lookup table.
+
+    Parameters:
+    -----------
+    dictionaries : str | list | dict | None
+        - None → all registered dictionaries
+        - str / list[str] → registered dictionary names (earlier names win on conflicts)
+        - dict → an inline mapping ({variant: canonical} or {canonical: [variants]})
+
+    Returns:
+    --------
+    pl.DataFrame with columns `key` (normalized variant) and `value` (canonical label).
+    Named dictionaries are compiled once and cached.
+    """
+    if isinstance(dictionaries, dict):
+        return _compile_mapping([_as_canonical_groups(dictionaries)])
+
+    if dictionaries is None:
+        names = tuple(_CATEGORY_DICTIONARIES.keys())
+    elif isinstance(dictionaries, str):
+        names = (dictionaries,)
+    else:
+        names = tuple(dictionaries)
+
+    if names not in _COMPILED_CACHE:
+        missing = [n for n in names if n not in _CATEGORY_DICTIONARIES]
+        if missing:
+            raise ValueError(f"❌ Unknown category dictionaries: {missing}. Registered: {list_category_dictionaries()}")
+        _COMPILED_CACHE[names] = _compile_mapping([_CATEGORY_DICTIONARIES[n] for n in names])
+    return _COMPILED_CACHE[names]
+
+
+def _as_canonical_groups(mapping):
+    groups: Dict[str, List[str]] = {}
+    for k, v in mapping.items():
+        if isinstance(v, str):
+            # {variant: canonical}
+            groups.setdefault(v, []).append(k)
+        else:
+            # {canonical: [variants]}
+            groups.setdefault(k, []).extend(list(v))
+    return groups
+
+
+def _compile_mapping(group_list) -> pl.DataFrame:
+    lookup: Dict[str, str] = {}
+    for groups in group_list:
+        for canonical, variants in groups.items():
+            for variant in [canonical, *variants]:
+                key = normalize_category_key(variant)
+                if key and key not in lookup:
+                    lookup[key] = canonical
+    return pl.DataFrame(
+        {"key": list(lookup.keys()), "value": list(lookup.values())},
+        schema={"key": pl.Utf8, "value": pl.Utf8},
+    )
+
+
+for _name, _mapping in _BUILTIN_DICTIONARIES.items():
+    register_category_dictionary(_name, _mapping)
@@ -0,0 +1,203 @@
+import polars as pl
+from typing import Callable, List, Optional, Union
+from .normalize_columns import normalize_columns
+from .translate_categories import translate_categories_expr
+from .numbers_standardization import standardize_numbers, apply_on_unique_values
+from .date_parser import detect_date_formats, parse_dates_expr
+from .dates_standardization import DATE_STYLES
+from .outlier_handler import outlier_handler
+from .impute import impute
+from .drop_missing import drop_missing
+from .lazy_io import scan_data, collect_data
+
+
+class CleaningPipeline:
+    """
+    🧪 Chain cleaning steps into ONE lazy query, optimized together and collected once.
+
+    💡 Simple Explanation:
+    ----------------------
+    Calling `normalize_columns`, `translate_categories`, `numbers_standardization`,
+    ... one after the other copies the whole dataset at every step. A pipeline
+    only records the steps. When you `run` it, every step is added to a single
+    Polars LazyFrame plan, Polars optimizes the plan as a whole (fused column
+    expressions, only needed columns read from files) and the data is collected
+    once, optionally with the streaming engine or straight into a Parquet file.
+
+    🧾 Steps (each returns the pipeline, so they can be chained):
+    -------------------------------------------------------------
+    - normalize_columns()
+    - translate_categories(columns=None, dictionaries=None)
+    - numbers_standardization(columns=None)
+    - dates_standardization(column, style="iso", formats=None, hijri="shamsi", dayfirst=True)
+    - outlier_handler(columns=None, method="iqr", factor=1.5, group_by=None)
+    - impute(strategy_by_column, group_by=None, order_by=None)
+    - drop_missing(column=None)
+    - with_columns(*exprs) → any Polars expressions
+    - step(func, *args, **kwargs) → any function that accepts and returns a LazyFrame
+
+    🧠 Example Usage:
+    -----------------
+        from huda.cleaning import CleaningPipeline
+
+        pipeline = (
+            CleaningPipeline()
+            .normalize_columns()
+            .translate_categories(["sector", "status"])
+            .numbers_standardization(["beneficiaries", "budget_usd"])
+            .dates_standardization("start_date", style="date")
+            .outlier_handler(["beneficiaries"], group_by="province")
+            .drop_missing("activity_id")
+        )
+
+        # 5W files: scanned, cleaned and written without loading everything in memory
+        pipeline.run("5w/*.csv", streaming=True, output_path="5w_clean.parquet")
+
+        # Or get a DataFrame
+        df_clean = pipeline.run(df_5w)
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - The same cleaning recipe runs on large or repeated exports (5W, KoBo).
+    💡 Why:
+        - One optimized plan and one collect instead of one full copy per step.
+        - Streaming keeps memory bounded on data larger than RAM.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def __repr__(self):
+        names = " → ".join(name for name, _ in self.steps) or "(empty)"
+        return f"CleaningPipeline({names})"
+
+    def __len__(self):
+        return len(self.steps)
+
+    def _add(self, name: str, func: Callable[[pl.LazyFrame], pl.LazyFrame]):
+        self.steps.append((name, func))
+        return self
+
+    # 🧱 Steps -------------------------------------------------------------
+
+    def normalize_columns(self):
+        """Clean column names (lowercase, underscores, no special characters)."""
+        return self._add("normalize_columns", normalize_columns)
+
+    def translate_categories(self, columns=None, dictionaries=None):
+        """Translate category values with the category dictionaries (see `translate_categories`)."""
+
+        def apply(lf):
+            schema = lf.collect_schema()
+            if columns is None:
+                column_dicts = {c: dictionaries for c, t in schema.items() if t in (pl.Utf8, pl.Categorical)}
+            elif isinstance(columns, str):
+                column_dicts = {columns: dictionaries}
+            elif isinstance(columns, dict):
+                column_dicts = {c: (d if d is not None else dictionaries) for c, d in columns.items()}
+            else:
+                column_dicts = {c: dictionaries for c in columns}
+            return lf.with_columns([translate_categories_expr(c, d) for c, d in column_dicts.items() if c in schema])
+
+        return self._add("translate_categories", apply)
+
+    def numbers_standardization(self, columns=None):
+        """Turn "1,200", "۱٬۵۰۰", "4.5M" … into numbers (see `numbers_standardization`)."""
+        return self._add("numbers_standardization", lambda lf: standardize_numbers(lf, columns))
+
+    def dates_standardization(
+        self,
+        column: str,
+        style: str = "iso",
+        formats: Optional[List[str]] = None,
+        hijri: Optional[str] = "shamsi",
+        dayfirst: bool = True,
+        sample_size: int = 2000,
+    ):
+        """
+        Parse `column` (ISO, US, EU, Hijri …) and format it in `style`.
+
+        formats=None → formats are detected on the first `sample_size` rows when
+        the pipeline runs (put this step early so that sample is cheap to read).
+        """
+        if style not in DATE_STYLES:
+            raise ValueError(f"❌ Unknown style '{style}'. Use one of: {list(DATE_STYLES)}")
+
+        def apply(lf):
+            dtype = lf.collect_schema()[column]
+            if dtype == pl.Date or isinstance(dtype, pl.Datetime):
+                parsed = pl.col(column).cast(pl.Date)
+            else:
+                found = formats
+                if found is None:
+                    sample = lf.select(pl.col(column).cast(pl.Utf8)).head(sample_size).collect().to_series()
+                    found = detect_date_formats(sample, sample_size=sample_size, dayfirst=dayfirst)
+                parsed = parse_dates_expr(column, found, hijri=hijri)
+            if DATE_STYLES[style] is not None:
+                parsed = parsed.dt.strftime(DATE_STYLES[style])
+            # Regex parsing runs once per distinct date string
+            return apply_on_unique_values(lf, column, parsed)
+
+        return self._add("dates_standardization", apply)
+
+    def outlier_handler(self, columns=None, method="iqr", factor=1.5, group_by=None):
+        """Replace outliers with null (see `outlier_handler`)."""
+        return self._add(
+            "outlier_handler",
+            lambda lf: outlier_handler(lf, columns=columns, method=method, factor=factor, group_by=group_by),
+        )
+
+    def impute(self, strategy_by_column: dict, group_by=None, order_by=None):
+        """Fill missing values per column strategy (see `impute`)."""
+        return self._add("impute", lambda lf: impute(lf, strategy_by_column, group_by=group_by, order_by=order_by))
+
+    def drop_missing(self, column: Optional[str] = None):
+        """Drop rows with nulls (in `column`, or in any column)."""
+        return self._add("drop_missing", lambda lf: drop_missing(lf, column))
+
+    def with_columns(self, *exprs: pl.Expr):
+        """Add custom Polars expressions as a step."""
+        return self._add("with_columns", lambda lf: lf.with_columns(*exprs))
+
+    def step(self, func: Callable, *args, name: Optional[str] = None, **kwargs):
+        """Add any function that takes a LazyFrame (first argument) and returns one."""
+        return self._add(name or getattr(func, "__name__", "step"), lambda lf: func(lf, *args, **kwargs))
+
+    # 🚀 Execution ---------------------------------------------------------
+
+    def to_lazy(self, data: Union[pl.DataFrame, pl.LazyFrame, str]) -> pl.LazyFrame:
+        """Build the full query plan over `data` (DataFrame, LazyFrame or file path) without running it."""
+        lf = scan_data(data)
+        for _, func in self.steps:
+            lf = func(lf)
+        return lf
+
+    def explain(self, data: Union[pl.DataFrame, pl.LazyFrame, str]) -> str:
+        """Show the optimized query plan Polars will run."""
+        return self.to_lazy(data).explain()
+
+    def run(
+        self,
+        data: Union[pl.DataFrame, pl.LazyFrame, str],
+        streaming: bool = False,
+        output_path: Optional[str] = None,
+    ):
+        """
+        ▶️ Run all steps as one query.
+
+        streaming=True → collect with the streaming engine (batches, bounded memory).
+        output_path → write the result to Parquet with a streaming sink and return the path.
+        """
+        try:
+            lf = self.to_lazy(data)
+            if output_path:
+                lf.sink_parquet(output_path)
+                print(f"✅ Cleaning pipeline ({len(self.steps)} steps) written to {output_path}")
+                return output_path
+            df = collect_data(lf, streaming)
+            print(f"✅ Cleaning pipeline ({len(self.steps)} steps) done → Rows: {df.height}, Columns: {df.width}")
+            return df
+        except Exception as e:
+            print("⚠️ Error while running the cleaning pipeline:", e)
+            return None
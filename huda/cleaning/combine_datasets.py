@@ -1,6 +1,7 @@
 import polars as pl
+from .join_datasets import join_datasets
 
-def combine_datasets(df1, df2, on, how="inner"):
+def combine_datasets(df1, df2, on, how="inner", **join_options):
     """
     🔗 Merge (combine) two datasets easily using Polars.
 
@@ -24,6 +25,15 @@ def combine_datasets(df1, df2, on, how="inner"):
     - "right" → all rows from second table, matching ones from first
     - "outer" → all rows from both tables, missing values = null
 
+    ⚙️ Large data & messy keys:
+    ---------------------------
+    Extra options are passed to `join_datasets`:
+    - normalize_keys="pcode" / True → match "af-0101" with "AF0101", "Kabul " with "kabul"
+    - report=True → also return key match-rate diagnostics
+    - streaming=True, output_path="out.parquet", lazy=True → out-of-core joins
+      (df1 / df2 can also be LazyFrames or file paths)
+    - presorted=True → sorted-merge join for inputs already sorted by the key
+
     🧪 Example Usage:
     -----------------
         import polars as pl
@@ -60,7 +70,9 @@ def combine_datasets(df1, df2, on, how="inner"):
     └──────────────┴────────────┴──────┘
     """
     try:
-        df_combined = df1.join(df2, on=on, how=how)
+        if join_options or not (isinstance(df1, pl.DataFrame) and isinstance(df2, pl.DataFrame)):
+            return join_datasets(df1, df2, on=on, how=how, **join_options)
+        df_combined = df1.join(df2, on=on, how="full" if how == "outer" else how, coalesce=True)
         print(f"✅ Datasets merged successfully using '{how}' join on '{on}'")
         print(f"Rows: {df_combined.height}, Columns: {df_combined.width}")
         return df_combined
@@ -0,0 +1,259 @@
+import datetime as dt
+import polars as pl
+from typing import Dict, List, Optional, Tuple
+
+# 🗓 Candidate formats, tried on a sample of the column (order = priority on ties)
+ISO_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%Y%m%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]
+EU_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y"]
+US_FORMATS = ["%m/%d/%Y", "%m-%d-%Y", "%m/%d/%y"]
+TEXT_FORMATS = ["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%d-%b-%Y", "%d-%b-%y"]
+
+HIJRI_YEARS = (1300, 1500)
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+_EASTERN_DIGITS = list("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩")
+_ASCII_DIGITS = list("0123456789" * 2)
+_TABLE_CACHE: Dict[str, Tuple[dict, dict]] = {}
+
+
+def _div(a, b):
+    return int(a / b)
+
+
+def _jalali_to_jdn(jy, jm, jd):
+    """Solar Hijri (Jalali) → Julian Day Number (33-year break table algorithm)."""
+    breaks = [-61, 9, 38, 199, 426, 686, 756, 818, 1111, 1181, 1210, 1635, 2060, 2097, 2192, 2262, 2324, 2394, 2456, 3178]
+    gy = jy + 621
+    leap_j = -14
+    jp = breaks[0]
+    jump = 0
+    for jm_break in breaks[1:]:
+        jump = jm_break - jp
+        if jy < jm_break:
+            break
+        leap_j += _div(jump, 33) * 8 + _div(jump % 33, 4)
+        jp = jm_break
+    n = jy - jp
+    leap_j += _div(n, 33) * 8 + _div((n % 33) + 3, 4)
+    if jump % 33 == 4 and jump - n == 4:
+        leap_j += 1
+    leap_g = _div(gy, 4) - _div((_div(gy, 100) + 1) * 3, 4) - 150
+    march = 20 + leap_j - leap_g
+    # Gregorian (gy, 3, march) → JDN
+    start = dt.date(gy, 3, 1).toordinal() + march - 1 + 1721425
+    return start + (jm - 1) * 31 - _div(jm, 7) * (jm - 7) + jd - 1
+
+
+def _qamari_to_jdn(y, m, d):
+    """Lunar Hijri → Julian Day Number (tabular / civil Islamic calendar)."""
+    return d + int(-(-59 * (m - 1) // 2)) + (y - 1) * 354 + (3 + 11 * y) // 30 + 1948439
+
+
+def hijri_lookup_table(calendar: str = "shamsi", years: Tuple[int, int] = HIJRI_YEARS) -> Tuple[dict, dict]:
+    """
+    📅 Precomputed month tables for Hijri → Gregorian conversion (built once, cached).
+
+    Returns two dicts keyed by year * 100 + month:
+        - start: days since 1970-01-01 of the month's first day
+        - length: number of days in the month
+
+    Lunar Hijri uses the tabular (arithmetic) calendar; observed months
+    can differ from it by one day.
+    """
+    cache_key = f"{calendar}:{years[0]}-{years[1]}"
+    if cache_key not in _TABLE_CACHE:
+        to_jdn = _jalali_to_jdn if calendar == "shamsi" else _qamari_to_jdn
+        start, length = {}, {}
+        for y in range(years[0], years[1] + 1):
+            for m in range(1, 13):
+                first = to_jdn(y, m, 1)
+                nxt = to_jdn(y + 1, 1, 1) if m == 12 else to_jdn(y, m + 1, 1)
+                start[y * 100 + m] = first - 1721425 - _EPOCH_ORDINAL
+                length[y * 100 + m] = nxt - first
+        _TABLE_CACHE[cache_key] = (start, length)
+    return _TABLE_CACHE[cache_key]
+
+
+def _clean(expr: pl.Expr) -> pl.Expr:
+    return expr.cast(pl.Utf8).str.strip_chars().str.replace_many(_EASTERN_DIGITS, _ASCII_DIGITS)
+
+
+def _hijri_expr(text: pl.Expr, calendar: str, years: Tuple[int, int]) -> pl.Expr:
+    """Vectorized Hijri → Date: regex split + month-table lookup (no per-row Python)."""
+    start, length = hijri_lookup_table(calendar, years)
+    ymd = text.str.extract_groups(r"^(?P<a>\d{1,4})[/\-.](?P<b>\d{1,2})[/\-.](?P<c>\d{1,4})$")
+    a = ymd.struct.field("a").cast(pl.Int32, strict=False)
+    b = ymd.struct.field("b").cast(pl.Int32, strict=False)
+    c = ymd.struct.field("c").cast(pl.Int32, strict=False)
+    # Year first (1403/07/15) or year last (15/07/1403)
+    year_first = a.is_between(*years)
+    y = pl.when(year_first).then(a).otherwise(c)
+    d = pl.when(year_first).then(c).otherwise(a)
+    key = y * 100 + b
+    month_start = key.replace_strict(list(start), list(start.values()), default=None, return_dtype=pl.Int32)
+    month_len = key.replace_strict(list(length), list(length.values()), default=None, return_dtype=pl.Int32)
+    is_hijri = y.is_between(*years) & b.is_between(1, 12) & (d >= 1) & (d <= month_len)
+    return pl.when(is_hijri).then(month_start + d - 1).cast(pl.Date)
+
+
+def _format_expr(text: pl.Expr, fmt: str, hijri_years: Optional[Tuple[int, int]] = None) -> pl.Expr:
+    if "%H" in fmt:
+        parsed = text.str.strptime(pl.Datetime, fmt, strict=False).dt.date()
+    else:
+        parsed = text.str.strptime(pl.Date, fmt, strict=False)
+    if hijri_years:
+        # An invalid Hijri date (1403/12/31) must not come back as Gregorian year 1403
+        parsed = pl.when(parsed.dt.year().is_between(*hijri_years)).then(None).otherwise(parsed)
+    return parsed
+
+
+def detect_date_formats(
+    values: pl.Series,
+    sample_size: int = 2000,
+    dayfirst: bool = True,
+    hijri_years: Tuple[int, int] = HIJRI_YEARS,
+    candidates: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    🔍 Detect the set of date formats present in a column, from a sample.
+
+    Greedy: pick the format that parses most of the (still unparsed) sample
+    values, remove them, repeat. Values that look like Hijri dates are left
+    to the Hijri converter. `dayfirst` breaks ties between 05/10/2025 as EU or US.
+    """
+    candidates = candidates or ISO_FORMATS + (EU_FORMATS + US_FORMATS if dayfirst else US_FORMATS + EU_FORMATS) + TEXT_FORMATS
+    sample = values.drop_nulls().unique()
+    if sample.len() > sample_size:
+        sample = sample.sample(sample_size, seed=0)
+
+    frame = pl.DataFrame({"text": sample}).select(_clean(pl.col("text")).alias("text"))
+    frame = frame.filter(_hijri_expr(pl.col("text"), "shamsi", hijri_years).is_null())
+    parsed = frame.select([_format_expr(pl.col("text"), f, hijri_years).is_not_null().alias(str(i)) for i, f in enumerate(candidates)])
+
+    chosen = []
+    remaining = pl.Series([True] * parsed.height)
+    while parsed.height:
+        hits = [(parsed[str(i)] & remaining).sum() for i in range(len(candidates))]
+        best = max(range(len(candidates)), key=lambda i: (hits[i], -i))
+        if hits[best] == 0:
+            break
+        chosen.append(candidates[best])
+        remaining = remaining & ~parsed[str(best)]
+    return chosen
+
+
+def parse_dates_expr(
+    column: str,
+    formats: List[str],
+    hijri: Optional[str] = "shamsi",
+    hijri_years: Tuple[int, int] = HIJRI_YEARS,
+) -> pl.Expr:
+    """
+    🧩 Expression that parses `column` with the given formats (+ Hijri) into pl.Date.
+
+    Use after `detect_date_formats`, or with known formats, inside lazy queries.
+    """
+    text = _clean(pl.col(column))
+    parts = []
+    if hijri:
+        parts.append(_hijri_expr(text, hijri, hijri_years))
+    parts += [_format_expr(text, f, hijri_years if hijri else None) for f in formats]
+    return pl.coalesce(parts).alias(column) if parts else pl.lit(None, dtype=pl.Date).alias(column)
+
+
+def parse_dates(
+    df: pl.DataFrame,
+    column: str,
+    formats: Optional[List[str]] = None,
+    hijri: Optional[str] = "shamsi",
+    dayfirst: bool = True,
+    sample_size: int = 2000,
+    output_col: Optional[str] = None,
+    hijri_years: Tuple[int, int] = HIJRI_YEARS,
+):
+    """
+    📅 Parse a messy date column (ISO, US, EU, text months, Solar/Lunar Hijri) into pl.Date.
+
+    💡 Simple Explanation:
+    ----------------------
+    Afghan datasets often mix "2024-10-06", "10/06/2024", "06-10-2024" and
+    Solar Hijri dates like "1403/07/15" (or "۱۴۰۳/۰۷/۱۵") in the same column.
+    This function:
+    1. samples the column to detect which formats are present,
+    2. parses each format with a vectorized strptime (no per-row Python),
+    3. converts Hijri Shamsi (or Qamari) dates through a precomputed month table,
+    4. reports how many values each format parsed and how many failed.
+
+    🧾 Parameters:
+    ---------------
+    df : pl.DataFrame
+    column : str
+        Column with the dates (string, or already Date/Datetime).
+    formats : list[str] | None
+        strptime formats to use. None → detected from a sample.
+    hijri : "shamsi" | "qamari" | None
+        How to read dates whose year falls in `hijri_years` (default 1300–1500).
+        "shamsi" = Solar Hijri (Afghan/Iranian official calendar); None = no Hijri.
+    dayfirst : bool
+        Prefer 05/10/2025 = 5 October (EU) over May 10 (US) when both fit.
+    output_col : str | None
+        Write the parsed dates to another column (default: replace `column`).
+
+    Returns:
+    --------
+    (pl.DataFrame, pl.DataFrame)
+        The data with a pl.Date column, and a report with the number of values
+        parsed per format ("hijri_shamsi" / "hijri_qamari" for Hijri) plus
+        "failed" (non-empty values that could not be parsed).
+
+    🧠 Example Usage:
+    -----------------
+        df = pl.DataFrame({"date": ["2024-10-06", "10/06/2024", "1403/07/15", "۱۴۰۳/۰۷/۱۶", "bad"]})
+        df_parsed, report = parse_dates(df, "date")
+
+    🧾 Output:
+    ----------
+        date: 2024-10-06, 2024-06-10, 2024-10-06, 2024-10-07, null
+        report: %Y-%m-%d → 1, %d/%m/%Y → 1, hijri_shamsi → 2, failed → 1
+    """
+    output_col = output_col or column
+    dtype = df.schema[column]
+    if dtype == pl.Date or isinstance(dtype, pl.Datetime):
+        out = df.with_columns(pl.col(column).cast(pl.Date).alias(output_col))
+        return out, pl.DataFrame({"format": ["date"], "count": [df[column].is_not_null().sum()]})
+
+    if formats is None:
+        formats = detect_date_formats(df[column].cast(pl.Utf8), sample_size=sample_size, dayfirst=dayfirst, hijri_years=hijri_years)
+
+    text = _clean(pl.col(column))
+    labels = ([f"hijri_{hijri}"] if hijri else []) + list(formats)
+    parts = ([_hijri_expr(text, hijri, hijri_years)] if hijri else []) + [
+        _format_expr(text, f, hijri_years if hijri else None) for f in formats
+    ]
+
+    # Which part parsed each value (first match wins), in the same pass as the parse
+    which = pl.lit(None, dtype=pl.Int32)
+    for i in reversed(range(len(parts))):
+        which = pl.when(parts[i].is_not_null()).then(pl.lit(i, dtype=pl.Int32)).otherwise(which)
+    non_empty = pl.col(column).is_not_null() & (text != "")
+
+    # Parse each distinct value once, then join back onto the rows
+    uniques = df.select(pl.col(column)).unique().with_columns([
+        (pl.coalesce(parts) if parts else pl.lit(None, dtype=pl.Date)).alias("__huda_date"),
+        pl.when(non_empty).then(which.fill_null(-1)).alias("__huda_fmt"),
+    ])
+    out = (
+        df.join(uniques, on=column, how="left", maintain_order="left")
+        .with_columns(pl.col("__huda_date").alias(output_col))
+        .drop("__huda_date")
+    )
+    counts = out.group_by("__huda_fmt").len().drop_nulls()
+    names = {i: label for i, label in enumerate(labels)}
+    names[-1] = "failed"
+    report = pl.DataFrame({
+        "format": [names[i] for i in counts["__huda_fmt"].to_list()],
+        "count": counts["len"].to_list(),
+    }).sort("count", descending=True)
+
+    failed = report.filter(pl.col("format") == "failed")["count"].sum()
+    print(f"✅ Parsed '{column}' with formats: {', '.join(labels) or 'none'} ({failed} failed)")
+    return out.drop("__huda_fmt"), report
@@ -1,6 +1,18 @@
 import polars as pl
+from .date_parser import parse_dates
 
-def dates_standardization(df, column, style="iso"):
+# Output style → strftime format (None = keep pl.Date)
+DATE_STYLES = {
+    "iso": "%Y-%m-%d",
+    "us": "%m/%d/%Y",
+    "eu": "%d-%m-%Y",
+    "full": "%B %d, %Y",
+    "short": "%y/%m/%d",
+    "date": None,
+}
+
+
+def dates_standardization(df, column, style="iso", hijri="shamsi", dayfirst=True, report=False):
     """
     📅 Standardize date formats easily with multiple ready-made styles.
 
@@ -11,18 +23,28 @@ def dates_standardization(df, column, style="iso"):
         - "eu"    →  05-10-2025
         - "full"  →  October 05, 2025
         - "short" →  25/10/05
+        - "date"  →  keep a real pl.Date column (no string formatting)
+
+    Mixed formats:
+    -----------------
+        The column is sampled to detect every format present (ISO, US, EU,
+        text months) and each one is parsed with a vectorized strptime.
+        Solar Hijri dates (1403/07/15) are converted to Gregorian
+        (hijri="qamari" for Lunar Hijri, None to disable).
+        report=True → also return the parse counts per format and failures.
 
     Example Usage:
     -----------------
         import polars as pl
-        from huda.cleaning.standardize_dates import standardize_dates
+        from huda.cleaning import dates_standardization
 
         df = pl.DataFrame({
             "date": ["2025/10/05", "05-10-2025", "2025.10.05"]
         })
 
-        df_iso = standardize_dates(df, "date")
-        df_eu = standardize_dates(df, "date", style="eu")
+        df_iso = dates_standardization(df, "date")
+        df_eu = dates_standardization(df, "date", style="eu")
+        df_real, report = dates_standardization(df, "date", style="date", report=True)
 
     Output:
     ----------
@@ -43,35 +65,20 @@ def dates_standardization(df, column, style="iso"):
         - 🧹 To avoid parsing errors when joining or sorting
     """
 
-    formats = {
-        "iso": "%Y-%m-%d",
-        "us": "%m/%d/%Y",
-        "eu": "%d-%m-%Y",
-        "full": "%B %d, %Y",
-        "short": "%y/%m/%d"
-    }
+    formats = DATE_STYLES
 
     try:
         if style not in formats:
             raise ValueError(f"❌ Unknown style '{style}'. Use one of: {list(formats.keys())}")
 
-        col_dtype = df.schema[column]
-
-        # If column is already datetime/date
-        if col_dtype in [pl.Date, pl.Datetime]:
+        # Detect formats on a sample, parse each vectorized (+ Hijri → Gregorian)
+        df, parse_report = parse_dates(df, column, hijri=hijri, dayfirst=dayfirst)
+        if formats[style] is not None:
             df = df.with_columns(pl.col(column).dt.strftime(formats[style]).alias(column))
-        else:
-            # Convert string → datetime → formatted string
-            df = df.with_columns(
-                pl.col(column)
-                .str.to_datetime(strict=False)
-                .dt.strftime(formats[style])
-                .alias(column)
-            )
 
-        print(f"✅ Dates in '{column}' standardized to '{style}' format → {formats[style]}")
-        return df
+        print(f"✅ Dates in '{column}' standardized to '{style}' format → {formats[style] or 'pl.Date'}")
+        return (df, parse_report) if report else df
 
     except Exception as e:
         print("⚠️ Error while standardizing dates:", e)
-        return df
+        return (df, None) if report else df
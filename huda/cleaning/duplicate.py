@@ -1,6 +1,7 @@
 import polars as pl
+from .name_keys import name_key_expr
 
-def duplicate(df, columns=None, keep="first"):
+def duplicate(df, columns=None, keep="first", name_columns=None, name_key="latin"):
     """
     ♻️ Handle (remove or keep) duplicate rows in a DataFrame.
 
@@ -17,6 +18,18 @@ def duplicate(df, columns=None, keep="first"):
         - "first" → keep the first occurrence.
         - "last" → keep the last occurrence.
         - False → remove all duplicates completely.
+    name_columns : str | list[str] | None
+        Name columns compared by their name key instead of the raw text, so
+        Latin spellings such as "Mazar-e-Sharif" / "Mazar i Sharif" count as
+        the same. Only spellings within one script are unified: "مزار شریف"
+        stays a separate row (use `near_duplicates` blocked on the phonetic key
+        to find cross-script duplicates).
+    name_key : {"latin", "script"}
+        Which key to compare for `name_columns` (see `name_keys`), default "latin".
+        The "phonetic" key is refused: it also merges different names
+        (Mahmud / Mohammad, Karim / Karima), so it may only group candidates
+        for a real comparison (`near_duplicates(block_by=...)`), never decide
+        which rows are deleted.
 
     Example:
     ----------
@@ -38,6 +51,9 @@ def duplicate(df, columns=None, keep="first"):
         # ✅ Remove duplicates based on multiple columns
         df_multi = duplicate(df, columns=["country", "year"])
 
+        # ✅ Same district written in different scripts / spellings
+        df_names = duplicate(df_sites, columns=["district", "site_type"], name_columns="district")
+
     Output Example:
     ----------
         shape: (3, 3)
@@ -56,14 +72,31 @@ def duplicate(df, columns=None, keep="first"):
     - 🔍 When combining datasets from multiple sources, duplicates often appear.
     - 🧹 Removing them ensures cleaner and more accurate analysis.
     - 💡 Always inspect your data before removing duplicates to avoid losing valid records.
+    - 👯 This only catches exact duplicates. For typo-level duplicates (same person,
+      different spelling) use `near_duplicates`.
     """
     try:
         # 🔹 Normalize column input (single str → list)
         if isinstance(columns, str):
             columns = [columns]
 
-        # 🔹 Handle duplicates
-        df_clean = df.unique(subset=columns, keep=keep)
+        # 🔹 Compare name columns on their (multilingual) name key
+        if isinstance(name_columns, str):
+            name_columns = [name_columns]
+        name_columns = name_columns or []
+        if name_columns and name_key == "phonetic":
+            raise ValueError(
+                "phonetic keys merge different names; use name_key='latin' or 'script', "
+                "or block near_duplicates on the phonetic key"
+            )
+        keys = {col: f"__huda_name_{col}" for col in name_columns}
+        if keys:
+            subset = [keys.get(c, c) for c in (columns or df.columns)]
+            work = df.with_columns([name_key_expr(pl.col(c).cast(pl.Utf8), name_key).alias(k) for c, k in keys.items()])
+            df_clean = work.unique(subset=subset, keep=keep, maintain_order=True).drop(list(keys.values()))
+        else:
+            # 🔹 Handle duplicates
+            df_clean = df.unique(subset=columns, keep=keep)
 
         if columns is None:
             print("✅ Duplicates handled based on all columns.")
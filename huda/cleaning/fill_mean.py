@@ -4,6 +4,8 @@ def fill_mean(df, column):
     """
     📊 Fill missing values in a numeric column with its mean.
 
+    To fill many columns (or per-group means) in one pass, see `impute`.
+
     Example:
     ----------
         df = pl.DataFrame({"age": [20, None, 30]})
@@ -4,6 +4,9 @@ def forward_fill(df, column):
     """
     ⏩ Fill missing values with the previous value (useful for time series).
 
+    For many columns at once, or forward fill per group ordered by date,
+    use `impute(df, {...}, group_by=..., order_by=...)`.
+
     Example:
     ----------
         df = pl.DataFrame({"temp": [20, None, 25, None, 30]})
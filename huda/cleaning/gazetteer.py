@@ -0,0 +1,124 @@
+import polars as pl
+from typing import List, Optional, Union
+from .category_dictionaries import normalize_category_expr
+from .name_keys import name_key_expr
+
+
+class Gazetteer:
+    """
+    📖 Offline gazetteer index of admin units and settlements (with P-codes).
+
+    💡 Simple Explanation:
+    ----------------------
+    Load a local file of place names (e.g. an OCHA COD gazetteer or a settlement
+    list) once, then resolve thousands of names to coordinates and P-codes with
+    vectorized joins: first on the exact name, then on a normalized key
+    (case, whitespace, punctuation and Arabic/Persian letter variants unified),
+    then on a phonetic name key ("Mazar-e-Sharif" = "مزار شریف", see
+    `name_keys`) when that key points to a single place. No network is needed.
+
+    🧾 Parameters:
+    ---------------
+    data : str | pl.DataFrame
+        Path to a CSV / Parquet / Excel file, or a DataFrame.
+    name_col, pcode_col, lat_col, lon_col : str
+        Column names for the place name, P-code and coordinates.
+    alt_name_cols : list[str] | None
+        Extra columns with alternative names (Dari, Pashto, other spellings).
+    level_col : str | None
+        Optional admin level / feature type column kept in the index.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.cleaning import Gazetteer
+
+        gaz = Gazetteer("afg_settlements.csv", name_col="NAME_EN", pcode_col="PCODE",
+                        lat_col="LAT", lon_col="LON", alt_name_cols=["NAME_DA", "NAME_PS"])
+        gaz.lookup(["Kabul", "mazar i sharif", "هرات"])
+    """
+
+    def __init__(
+        self,
+        data: Union[str, pl.DataFrame],
+        name_col: str = "name",
+        pcode_col: str = "pcode",
+        lat_col: str = "latitude",
+        lon_col: str = "longitude",
+        alt_name_cols: Optional[List[str]] = None,
+        level_col: Optional[str] = None,
+    ):
+        if isinstance(data, str):
+            if data.endswith(".parquet"):
+                df = pl.read_parquet(data)
+            elif data.endswith((".xlsx", ".xls")):
+                df = pl.read_excel(data)
+            else:
+                df = pl.read_csv(data)
+        elif isinstance(data, pl.DataFrame):
+            df = data
+        else:
+            raise TypeError("Gazetteer data must be a file path or a Polars DataFrame.")
+
+        keep = [
+            pl.col(pcode_col).cast(pl.Utf8).alias("pcode"),
+            pl.col(lat_col).cast(pl.Float64).alias("latitude"),
+            pl.col(lon_col).cast(pl.Float64).alias("longitude"),
+        ]
+        if level_col:
+            keep.append(pl.col(level_col).cast(pl.Utf8).alias("level"))
+
+        # 🧱 One row per (name variant → place); earlier rows win on duplicates
+        names = [name_col] + list(alt_name_cols or [])
+        entries = pl.concat([
+            df.select([pl.col(c).cast(pl.Utf8).str.strip_chars().alias("name"), *keep])
+            for c in names
+        ]).filter(pl.col("name").is_not_null() & (pl.col("name") != ""))
+
+        self.exact_index = entries.unique(subset="name", keep="first", maintain_order=True)
+        self.key_index = (
+            entries.with_columns(normalize_category_expr(pl.col("name")).alias("key"))
+            .drop("name")
+            .unique(subset="key", keep="first", maintain_order=True)
+        )
+        # Phonetic keys are coarser → only keep keys that identify ONE place
+        self.phonetic_index = (
+            entries.with_columns(name_key_expr(pl.col("name"), "phonetic").alias("phonetic"))
+            .drop("name")
+            .filter((pl.col("phonetic") != "") & (pl.col("pcode").n_unique().over("phonetic") == 1))
+            .unique(subset="phonetic", keep="first", maintain_order=True)
+        )
+
+    def __len__(self):
+        return self.exact_index.height
+
+    def lookup(self, places) -> pl.DataFrame:
+        """
+        🔎 Resolve place names → (latitude, longitude, pcode, match).
+
+        `match` is "exact", "normalized", "phonetic" or null when the name is not in the gazetteer.
+        Only unique names are matched.
+        """
+        if not isinstance(places, pl.Series):
+            places = pl.Series("place", list(places), dtype=pl.Utf8)
+        uniques = pl.DataFrame({"place": places.cast(pl.Utf8).str.strip_chars().unique().drop_nulls()})
+
+        exact = uniques.join(self.exact_index, left_on="place", right_on="name", how="inner")
+        remaining = uniques.join(exact.select("place"), on="place", how="anti")
+        normalized = (
+            remaining.with_columns(normalize_category_expr(pl.col("place")).alias("key"))
+            .join(self.key_index, on="key", how="inner")
+            .drop("key")
+        )
+        remaining = remaining.join(normalized.select("place"), on="place", how="anti")
+        phonetic = (
+            remaining.with_columns(name_key_expr(pl.col("place"), "phonetic").alias("phonetic"))
+            .join(self.phonetic_index, on="phonetic", how="inner")
+            .drop("phonetic")
+        )
+
+        found = pl.concat([
+            exact.with_columns(pl.lit("exact").alias("match")),
+            normalized.with_columns(pl.lit("normalized").alias("match")),
+            phonetic.with_columns(pl.lit("phonetic").alias("match")),
+        ])
+        return uniques.join(found, on="place", how="left")
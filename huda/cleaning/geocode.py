@@ -1,9 +1,23 @@
 import polars as pl
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-import time
-
-def geocode(df, location_col=None, user_agent="huda_geocoder"):
+from .geocode_cache import GeocodeCache, DEFAULT_GEOCODE_CACHE
+
+# Remote results are written to the cache every this many lookups
+_CACHE_FLUSH_EVERY = 25
+
+# Remote lookups stop after this many failures in a row (network down, quota …)
+_MAX_CONSECUTIVE_ERRORS = 3
+
+def geocode(
+    df,
+    location_col=None,
+    user_agent="huda_geocoder",
+    country="Afghanistan",
+    gazetteer=None,
+    geocoder="nominatim",
+    cache_path=DEFAULT_GEOCODE_CACHE,
+    min_delay_seconds=1.0,
+    provider=None,
+):
     """
     🌍 Geocode Location Names → Latitude & Longitude
     ================================================
@@ -18,7 +32,10 @@ def geocode(df, location_col=None, user_agent="huda_geocoder"):
     - Detects location columns automatically (if not provided)
     - Uses OpenStreetMap to fetch latitude & longitude
     - Adds new columns: 'latitude' and 'longitude'
-    - Skips already processed places for efficiency
+    - Looks up each unique place name only once
+    - Searches an offline gazetteer first (exact, then normalized names)
+    - Keeps remote results in a persistent SQLite cache shared across runs
+    - Calls the remote geocoder only for true misses
     - Works with English, Dari, and Pashto names
 
     🧠 Parameters:
@@ -27,6 +44,23 @@ def geocode(df, location_col=None, user_agent="huda_geocoder"):
         Your dataset containing location names.
     location_col : str | None
         The column name containing location names. If None, it tries to guess automatically.
+    country : str | None
+        Appended to remote queries ("Kabul, Afghanistan"). None → send the name as is.
+    gazetteer : Gazetteer | None
+        Offline index of admin/settlement names with P-codes (adds a 'pcode' column).
+    geocoder : "nominatim" | callable | None
+        Remote lookup for names not in the gazetteer. A callable receives the query
+        string and returns (lat, lon), a geopy Location or None — handy for tests or
+        other providers. None → offline only.
+    cache_path : str | None
+        SQLite cache file (default ~/.cache/huda/geocode.sqlite). None → no cache.
+        Only real misses are cached; timeouts and HTTP errors are retried next run.
+        Results are saved every few lookups, so an interrupted run keeps its progress.
+    provider : str | None
+        Cache namespace for a custom `geocoder` callable (e.g. "my_arcgis"); required
+        when a callable is used with a cache, so different providers never share entries.
+    min_delay_seconds : float
+        Rate limit for Nominatim (OpenStreetMap policy: 1 request per second).
 
     🧩 Example Usage:
     -----------------
@@ -37,6 +71,14 @@ def geocode(df, location_col=None, user_agent="huda_geocoder"):
 
     df_geo = geocode(df, location_col="province")
 
+    # Offline first, remote only for misses
+    gaz = Gazetteer("afg_admin_settlements.csv", name_col="name", pcode_col="pcode")
+    df_geo = geocode(df, location_col="province", gazetteer=gaz)
+
+    # Fully offline / testing with a local stub
+    df_geo = geocode(df, location_col="province", geocoder=lambda q: (34.5, 69.2), cache_path=None)
+    df_geo = geocode(df, location_col="province", geocoder=my_lookup, provider="my_lookup_v1")
+
     🧾 Output:
     -----------
     ┌──────────────┬────────────┬───────────┬──────────────┐
@@ -71,38 +113,116 @@ def geocode(df, location_col=None, user_agent="huda_geocoder"):
                 raise ValueError("⚠️ No location column found. Please specify one manually.")
             location_col = possible_cols[0]
 
-        # Initialize geocoder
-        geolocator = Nominatim(user_agent=user_agent)
-        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-
-        # Cache results to avoid duplicate API calls
-        cache = {}
-
-        latitudes, longitudes = [], []
-
-        for place in df[location_col]:
-            place = str(place).strip()
-            if place in cache:
-                lat, lon = cache[place]
-            else:
-                time.sleep(1)
-                location = geocode(f"{place}, Afghanistan")
-                if location:
-                    lat, lon = location.latitude, location.longitude
-                else:
-                    lat, lon = None, None
-                cache[place] = (lat, lon)
-            latitudes.append(lat)
-            longitudes.append(lon)
-
-        df = df.with_columns([
-            pl.Series("latitude", latitudes),
-            pl.Series("longitude", longitudes)
+        # 🧮 Deduplicate first: every step below works on unique names only
+        places = df.get_column(location_col).cast(pl.Utf8).str.strip_chars()
+        resolved = pl.DataFrame({"place": places.unique().drop_nulls()}).filter(pl.col("place") != "")
+        resolved = resolved.with_columns([
+            pl.lit(None, dtype=pl.Float64).alias("latitude"),
+            pl.lit(None, dtype=pl.Float64).alias("longitude"),
+            pl.lit(None, dtype=pl.Utf8).alias("pcode"),
         ])
-
-        print(f"✅ Geocoded successfully based on: {location_col}")
+        counts = {"gazetteer": 0, "cache": 0, "remote": 0}
+
+        # 📖 Step 1: offline gazetteer (exact, then normalized names)
+        if gazetteer is not None:
+            hits = gazetteer.lookup(resolved["place"]).filter(pl.col("match").is_not_null())
+            counts["gazetteer"] = hits.height
+            resolved = resolved.update(hits.select(["place", "latitude", "longitude", "pcode"]), on="place")
+            misses = resolved.join(hits.select("place"), on="place", how="anti")["place"].to_list()
+        else:
+            misses = resolved["place"].to_list()
+
+        # 💾 Step 2: persistent cache, then 🌐 Step 3: remote geocoder for true misses
+        if misses and geocoder is not None:
+            queries = {p: (f"{p}, {country}" if country else p) for p in misses}
+
+            if cache_path:
+                if not isinstance(geocoder, str) and not provider:
+                    raise ValueError("Pass provider='<name>' to cache results of a custom geocoder.")
+                cache = GeocodeCache(cache_path, provider=geocoder if isinstance(geocoder, str) else provider)
+                cached = cache.get_many(queries.values())
+            else:
+                cache, cached = None, {}
+            counts["cache"] = sum(1 for q in queries.values() if q in cached)
+
+            to_fetch = [q for q in dict.fromkeys(queries.values()) if q not in cached]
+            if to_fetch:
+                lookup = _nominatim(user_agent, min_delay_seconds) if geocoder == "nominatim" else geocoder
+                fetched, pending, failed, errors_in_row = {}, {}, 0, 0
+                try:
+                    for q in to_fetch:
+                        try:
+                            fetched[q] = pending[q] = _as_lat_lon(lookup(q))
+                            errors_in_row = 0
+                        except Exception as e:
+                            # Timeout / HTTP error: not a miss, so not cached (retried next run)
+                            failed += 1
+                            errors_in_row += 1
+                            if errors_in_row >= _MAX_CONSECUTIVE_ERRORS:
+                                print(f"⚠️ Remote geocoder keeps failing ({e}); stopping remote lookups")
+                                break
+                        if cache is not None and len(pending) >= _CACHE_FLUSH_EVERY:
+                            cache.put_many(pending)
+                            pending = {}
+                finally:
+                    if cache is not None and pending:
+                        cache.put_many(pending)
+                counts["remote"] = len(fetched)
+                if failed:
+                    print(f"⚠️ {failed} remote lookup(s) failed (not cached, retried next run)")
+                cached.update(fetched)
+            if cache is not None:
+                cache.close()
+
+            coords = pl.DataFrame(
+                {
+                    "place": list(queries.keys()),
+                    "latitude": [cached.get(q, (None, None))[0] for q in queries.values()],
+                    "longitude": [cached.get(q, (None, None))[1] for q in queries.values()],
+                },
+                schema={"place": pl.Utf8, "latitude": pl.Float64, "longitude": pl.Float64},
+            )
+            resolved = resolved.update(coords, on="place")
+
+        # 🔗 Join coordinates back to every row (one native join)
+        if gazetteer is None:
+            resolved = resolved.drop("pcode")
+        df = (
+            df.with_columns(places.alias("__huda_place"))
+            .join(resolved, left_on="__huda_place", right_on="place", how="left", maintain_order="left")
+            .drop("__huda_place")
+        )
+
+        print(
+            f"✅ Geocoded {resolved.height} unique place(s) from '{location_col}' "
+            f"(gazetteer: {counts['gazetteer']}, cache: {counts['cache']}, remote: {counts['remote']})"
+        )
         return df
 
     except Exception as e:
         print("⚠️ Error during geocoding:", e)
         return df
+
+
+def _nominatim(user_agent, min_delay_seconds):
+    """
+    Build the default OpenStreetMap (Nominatim) lookup, rate limited once (no extra sleep).
+    Errors are raised (not swallowed into None) so they are never cached as misses.
+    """
+    from geopy.geocoders import Nominatim
+    from geopy.extra.rate_limiter import RateLimiter
+
+    geolocator = Nominatim(user_agent=user_agent)
+    return RateLimiter(geolocator.geocode, min_delay_seconds=min_delay_seconds, swallow_exceptions=False)
+
+
+def _as_lat_lon(result):
+    """Accept a geopy Location, a (lat, lon) tuple/dict, or None."""
+    if result is None:
+        return (None, None)
+    if hasattr(result, "latitude"):
+        return (result.latitude, result.longitude)
+    if isinstance(result, dict):
+        return (result.get("latitude", result.get("lat")), result.get("longitude", result.get("lon")))
+    lat, lon = result
+    return (lat, lon)
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+DEFAULT_GEOCODE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "huda", "geocode.sqlite")
+
+
+class GeocodeCache:
+    """
+    💾 Persistent SQLite cache for geocoding results (shared across runs).
+
+    💡 Simple Explanation:
+    ----------------------
+    Every remote lookup (hit or miss) is stored on disk, keyed by the exact
+    query sent to the geocoder (e.g. "Kabul, Afghanistan") and the provider name.
+    The next time you geocode the same place, no network call is made.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.cleaning import GeocodeCache
+
+        cache = GeocodeCache()                      # ~/.cache/huda/geocode.sqlite
+        cache.put_many({"Kabul, Afghanistan": (34.53, 69.17)})
+        cache.get_many(["Kabul, Afghanistan"])      # {"Kabul, Afghanistan": (34.53, 69.17)}
+    """
+
+    def __init__(self, path: str = DEFAULT_GEOCODE_CACHE, provider: str = "nominatim"):
+        self.path = path
+        self.provider = provider
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (provider, query)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, queries: Iterable[str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """Return cached (lat, lon) for the queries found; misses are stored as (None, None)."""
+        queries = list(queries)
+        found = {}
+        # SQLite limits the number of bound parameters, so query in chunks
+        for i in range(0, len(queries), 500):
+            chunk = queries[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT query, latitude, longitude FROM geocode_cache "
+                f"WHERE provider = ? AND query IN ({placeholders})",
+                [self.provider, *chunk],
+            ).fetchall()
+            found.update({q: (lat, lon) for q, lat, lon in rows})
+        return found
+
+    def put_many(self, results: Dict[str, Tuple[Optional[float], Optional[float]]]):
+        """Store (lat, lon) results; (None, None) records a known miss."""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO geocode_cache VALUES (?, ?, ?, ?, ?)",
+            [(self.provider, q, lat, lon, now) for q, (lat, lon) in results.items()],
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Remove every cached result for this provider."""
+        self._conn.execute("DELETE FROM geocode_cache WHERE provider = ?", [self.provider])
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM geocode_cache WHERE provider = ?", [self.provider]
+        ).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
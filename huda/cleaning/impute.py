@@ -0,0 +1,145 @@
+import polars as pl
+
+_STAT_STRATEGIES = ("mean", "median", "mode")
+_SEQUENTIAL_STRATEGIES = ("forward", "backward", "forward_backward")
+
+
+def impute(df, strategy_by_column, group_by=None, order_by=None):
+    """
+    🩹 Fill missing values in many columns at once, optionally per group.
+
+    💡 Simple Explanation:
+    ----------------------
+    `fill_mean`, `fill_median`, `fill_mode`, `fill_constant`, `forward_fill`
+    and `backward_fill` work on one column at a time. With 80 indicator
+    columns that means 80 passes over the data. `impute` takes one strategy
+    per column, computes every statistic it needs in ONE (grouped)
+    aggregation and applies all fills in ONE pass. Works on DataFrames and
+    LazyFrames.
+
+    🧾 Parameters:
+    ---------------
+    df : pl.DataFrame | pl.LazyFrame
+        Data with missing values.
+    strategy_by_column : dict
+        {column: strategy}. Strategies:
+            - "mean", "median", "mode"   → statistic of the column (per group); "mean"
+                                           turns integer columns into Float64, "median"
+                                           keeps them integer (rounded)
+            - "forward", "backward"      → previous / next known value (per group)
+            - "forward_backward"         → forward fill, then backward fill for leading gaps
+            - ("constant", value)        → a fixed value
+    group_by : str | list[str] | None
+        Compute statistics and forward/back fills within these groups
+        (e.g. "province"). Rows with a null group key (or in a group with no
+        values) get the whole-dataset statistic. None → whole dataset.
+    order_by : str | None
+        Column that orders rows for forward/back fill (e.g. "date"). The
+        original row order is kept in the output. None → current row order.
+
+    🧠 Example Usage:
+    -----------------
+        df = pl.DataFrame({
+            "province": ["Kabul", "Kabul", "Kabul", "Herat", "Herat"],
+            "date": ["2024-03", "2024-01", "2024-02", "2024-01", "2024-02"],
+            "price": [None, 100.0, 110.0, 90.0, None],
+            "households": [50, None, 70, None, 30],
+            "market_status": ["open", None, "open", "closed", None],
+        })
+
+        df_clean = impute(
+            df,
+            {"price": "forward", "households": "median",
+             "market_status": ("constant", "unknown")},
+            group_by="province",
+            order_by="date",
+        )
+
+    🧾 Output:
+    -----------
+        ┌──────────┬─────────┬───────┬────────────┬───────────────┐
+        │ province ┆ date    ┆ price ┆ households ┆ market_status │
+        ╞══════════╪═════════╪═══════╪════════════╪═══════════════╡
+        │ Kabul    ┆ 2024-03 ┆ 110.0 ┆ 50         ┆ open          │
+        │ Kabul    ┆ 2024-01 ┆ 100.0 ┆ 60         ┆ unknown       │
+        │ Kabul    ┆ 2024-02 ┆ 110.0 ┆ 70         ┆ open          │
+        │ Herat    ┆ 2024-01 ┆ 90.0  ┆ 30         ┆ closed        │
+        │ Herat    ┆ 2024-02 ┆ 90.0  ┆ 30         ┆ unknown       │
+        └──────────┴─────────┴───────┴────────────┴───────────────┘
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Cleaning wide assessment datasets with many indicator columns.
+        - Filling market prices or monitoring series per district over time.
+    💡 Why:
+        - One aggregation + one pass instead of one pass per column.
+        - Group statistics are more realistic than one national value.
+    """
+    try:
+        schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+
+        missing = [c for c in list(strategy_by_column) + group_by + ([order_by] if order_by else []) if c not in schema]
+        if missing:
+            raise ValueError(f"❌ Columns not found: {', '.join(missing)}")
+
+        # 🧮 Every statistic in ONE aggregation (global or per group)
+        stat_exprs, fill_exprs = [], []
+        for col, strategy in strategy_by_column.items():
+            dtype = schema[col]
+            if isinstance(strategy, tuple) and len(strategy) == 2 and strategy[0] == "constant":
+                fill_exprs.append(pl.col(col).fill_null(pl.lit(strategy[1])).cast(dtype).alias(col))
+            elif strategy in _STAT_STRATEGIES:
+                if strategy == "mean":
+                    stat = pl.col(col).mean()
+                elif strategy == "median":
+                    stat = pl.col(col).median()
+                    # Integer columns stay integer (median rounded)
+                    stat = stat.round(0).cast(dtype) if dtype.is_integer() else stat.cast(dtype)
+                else:
+                    stat = pl.col(col).drop_nulls().mode().sort().first()
+                stat_exprs.append(stat.alias(f"__fill_{col}"))
+                filled = pl.col(col).fill_null(pl.col(f"__fill_{col}"))
+                if group_by:
+                    # Null group key (or a group without values) → whole-dataset statistic
+                    filled = filled.fill_null(stat)
+                fill_exprs.append(filled.alias(col))
+            elif strategy in _SEQUENTIAL_STRATEGIES:
+                filled = pl.col(col)
+                if strategy in ("forward", "forward_backward"):
+                    filled = filled.fill_null(strategy="forward")
+                if strategy in ("backward", "forward_backward"):
+                    filled = filled.fill_null(strategy="backward")
+                fill_exprs.append((filled.over(group_by) if group_by else filled).alias(col))
+            else:
+                raise ValueError(
+                    f"❌ Invalid strategy for '{col}': {strategy!r}. Use 'mean', 'median', 'mode', "
+                    "'forward', 'backward', 'forward_backward' or ('constant', value)."
+                )
+
+        # 📅 Forward/back fill follow `order_by`; the original order is restored afterwards
+        sequential = any(s in _SEQUENTIAL_STRATEGIES for s in strategy_by_column.values() if isinstance(s, str))
+        work = df
+        if order_by and sequential:
+            work = work.with_row_index("__impute_row").sort([*group_by, order_by], maintain_order=True)
+
+        if stat_exprs and group_by:
+            stats = df.group_by(group_by).agg(stat_exprs)
+            work = work.join(stats, on=group_by, how="left", maintain_order="left")
+        elif stat_exprs:
+            work = work.with_columns(stat_exprs)
+
+        # 🧹 All fills in ONE with_columns
+        result = work.with_columns(fill_exprs)
+        if order_by and sequential:
+            result = result.sort("__impute_row").drop("__impute_row")
+        result = result.drop([f"__fill_{c}" for c, s in strategy_by_column.items() if isinstance(s, str) and s in _STAT_STRATEGIES])
+
+        scope = f" per {', '.join(group_by)}" if group_by else ""
+        print(f"✅ Missing values imputed{scope} for {len(strategy_by_column)} column(s): {', '.join(strategy_by_column)}")
+        return result
+
+    except Exception as e:
+        print("⚠️ Error while imputing missing values:", e)
+        return df
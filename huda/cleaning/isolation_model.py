@@ -0,0 +1,176 @@
+import numpy as np
+import polars as pl
+from typing import Iterable, List, Optional, Union
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+from .lazy_io import sample_data
+
+
+def fit_isolation_model(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    columns: Optional[List[str]] = None,
+    contamination: Optional[float] = None,
+    train_sample: Optional[Union[int, float]] = 100_000,
+    max_samples: Union[int, float, str] = "auto",
+    n_estimators: int = 100,
+    n_jobs: Optional[int] = None,
+    random_state: int = 42,
+) -> dict:
+    """
+    🌲 Fit an Isolation Forest (+ the scaler used to fit it) on a subsample.
+
+    💡 Simple Explanation:
+    ----------------------
+    Isolation Forest does not need millions of rows to learn what "normal"
+    looks like. This function trains on a random subsample (`train_sample`
+    rows), scales the columns with a StandardScaler, and returns a model
+    bundle you can save with `save_isolation_model` and reuse every survey
+    round with `score_isolation_model`, without refitting.
+
+    🧾 Parameters:
+    ---------------
+    df : pl.DataFrame | pl.LazyFrame
+        Training data.
+    columns : list[str] | None
+        Numeric columns to use (default: all numeric columns).
+    contamination : float | None
+        Expected share of outliers. None → estimated on the training sample as
+        the share of rows with at least one value outside its column's IQR
+        fences, capped between 1% and 15%.
+    train_sample : int | float | None
+        Rows (int) or fraction (float) used for training. None → all rows.
+        The sample is drawn inside the lazy plan, so a LazyFrame source is
+        never loaded whole. All-null columns are filled with 0.
+    max_samples, n_estimators, n_jobs, random_state :
+        Passed to sklearn's IsolationForest (n_jobs=-1 → all CPU cores).
+
+    Returns:
+    --------
+    dict with "model", "scaler", "columns", "medians" (used to fill nulls)
+    and "contamination".
+
+    🧠 Example Usage:
+    -----------------
+        bundle = fit_isolation_model(df_round1, columns=["price", "population"], n_jobs=-1)
+        save_isolation_model(bundle, "models/price_iforest.joblib")
+    """
+    if isinstance(df, pl.LazyFrame):
+        schema = df.collect_schema()
+    else:
+        schema = df.schema
+    if columns is None:
+        columns = [c for c, t in schema.items() if t.is_numeric()]
+    if not columns:
+        raise ValueError("No numeric columns found to fit the isolation model.")
+
+    # 🎲 Subsample inside the lazy plan: only the training sample is ever collected
+    lf = df.lazy().select([pl.col(c).cast(pl.Float64) for c in columns])
+    if train_sample is not None:
+        lf = sample_data(lf, train_sample, seed=random_state)
+    sample = lf.collect(engine="streaming")
+
+    medians = sample.select([pl.col(c).median() for c in columns]).row(0)
+    empty = [c for c, m in zip(columns, medians) if m is None]
+    if empty:
+        print(f"⚠️ Only nulls in {', '.join(empty)}: filled with 0 (the column carries no signal)")
+    medians = tuple(0.0 if m is None else m for m in medians)
+    sample = sample.with_columns([pl.col(c).fill_null(m) for c, m in zip(columns, medians)])
+
+    # 🧮 Auto contamination, per column (IQR fences), all columns in one aggregation
+    if contamination is None:
+        q = sample.select(
+            [pl.col(c).quantile(0.25).alias(f"{c}__q1") for c in columns]
+            + [pl.col(c).quantile(0.75).alias(f"{c}__q3") for c in columns]
+        ).row(0, named=True)
+        outside = pl.any_horizontal([
+            (pl.col(c) < q[f"{c}__q1"] - 1.5 * (q[f"{c}__q3"] - q[f"{c}__q1"]))
+            | (pl.col(c) > q[f"{c}__q3"] + 1.5 * (q[f"{c}__q3"] - q[f"{c}__q1"]))
+            for c in columns
+        ])
+        fraction = sample.select(outside.mean()).item()
+        contamination = float(np.clip(fraction or 0.0, 0.01, 0.15))
+        print(f"📊 Auto contamination estimated as: {contamination:.3f}")
+
+    data = sample.to_numpy().astype(np.float64)
+    scaler = StandardScaler().fit(data)
+    model = IsolationForest(
+        n_estimators=n_estimators,
+        max_samples=max_samples,
+        contamination=contamination,
+        n_jobs=n_jobs,
+        random_state=random_state,
+    ).fit(scaler.transform(data))
+
+    print(f"✅ Isolation model trained on {sample.height} rows × {len(columns)} columns")
+    return {
+        "model": model,
+        "scaler": scaler,
+        "columns": list(columns),
+        "medians": list(medians),
+        "contamination": contamination,
+    }
+
+
+def save_isolation_model(bundle: dict, path: str):
+    """💾 Save a model bundle (model + scaler + columns) to disk with joblib."""
+    import joblib
+
+    joblib.dump(bundle, path)
+    print(f"✅ Isolation model saved to {path}")
+
+
+def load_isolation_model(path: str) -> dict:
+    """📂 Load a model bundle saved with `save_isolation_model`."""
+    import joblib
+
+    return joblib.load(path)
+
+
+def score_isolation_model(
+    data: Union[pl.DataFrame, pl.LazyFrame, Iterable[pl.DataFrame]],
+    bundle: dict,
+    batch_size: int = 500_000,
+) -> pl.DataFrame:
+    """
+    📈 Score data with a fitted bundle, in fixed-size batches.
+
+    Only `batch_size` rows are converted to NumPy at a time. `data` can be a
+    DataFrame, a LazyFrame (read once in batches, e.g. from `pl.scan_parquet`)
+    or any iterable of DataFrames (streamed chunks, e.g. a CSV batch reader).
+
+    Returns:
+    --------
+    pl.DataFrame (same row order as the input) with:
+        - anomaly_score : higher = more anomalous (> 0 → outlier)
+        - is_outlier    : bool
+
+    🧠 Example Usage:
+    -----------------
+        bundle = load_isolation_model("models/price_iforest.joblib")
+        scores = score_isolation_model(pl.scan_parquet("round2/*.parquet"), bundle, batch_size=1_000_000)
+    """
+    columns, medians = bundle["columns"], bundle["medians"]
+    fill = [pl.col(c).cast(pl.Float64).fill_null(m) for c, m in zip(columns, medians)]
+
+    def batches():
+        if isinstance(data, pl.LazyFrame):
+            # One pass over the source (streaming engine), `batch_size` rows at a time
+            yield from data.select(fill).collect_batches(chunk_size=batch_size)
+        elif isinstance(data, pl.DataFrame):
+            for batch in data.iter_slices(batch_size):
+                yield batch.select(fill)
+        else:
+            for chunk in data:
+                yield chunk.select(fill)
+
+    parts = []
+    for batch in batches():
+        if batch.height == 0:
+            continue
+        x = bundle["scaler"].transform(batch.to_numpy())
+        score = -bundle["model"].decision_function(x)
+        parts.append(pl.DataFrame({"anomaly_score": score, "is_outlier": score > 0}))
+
+    if not parts:
+        return pl.DataFrame(schema={"anomaly_score": pl.Float64, "is_outlier": pl.Boolean})
+    return pl.concat(parts)
@@ -0,0 +1,213 @@
+import polars as pl
+from typing import List, Optional, Union
+from .lazy_io import scan_data, collect_data, normalize_key_expr
+
+_KEY_NORMALIZERS = ("trim", "casefold", "pcode")
+
+
+def join_datasets(
+    left,
+    right,
+    on: Optional[Union[str, List[str]]] = None,
+    how: str = "left",
+    left_on: Optional[Union[str, List[str]]] = None,
+    right_on: Optional[Union[str, List[str]]] = None,
+    normalize_keys: Optional[Union[bool, str, List[str]]] = None,
+    presorted: bool = False,
+    validate: str = "m:m",
+    streaming: bool = False,
+    output_path: Optional[str] = None,
+    lazy: Optional[bool] = None,
+    report: bool = False,
+    suffix: str = "_right",
+):
+    """
+    🔗 Join large datasets lazily, with key normalization and match diagnostics.
+
+    💡 Simple Explanation:
+    ----------------------
+    A 100M-row survey joined onto admin and population references does not fit
+    in memory if both tables are loaded first. This helper builds the join as a
+    lazy query (files are scanned, not read), can run it with Polars' streaming
+    engine or write it straight to Parquet, cleans the join keys so "Kabul " and
+    "kabul" or "af-0101" and "AF0101" match, and tells you how well keys matched.
+
+    🧾 Parameters:
+    ---------------
+    left, right : pl.DataFrame | pl.LazyFrame | str
+        Tables or file paths (.parquet, .csv, .ipc/.arrow — scanned lazily).
+    on / left_on, right_on : str | list[str]
+        Join key(s).
+    how : str
+        "inner", "left", "right", "full" ("outer"), "semi" or "anti".
+    normalize_keys : bool | str | list[str] | None
+        Key cleaning applied to BOTH sides before matching (original values are kept):
+            - "trim"     → strip surrounding whitespace
+            - "casefold" → lowercase
+            - "pcode"    → P-code canonical form: uppercase, drop spaces / - _ . /
+        True → ["trim", "casefold"].
+    presorted : bool
+        Both inputs are already sorted by the (single) join key → mark them as
+        sorted so Polars can use its sorted-merge join instead of hashing.
+    validate : str
+        Expected key relation: "m:m" (no check), "1:1", "1:m" or "m:1".
+    streaming : bool
+        Collect with the streaming engine (processes the data in batches).
+    output_path : str | None
+        Write the result to this Parquet file with a streaming sink (lowest
+        memory use) instead of returning it. Returns the path.
+    lazy : bool | None
+        Return a LazyFrame instead of collecting. Default: True when either
+        input is a LazyFrame or a file path.
+    report : bool
+        True → also return join diagnostics (key cardinality and match rates).
+
+    Returns:
+    --------
+    pl.DataFrame | pl.LazyFrame | str, or (result, report) when report=True.
+    The report is a dict with rows, distinct keys, max key multiplicity per
+    side, the relation ("1:1", "1:m", "m:1", "m:m"), the share of left rows /
+    right keys that found a match and a few unmatched key samples.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.cleaning import join_datasets
+
+        result, diag = join_datasets(
+            "survey_round3/*.parquet", "admin2_reference.csv",
+            on="adm2_pcode", how="left",
+            normalize_keys="pcode", report=True,
+            output_path="survey_with_admin.parquet",
+        )
+        print(diag["left_match_rate"], diag["left_unmatched_sample"])
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Joining tables larger than memory, or many files at once.
+        - Keys come from different partners with different spelling / case.
+    💡 Why:
+        - Lazy + streaming keeps memory bounded.
+        - Diagnostics show silently unmatched keys before they become null rows.
+    """
+    try:
+        how = "full" if how == "outer" else how
+        if on is not None:
+            left_on = right_on = on
+        left_on = [left_on] if isinstance(left_on, str) else list(left_on or [])
+        right_on = [right_on] if isinstance(right_on, str) else list(right_on or [])
+        if not left_on or len(left_on) != len(right_on):
+            raise ValueError("❌ Give `on`, or `left_on` and `right_on` with the same number of columns.")
+
+        if lazy is None:
+            lazy = not (isinstance(left, pl.DataFrame) and isinstance(right, pl.DataFrame))
+        left_lf, right_lf = scan_data(left), scan_data(right)
+
+        # 🔑 Normalized keys go in helper columns, so original values stay untouched
+        if normalize_keys is True:
+            normalize_keys = ["trim", "casefold"]
+        elif isinstance(normalize_keys, str):
+            normalize_keys = [normalize_keys]
+        normalize_keys = list(normalize_keys or [])
+        unknown = [n for n in normalize_keys if n not in _KEY_NORMALIZERS]
+        if unknown:
+            raise ValueError(f"❌ Unknown key normalization: {', '.join(unknown)}. Use {', '.join(_KEY_NORMALIZERS)}.")
+
+        if normalize_keys:
+            keys = [f"__key_{i}" for i in range(len(left_on))]
+            left_lf = left_lf.with_columns([normalize_key_expr(pl.col(c), normalize_keys).alias(k) for c, k in zip(left_on, keys)])
+            right_lf = right_lf.with_columns([normalize_key_expr(pl.col(c), normalize_keys).alias(k) for c, k in zip(right_on, keys)])
+            join_left, join_right = keys, keys
+        else:
+            join_left, join_right = left_on, right_on
+
+        # ⚡ Sorted-merge fast path: tell Polars the inputs are already ordered
+        if presorted:
+            if len(join_left) != 1:
+                raise ValueError("❌ presorted=True supports a single join key.")
+            left_lf = left_lf.set_sorted(join_left[0])
+            right_lf = right_lf.set_sorted(join_right[0])
+
+        diagnostics = _diagnostics(left_lf, right_lf, join_left, join_right, streaming) if report else None
+
+        joined = left_lf.join(
+            right_lf,
+            left_on=join_left,
+            right_on=join_right,
+            how=how,
+            validate=validate,
+            suffix=suffix,
+            coalesce=True,
+        )
+        if normalize_keys:
+            # Same-named original keys come back twice → keep one (left, else right)
+            if on is not None and how not in ("semi", "anti"):
+                joined = joined.with_columns([
+                    pl.coalesce([pl.col(c), pl.col(f"{c}{suffix}")]).alias(c) for c in left_on
+                ]).drop([f"{c}{suffix}" for c in left_on])
+            joined = joined.drop(join_left, strict=False)
+
+        if output_path:
+            joined.sink_parquet(output_path)
+            result = output_path
+            print(f"✅ Datasets joined ('{how}' on {', '.join(left_on)}) and written to {output_path}")
+        elif lazy:
+            result = joined
+            print(f"✅ Lazy '{how}' join on {', '.join(left_on)} prepared (collect it or pass output_path)")
+        else:
+            result = collect_data(joined, streaming)
+            print(f"✅ Datasets joined ('{how}' on {', '.join(left_on)}) → Rows: {result.height}, Columns: {result.width}")
+
+        if diagnostics is not None:
+            print(
+                f"📊 Keys: {diagnostics['relation']} | left rows matched: {diagnostics['left_match_rate']:.1%}"
+                f" | right keys matched: {diagnostics['right_match_rate']:.1%}"
+            )
+            return result, diagnostics
+        return result
+
+    except Exception as e:
+        print("⚠️ Error while joining datasets:", e)
+        return None
+
+
+def _diagnostics(left_lf, right_lf, left_keys, right_keys, streaming) -> dict:
+    """Key cardinality and match rates, computed on the key columns only."""
+    names = [f"__k{i}" for i in range(len(left_keys))]
+    left_counts = left_lf.group_by(left_keys).agg(pl.len().alias("n")).rename(dict(zip(left_keys, names)))
+    right_counts = right_lf.group_by(right_keys).agg(pl.len().alias("n")).rename(dict(zip(right_keys, names)))
+    matched = left_counts.join(right_counts, on=names, how="inner", suffix="_r").select(
+        pl.col("n").sum().alias("left_rows_matched"),
+        pl.len().alias("keys_matched"),
+    )
+    summary = pl.concat(
+        [
+            left_counts.select(pl.col("n").sum().alias("rows"), pl.len().alias("keys"), pl.col("n").max().alias("max_per_key")),
+            right_counts.select(pl.col("n").sum().alias("rows"), pl.len().alias("keys"), pl.col("n").max().alias("max_per_key")),
+        ],
+        how="vertical",
+    )
+    left_missing = left_counts.join(right_counts, on=names, how="anti").select(names).head(10)
+    right_missing = right_counts.join(left_counts, on=names, how="anti").select(names).head(10)
+
+    summary, matched, left_missing, right_missing = pl.collect_all(
+        [summary, matched, left_missing, right_missing],
+        **({"engine": "streaming"} if streaming else {}),
+    )
+    (l_rows, l_keys, l_max), (r_rows, r_keys, r_max) = summary.rows()
+    left_matched, keys_matched = matched.row(0)
+    relation = f"{'1' if (l_max or 0) <= 1 else 'm'}:{'1' if (r_max or 0) <= 1 else 'm'}"
+
+    return {
+        "left_rows": l_rows or 0,
+        "right_rows": r_rows or 0,
+        "left_keys": l_keys,
+        "right_keys": r_keys,
+        "left_max_per_key": l_max or 0,
+        "right_max_per_key": r_max or 0,
+        "relation": relation,
+        "left_match_rate": (left_matched or 0) / l_rows if l_rows else 0.0,
+        "right_match_rate": keys_matched / r_keys if r_keys else 0.0,
+        "left_unmatched_sample": [r[0] if len(r) == 1 else r for r in left_missing.rows()],
+        "right_unmatched_sample": [r[0] if len(r) == 1 else r for r in right_missing.rows()],
+    }
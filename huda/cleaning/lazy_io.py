@@ -0,0 +1,72 @@
+"""
+🧰 Lazy I/O helpers shared by the lazy / streaming functions of HuDa
+=====================================================================
+
+- scan_data          → DataFrame / LazyFrame / file path as a LazyFrame (files are scanned, not read)
+- collect_data       → collect a LazyFrame, optionally with the streaming engine
+- normalize_key_expr → join-key normalization ("trim", "casefold", "pcode")
+- sample_data        → random subsample drawn inside the lazy plan (only the sample is collected)
+"""
+import polars as pl
+from typing import List, Optional, Union
+
+# Resolution of the hash-based sample (ratio steps of one in a million)
+_SAMPLE_BUCKETS = 1_000_000
+
+
+def scan_data(data) -> pl.LazyFrame:
+    """DataFrame / LazyFrame / file path → LazyFrame (files are scanned, not read)."""
+    if isinstance(data, pl.LazyFrame):
+        return data
+    if isinstance(data, pl.DataFrame):
+        return data.lazy()
+    if isinstance(data, str):
+        if data.endswith(".parquet"):
+            return pl.scan_parquet(data)
+        if data.endswith((".ipc", ".arrow", ".feather")):
+            return pl.scan_ipc(data)
+        return pl.scan_csv(data)
+    raise TypeError("Inputs must be Polars DataFrames, LazyFrames or file paths.")
+
+
+def collect_data(lf: pl.LazyFrame, streaming: bool = False) -> pl.DataFrame:
+    """Collect a LazyFrame (streaming=True → streaming engine, in batches)."""
+    if not streaming:
+        return lf.collect()
+    return lf.collect(engine="streaming")
+
+
+def normalize_key_expr(expr: pl.Expr, steps: List[str]) -> pl.Expr:
+    """Key as text, normalized by `steps`: "trim", "casefold", "pcode" ("af-0101" → "AF0101")."""
+    expr = expr.cast(pl.Utf8)
+    if "trim" in steps:
+        expr = expr.str.strip_chars()
+    if "casefold" in steps:
+        expr = expr.str.to_lowercase()
+    if "pcode" in steps:
+        expr = expr.str.to_uppercase().str.replace_all(r"[\s\-_./]", "")
+    return expr
+
+
+def sample_data(lf: pl.LazyFrame, sample: Union[int, float], seed: Optional[int] = None) -> pl.LazyFrame:
+    """
+    Random subsample inside the lazy plan: a float in (0, 1] is a fraction, anything
+    else a number of rows. Rows are kept by a hash of their row index, so a file scan
+    is never materialized whole (a row count needs one cheap pass for a number of rows).
+    """
+    if isinstance(sample, float) and 0 < sample <= 1:
+        ratio, n = sample, None
+    else:
+        total = lf.select(pl.len()).collect().item()
+        n = int(sample)
+        if n >= total:
+            return lf
+        ratio = n / total
+    if ratio >= 1:
+        return lf
+    kept = (
+        lf.with_row_index("__huda_row")
+        .filter(pl.col("__huda_row").hash(seed=seed or 0) % _SAMPLE_BUCKETS < int(ratio * _SAMPLE_BUCKETS) + 1)
+        .drop("__huda_row")
+    )
+    return kept.head(n) if n is not None else kept
@@ -0,0 +1,171 @@
+"""
+🔤 Name Keys (Dari, Pashto, Latin transliterations)
+==================================================
+
+Vectorized keys for matching place and person names written in Perso-Arabic
+script or in any of the usual Latin transliterations.
+
+Three levels:
+    - "script"   → letter variants, digits, diacritics, case and punctuation unified
+    - "latin"    → Latin spellings unified: ezafe connectors ("-e-", " i ") and
+                   vowel spellings ("ee", "oo"). Perso-Arabic is transliterated
+                   letter by letter, and short vowels are not written in the
+                   script, so "مزار شریف" → "mzar shrif" while "Mazar-e-Sharif" →
+                   "mazar sharif": this key does NOT match across scripts
+    - "phonetic" → consonant skeleton tuned to Dari/Pashto: short vowels are not
+                   written in the script, so vowels (except a name-initial one),
+                   w/y/h inside words and doubled letters are dropped, and sound
+                   classes are merged (kh/x, q/k, v/w, sh/s …)
+
+    "Mazar-e-Sharif", "Mazar i Sharif", "Mazari Sharif", "مزار شریف" → "mzrsrf"
+    "Mohammad", "Muhammad", "محمد"                                → "md"
+
+The phonetic key is a BLOCKING key only: it is coarse enough to merge different
+names ("Mahmud" → "md" like "Mohammad", "Karim" / "Karima" → "krm"). Use it to
+group candidates for a real comparison (`near_duplicates(block_by=...)`), never
+as an exact hash-join key for reconciliation. "script" and "latin" keys can be
+joined on directly, within one script.
+"""
+import polars as pl
+from typing import List, Union
+from .category_dictionaries import normalize_category_expr
+from .numbers_standardization import apply_on_unique_values
+
+NAME_KEY_KINDS = ("script", "latin", "phonetic")
+
+# 🔠 Perso-Arabic → Latin (after `normalize_category_expr` unified letter variants)
+_TRANSLITERATION = {
+    "ا": "a", "ب": "b", "پ": "p", "ت": "t", "ټ": "t", "ث": "s", "ج": "j", "چ": "ch",
+    "ح": "h", "خ": "kh", "څ": "ts", "ځ": "dz", "د": "d", "ډ": "d", "ذ": "z", "ر": "r",
+    "ړ": "r", "ز": "z", "ژ": "zh", "ږ": "zh", "س": "s", "ش": "sh", "ښ": "sh", "ص": "s",
+    "ض": "z", "ط": "t", "ظ": "z", "ع": "a", "غ": "gh", "ف": "f", "ق": "q", "ک": "k",
+    "گ": "g", "ګ": "g", "ل": "l", "م": "m", "ن": "n", "ڼ": "n", "و": "u", "ه": "h",
+    "ی": "i", "ء": "",
+}
+
+# Latin spelling variants of the same vowel
+_VOWEL_SPELLINGS = {"ee": "i", "ii": "i", "oo": "u", "ou": "u", "uu": "u", "aa": "a"}
+
+# 🔊 Sound classes (digraphs first, then single letters)
+_DIGRAPHS = {
+    "kh": "x", "gh": "g", "sh": "s", "ch": "c", "zh": "j", "th": "t",
+    "dh": "d", "ph": "f", "ck": "k", "ts": "s", "dz": "z",
+}
+_LETTERS = {"q": "k", "v": "w"}
+
+
+def _to_sound_classes(latin):
+    for digraph, sound in _DIGRAPHS.items():
+        latin = latin.replace(digraph, sound)
+    return latin
+
+
+_PHONETIC_LETTERS = {k: _to_sound_classes(v) for k, v in _TRANSLITERATION.items()}
+
+_DOUBLES = [c * 2 for c in "bcdfgjklmnprstxz"]
+
+
+def _script_expr(expr: pl.Expr) -> pl.Expr:
+    text = normalize_category_expr(expr)
+    # و / ی start a word as consonants (w, y); inside a word they are long vowels
+    text = text.str.replace_all(r"(^|\s)و", "${1}w").str.replace_all(r"(^|\s)ی", "${1}y")
+    # Ezafe connectors: "Mazar-e-Sharif", "Sar i Pul" → "mazar sharif", "sar pul"
+    return text.str.replace_all(r"\s(?:e|i|y|ye|yi)\s", " ").str.replace_all(r"\s(?:e|i|y|ye|yi)\s", " ")
+
+
+def _latin_expr(expr: pl.Expr) -> pl.Expr:
+    text = _script_expr(expr).str.replace_many(list(_TRANSLITERATION), list(_TRANSLITERATION.values()))
+    text = text.str.replace_many(list(_VOWEL_SPELLINGS), list(_VOWEL_SPELLINGS.values()))
+    return text.str.replace_all(r"\s+", " ").str.strip_chars()
+
+
+def _phonetic_expr(expr: pl.Expr) -> pl.Expr:
+    # Latin digraphs first, then Perso-Arabic letters straight to sound classes
+    # (so "زهرا" → z+h+r, never the digraph "zh")
+    key = _script_expr(expr).str.replace_many(list(_DIGRAPHS), list(_DIGRAPHS.values()))
+    key = key.str.replace_many(list(_PHONETIC_LETTERS), list(_PHONETIC_LETTERS.values()))
+    key = key.str.replace_many(list(_LETTERS), list(_LETTERS.values()))
+    # Keep word-initial h / w / y as consonants, and a name-initial vowel as "a"
+    key = key.str.replace_all(r"(^|\s)h", "${1}H").str.replace_all(r"(^|\s)w", "${1}W").str.replace_all(r"(^|\s)y", "${1}Y")
+    key = key.str.replace_all(r"^[aeiou]", "A")
+    # Drop everything that is not written (or written inconsistently) in the script
+    key = key.str.replace_all(r"[aeiouwyh\s]", "").str.to_lowercase()
+    for _ in range(2):
+        key = key.str.replace_many(_DOUBLES, [d[0] for d in _DOUBLES])
+    return key
+
+
+def name_key_expr(expr: Union[str, pl.Expr], kind: str = "phonetic") -> pl.Expr:
+    """
+    🧩 Expression computing a name key ("script", "latin" or "phonetic") for a column.
+
+    Works on DataFrames and LazyFrames:
+        lf.with_columns(name_key_expr("district", "phonetic").alias("district_key"))
+    """
+    if kind not in NAME_KEY_KINDS:
+        raise ValueError(f"❌ Unknown name key kind '{kind}'. Use one of: {', '.join(NAME_KEY_KINDS)}")
+    expr = pl.col(expr) if isinstance(expr, str) else expr
+    if kind == "script":
+        return normalize_category_expr(expr)
+    return _latin_expr(expr) if kind == "latin" else _phonetic_expr(expr)
+
+
+def name_keys(df, columns: Union[str, List[str]], kinds: Union[str, List[str]] = "phonetic"):
+    """
+    🔑 Add canonical name key columns (`<column>_<kind>`) for multilingual names.
+
+    💡 Simple Explanation:
+    ----------------------
+    "Mazar-e-Sharif", "Mazar i Sharif" and "مزار شریف" are the same place,
+    "Muhammad", "Mohammad" and "محمد" the same name. This function adds key
+    columns computed once per distinct value with native Polars string
+    operations:
+        - "latin" unifies Latin spellings ("Mazar-e-Sharif" = "Mazar i Sharif"),
+          but not Perso-Arabic with Latin ("مزار شریف" → "mzar shrif")
+        - "phonetic" also reaches across scripts, but merges different names too
+          ("Mahmud" = "Mohammad" → "md"): block on it, never join on it
+
+    🧾 Parameters:
+    ---------------
+    df : pl.DataFrame | pl.LazyFrame
+    columns : str | list[str]
+        Name columns (places, persons).
+    kinds : str | list[str]
+        "script", "latin" and/or "phonetic" (default).
+
+    🧠 Example Usage:
+    -----------------
+        df = pl.DataFrame({"district": ["Mazar-e-Sharif", "Mazar i Sharif", "مزار شریف", "Kabul", "کابل"]})
+        name_keys(df, "district", kinds=["latin", "phonetic"])
+
+    🧾 Output:
+    -----------
+        ┌────────────────┬────────────────┬───────────────────┐
+        │ district       ┆ district_latin ┆ district_phonetic │
+        ╞════════════════╪════════════════╪═══════════════════╡
+        │ Mazar-e-Sharif ┆ mazar sharif   ┆ mzrsrf            │
+        │ Mazar i Sharif ┆ mazar sharif   ┆ mzrsrf            │
+        │ مزار شریف      ┆ mzar shrif     ┆ mzrsrf            │
+        │ Kabul          ┆ kabul          ┆ kbl               │
+        │ کابل           ┆ kabl           ┆ kbl               │
+        └────────────────┴────────────────┴───────────────────┘
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Reconciling Latin place-name spellings across partners ("latin" key).
+        - Blocking beneficiary lists across scripts before `near_duplicates` ("phonetic" key).
+    💡 Why:
+        - Exact hash joins / blocks on a key are far cheaper than fuzzy comparisons.
+    """
+    try:
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        kinds = [kinds] if isinstance(kinds, str) else list(kinds)
+        for col in columns:
+            for kind in kinds:
+                df = apply_on_unique_values(df, col, name_key_expr(pl.col(col).cast(pl.Utf8), kind), output_col=f"{col}_{kind}")
+        print(f"✅ Name keys ({', '.join(kinds)}) added for: {', '.join(columns)}")
+        return df
+    except Exception as e:
+        print("⚠️ Error while building name keys:", e)
+        return df
@@ -1,6 +1,16 @@
 import polars as pl
 import re
 
+
+def clean_column_name(col):
+    """🔤 Clean one column name the way `normalize_columns` does ("Country Name " → "country_name")."""
+    clean_name = col.strip().lower()
+    clean_name = re.sub(r"[^\w\s-]", "", clean_name)  # remove special chars
+    clean_name = clean_name.replace(" ", "_").replace("-", "_")
+    clean_name = re.sub(r"_+", "_", clean_name)  # remove multiple underscores
+    return clean_name.strip("_")
+
+
 def normalize_columns(df):
     """
     🧾 Normalize all column names in a Polars DataFrame.
@@ -57,21 +67,13 @@ def normalize_columns(df):
     └──────────────┴────────────────┴───────────────┘
     """
     try:
-        # Clean and normalize all column names
-        new_columns = []
-        for col in df.columns:
-            clean_name = col.strip().lower()
-            clean_name = re.sub(r"[^\w\s-]", "", clean_name)  # remove special chars
-            clean_name = clean_name.replace(" ", "_").replace("-", "_")
-            clean_name = re.sub(r"_+", "_", clean_name)  # remove multiple underscores
-            clean_name = clean_name.strip("_")
-            new_columns.append(clean_name)
+        old_columns = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+        new_columns = [clean_column_name(col) for col in old_columns]
 
-        # Assign new names to DataFrame
-        df_clean = df.rename(dict(zip(df.columns, new_columns)))
+        df_clean = df.rename(dict(zip(old_columns, new_columns)))
 
         print("✅ Column names normalized successfully!")
-        print("🔹 Old Names:", df.columns)
+        print("🔹 Old Names:", old_columns)
         print("🔹 New Names:", new_columns)
         return df_clean
     except Exception as e:
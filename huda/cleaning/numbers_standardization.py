@@ -1,5 +1,63 @@
 import polars as pl
-import re
+
+_MISSING_TOKENS = ["nan", "n/a", "none", "null", ""]
+_EASTERN_DIGITS = list("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩")
+_ASCII_DIGITS = list("0123456789") * 2
+
+
+def standardize_numbers_expr(column):
+    """
+    🧩 Expression form of `standardize_numbers` for one column (native Polars, no Python per row).
+
+    Works inside lazy queries:
+        lf.with_columns(standardize_numbers_expr("price"))
+    """
+    val = pl.col(column).cast(pl.Utf8).str.strip_chars()
+    val = (
+        pl.when(val.str.to_lowercase().is_in(_MISSING_TOKENS)).then(None).otherwise(val)
+        .str.replace_many(_EASTERN_DIGITS, _ASCII_DIGITS)
+        .str.replace_all(r"[^\d.,\-kKmMbB]", "")
+    )
+
+    # k / M / B suffixes (checked in that order)
+    multiplier = (
+        pl.when(val.str.contains("[kK]")).then(1_000)
+        .when(val.str.contains("[mM]")).then(1_000_000)
+        .when(val.str.contains("[bB]")).then(1_000_000_000)
+        .otherwise(1)
+    )
+    val = val.str.replace_all("[kKmMbB]", "")
+
+    # "1,200.50" / "1,200" → "1200.50" / "1200" (comma + 3 digits = thousands);
+    # "1.200,50" / "2,5" (EU decimal comma) → "1200.50" / "2.5"
+    val = (
+        pl.when(val.str.contains(r"^-?\d{1,3}(,\d{3})+(\.\d+)?$"))
+        .then(val.str.replace_all(",", "", literal=True))
+        .when(val.str.contains(r"^-?\d{1,3}(\.\d{3})*,\d+$"))
+        .then(val.str.replace_all(".", "", literal=True).str.replace(",", ".", literal=True))
+        .when(val.str.contains(",", literal=True) & ~val.str.contains(".", literal=True))
+        .then(val.str.replace_all(",", "", literal=True))
+        .otherwise(val)
+    )
+    return (val.cast(pl.Float64, strict=False) * multiplier).alias(column)
+
+
+def apply_on_unique_values(df, column, expr, output_col=None):
+    """
+    ⚡ Evaluate a costly per-value expression (regex parsing …) once per distinct value.
+
+    The distinct values of `column` are transformed with `expr`, then joined
+    back. Survey columns repeat the same few strings over millions of rows,
+    so this is much faster than running `expr` on every row. Works lazily.
+    """
+    output_col = output_col or column
+    uniques = df.select(pl.col(column)).unique().with_columns(expr.alias("__huda_new"))
+    return (
+        df.join(uniques, on=column, how="left", maintain_order="left")
+        .with_columns(pl.col("__huda_new").alias(output_col))
+        .drop("__huda_new")
+    )
+
 
 def standardize_numbers(df, columns=None):
     """
@@ -56,74 +114,21 @@ def standardize_numbers(df, columns=None):
     """
 
     try:
-        # 🔠 Mapping for Persian / Arabic digits to English
-        digit_map = str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789")
-
-        # 🧹 Cleaner function
-        def clean_number(value):
-            if value is None:
-                return None
-            val = str(value).strip()
-
-            # Skip if empty or known invalid
-            if val.lower() in ["nan", "n/a", "none", "null", ""]:
-                return None
-
-            # Convert Persian/Arabic digits
-            val = val.translate(digit_map)
-
-            # Remove spaces and currency symbols
-            val = re.sub(r"[^\d.,\-kKmMbB]", "", val)
-
-            # Handle multipliers
-            multiplier = 1
-            if re.search(r"[kK]", val):
-                multiplier = 1_000
-                val = re.sub(r"[kK]", "", val)
-            elif re.search(r"[mM]", val):
-                multiplier = 1_000_000
-                val = re.sub(r"[mM]", "", val)
-            elif re.search(r"[bB]", val):
-                multiplier = 1_000_000_000
-                val = re.sub(r"[bB]", "", val)
-
-            # Handle European format "1.200,50"
-            if re.match(r"^\d{1,3}(\.\d{3})*,\d+$", val):
-                val = val.replace(".", "").replace(",", ".")
-
-            # Handle standard format "1,200.50"
-            elif re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", val):
-                val = val.replace(",", "")
-
-            # Handle plain "1.200" or "1,200"
-            elif "," in val and "." not in val:
-                val = val.replace(",", "")
-
-            try:
-                return float(val) * multiplier
-            except:
-                return None
-
-        # 🔍 Determine which columns to process
         if columns is None:
-            columns_to_process = df.columns
+            columns_to_process = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
         elif isinstance(columns, str):
             columns_to_process = [columns]
         else:
             columns_to_process = columns
+        schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+        columns_to_process = [col for col in columns_to_process if col in schema]
 
-        # 🧩 Apply cleaning
+        # Native parsing on distinct values only (works on LazyFrames too)
         for col in columns_to_process:
-            if col not in df.columns:
-                continue
-
-            df = df.with_columns(
-                pl.col(col)
-                .cast(pl.Utf8)                       # <-- force string type first
-                .map_elements(clean_number, return_dtype=pl.Float64)
-                .alias(col)
-            )
-
+            if schema[col].is_numeric():
+                df = df.with_columns(pl.col(col).cast(pl.Float64))
+            else:
+                df = apply_on_unique_values(df, col, standardize_numbers_expr(col))
 
         print(f"✅ Normalized number formats in: {', '.join(columns_to_process)}")
         return df
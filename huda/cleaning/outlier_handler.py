@@ -1,6 +1,6 @@
 import polars as pl
 
-def outlier_handler(df, columns=None, method="iqr", factor=1.5):
+def outlier_handler(df, columns=None, method="iqr", factor=1.5, group_by=None, mode="null"):
     """
     📊 Handle extreme or unusual values (outliers) in numeric columns.
 
@@ -22,6 +22,20 @@ def outlier_handler(df, columns=None, method="iqr", factor=1.5):
     - IQR (default): flags values far from the interquartile range.
     - Z-score: flags values far from the mean.
 
+    Group By:
+    -------------------
+    - group_by="province" (or a list) → bounds are computed per group.
+      A value that is normal in Kabul can be an outlier in Nuristan.
+      Rows with a missing group value are checked as one group of their own.
+    - Bounds for all columns are computed in one aggregation and applied
+      in one pass. Works on DataFrames and LazyFrames.
+
+    Mode:
+    -------------------
+    - "null" (default): outliers are replaced with null.
+    - "flag": returns only a boolean mask (one `<column>_outlier` column per
+      checked column, True = outlier), the data is not changed.
+
     Example Usage:
     -------------------
         df = pl.DataFrame({
@@ -38,6 +52,9 @@ def outlier_handler(df, columns=None, method="iqr", factor=1.5):
         # Check multiple specific columns
         df_clean_some = handle_outliers(df, columns=["age", "income"])
 
+        # Bounds per province, only flag (keep values)
+        mask = outlier_handler(df, columns="income", group_by="province", mode="flag")
+
     Output:
     -------------------
         Extreme values are replaced with null, e.g.:
@@ -62,9 +79,12 @@ def outlier_handler(df, columns=None, method="iqr", factor=1.5):
         - Makes datasets cleaner and ready for analysis or modeling.
     """
     try:
-        # Identify numeric columns
-        numeric_cols = [col for col, dtype in zip(df.columns, df.dtypes) if dtype in [pl.Int64, pl.Float64]]
-        
+        schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+
+        # Identify numeric columns (all integer / float widths)
+        numeric_cols = [col for col, dtype in schema.items() if dtype.is_numeric() and col not in group_by]
+
         # Determine which columns to process
         if columns is None:
             cols_to_check = numeric_cols
@@ -72,34 +92,50 @@ def outlier_handler(df, columns=None, method="iqr", factor=1.5):
             cols_to_check = [columns]
         else:
             cols_to_check = columns
+        cols_to_check = [c for c in cols_to_check if c in schema]
+
+        if method not in ("iqr", "zscore"):
+            raise ValueError("❌ Invalid method. Use 'iqr' or 'zscore'.")
+        if mode not in ("null", "flag"):
+            raise ValueError("❌ Invalid mode. Use 'null' or 'flag'.")
 
-        # Apply outlier handling
+        # 🧮 Bounds for every column in ONE aggregation (global or per group)
+        bound_exprs = []
         for col in cols_to_check:
-            if col not in df.columns:
-                continue
             if method == "iqr":
-                q1 = df[col].quantile(0.25)
-                q3 = df[col].quantile(0.75)
-                iqr = q3 - q1
-                lower = q1 - factor * iqr
-                upper = q3 + factor * iqr
-                df = df.with_columns(
-                    pl.when((pl.col(col) < lower) | (pl.col(col) > upper))
-                    .then(None)
-                    .otherwise(pl.col(col))
-                    .alias(col)
-                )
-            elif method == "zscore":
-                mean = df[col].mean()
-                std = df[col].std()
-                df = df.with_columns(
-                    pl.when(((pl.col(col) - mean).abs() / std) > factor)
-                    .then(None)
-                    .otherwise(pl.col(col))
-                    .alias(col)
-                )
-        print(f"✅ Outliers handled for columns: {', '.join(cols_to_check)}")
-        return df
+                q1 = pl.col(col).quantile(0.25)
+                q3 = pl.col(col).quantile(0.75)
+                lower, upper = q1 - factor * (q3 - q1), q3 + factor * (q3 - q1)
+            else:
+                mean, std = pl.col(col).mean(), pl.col(col).std()
+                lower, upper = mean - factor * std, mean + factor * std
+            bound_exprs += [lower.alias(f"__lo_{col}"), upper.alias(f"__hi_{col}")]
+
+        if group_by:
+            bounds = df.group_by(group_by).agg(bound_exprs)
+            # Rows with a null group key form their own group (nulls_equal) instead of getting no bounds
+            work = df.join(bounds, on=group_by, how="left", maintain_order="left", nulls_equal=True)
+        else:
+            work = df.with_columns(bound_exprs)
+
+        is_outlier = {
+            col: ((pl.col(col) < pl.col(f"__lo_{col}")) | (pl.col(col) > pl.col(f"__hi_{col}"))).fill_null(False)
+            for col in cols_to_check
+        }
+        helper_cols = [f"__{side}_{col}" for col in cols_to_check for side in ("lo", "hi")]
+
+        # 🧹 Apply all columns in ONE with_columns
+        if mode == "flag":
+            result = work.select([is_outlier[col].alias(f"{col}_outlier") for col in cols_to_check])
+        else:
+            result = work.with_columns([
+                pl.when(is_outlier[col]).then(None).otherwise(pl.col(col)).alias(col)
+                for col in cols_to_check
+            ]).drop(helper_cols)
+
+        scope = f" per {', '.join(group_by)}" if group_by else ""
+        print(f"✅ Outliers {'flagged' if mode == 'flag' else 'handled'}{scope} for columns: {', '.join(cols_to_check)}")
+        return result
 
     except Exception as e:
         print("⚠️ Error while handling outliers:", e)
@@ -1,8 +1,19 @@
 import polars as pl
-from sklearn.ensemble import IsolationForest
-import numpy as np
-
-def outlier_isolation(df, columns=None, contamination=None, random_state=42):
+from .isolation_model import fit_isolation_model, save_isolation_model, load_isolation_model, score_isolation_model
+
+def outlier_isolation(
+    df,
+    columns=None,
+    contamination=None,
+    random_state=42,
+    train_sample=100_000,
+    max_samples="auto",
+    n_jobs=None,
+    model=None,
+    model_path=None,
+    batch_size=500_000,
+    return_scores=False,
+):
     """
     🛡 Handle outliers using Isolation Forest (with auto contamination detection).
 
@@ -21,9 +32,19 @@ def outlier_isolation(df, columns=None, contamination=None, random_state=42):
 
     📊 Auto Contamination Estimation:
     ---------------------------------
-    - Uses the IQR method to estimate what % of data points are outliers.
+    - Uses the IQR method, column by column, to estimate what % of rows have an outlier.
     - Then it limits that percentage between 1% and 15% (safe professional range).
 
+    ⚡ Large data & reuse:
+    ----------------------
+    - train_sample: the forest is trained on a random subsample (default 100,000 rows);
+      max_samples / n_jobs are passed to IsolationForest (n_jobs=-1 → all cores).
+    - model_path: save the fitted model + scaler to disk after training.
+    - model: a saved path (or bundle) to reuse → no refitting for the next survey round.
+    - Scoring runs in batches of `batch_size` rows.
+    - return_scores=True: keep every row and add 'anomaly_score' and 'is_outlier'
+      instead of dropping rows.
+
     🧩 Example Usage:
     -----------------
         df = pl.DataFrame({
@@ -41,6 +62,10 @@ def outlier_isolation(df, columns=None, contamination=None, random_state=42):
         # ✅ Case 3: Handle one column only
         df_one = outlier_isolation(df, columns="year")
 
+        # ✅ Case 4: Train once, save, score next month's round with scores
+        outlier_isolation(df, columns=["price", "population"], model_path="iforest.joblib")
+        df_scored = outlier_isolation(df_next_round, model="iforest.joblib", return_scores=True)
+
     📅 When & Why:
     -----------------
     ✅ Use when:
@@ -60,8 +85,11 @@ def outlier_isolation(df, columns=None, contamination=None, random_state=42):
 
     try:
         # 🔍 Step 1: Select numeric columns if not provided
-        if columns is None:
-            columns_to_use = [c for c, t in zip(df.columns, df.dtypes) if t in [pl.Int64, pl.Float64]]
+        if model is not None:
+            bundle = load_isolation_model(model) if isinstance(model, str) else model
+            columns_to_use = bundle["columns"]
+        elif columns is None:
+            columns_to_use = [c for c, t in df.schema.items() if t.is_numeric()]
         elif isinstance(columns, str):
             columns_to_use = [columns]
         elif isinstance(columns, list):
@@ -73,33 +101,29 @@ def outlier_isolation(df, columns=None, contamination=None, random_state=42):
             print("⚠️ No numeric columns found to analyze for outliers.")
             return df
 
-        # 🎯 Step 2: Extract numeric data
-        data = df.select(columns_to_use).to_numpy()
-
-        # 🧮 Step 3: Automatically estimate contamination if not given
-        if contamination is None:
-            flat_data = df.select(columns_to_use).to_numpy().flatten()
-            q1, q3 = np.percentile(flat_data, [25, 75])
-            iqr = q3 - q1
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-            outlier_fraction = np.mean((flat_data < lower_bound) | (flat_data > upper_bound))
-
-            # Cap between 0.01 and 0.15 (1%–15%)
-            contamination = float(np.clip(outlier_fraction, 0.01, 0.15))
-
-            print(f"📊 Auto contamination estimated as: {contamination:.3f}")
-
-        # 🧠 Step 4: Train Isolation Forest
-        iso = IsolationForest(contamination=contamination, random_state=random_state)
-        preds = iso.fit_predict(data)  # 1 = normal, -1 = outlier
-
-        # 🧩 Step 5: Create boolean mask (True = keep)
-        mask = preds == 1
-
-        # 🧱 Step 6: Apply mask to dataframe
-        mask_series = pl.Series("mask", mask)
-        df_clean = df.with_columns(mask_series).filter(pl.col("mask")).drop("mask")
+        # 🧠 Step 2: Train on a subsample (or reuse a saved model)
+        if model is None:
+            bundle = fit_isolation_model(
+                df,
+                columns=columns_to_use,
+                contamination=contamination,
+                train_sample=train_sample,
+                max_samples=max_samples,
+                n_jobs=n_jobs,
+                random_state=random_state,
+            )
+            if model_path:
+                save_isolation_model(bundle, model_path)
+
+        # 📈 Step 3: Score in fixed-size batches
+        scores = score_isolation_model(df, bundle, batch_size=batch_size)
+
+        if return_scores:
+            print(f"✅ Anomaly scores computed with Isolation Forest on: {', '.join(columns_to_use)}")
+            return df.with_columns(scores)
+
+        # 🧱 Step 4: Drop outliers (True = keep)
+        df_clean = df.filter(~scores["is_outlier"])
 
         print(f"✅ Outliers handled successfully using Isolation Forest on: {', '.join(columns_to_use)}")
         return df_clean
@@ -1,6 +1,7 @@
 import polars as pl
+from .category_dictionaries import compile_category_dictionaries, normalize_category_expr
 
-def translate_categories(df, columns=None):
+def translate_categories(df, columns=None, dictionaries=None, report=False):
     """
     🈹 Automatically translate or standardize common categorical values 
     (Yes/No, Male/Female, Active/Inactive, etc.) to a clean and consistent format.
@@ -10,6 +11,27 @@ def translate_categories(df, columns=None):
     This function automatically finds and replaces messy or multilingual category values
     (like “بلی”, “Yes”, “Y”, “نخیر”, “No”, “N”) into a consistent English standard (Yes/No).
 
+    Values are looked up in compiled category dictionaries (see
+    `huda.cleaning.category_dictionaries`): yes/no, sex, status, availability,
+    quality, sectors and displacement status in English, Dari, Pashto, Arabic
+    and French, plus anything you add with `register_category_dictionary`.
+    Only the unique values of each column are normalized and joined against
+    the lookup table, so large KoBo exports stay fast.
+
+    🧾 Parameters:
+    -------------------
+    df : pl.DataFrame
+        Input data.
+    columns : str | list | dict | None
+        - None → all text (Utf8 / Categorical) columns
+        - str / list → these columns
+        - dict → {column: dictionary name(s) or inline mapping}
+    dictionaries : str | list | None
+        Registered dictionary names to use (default: all registered).
+    report : bool
+        True → return (df, unmatched) where `unmatched` lists the
+        column, value and count of every value that was not translated.
+
     🧠 Example Usage:
     -------------------
         import polars as pl
@@ -27,9 +49,15 @@ def translate_categories(df, columns=None):
         # Apply to multiple columns
         df_clean2 = translate_categories(df, ["response", "status"])
 
-        # Apply to all columns automatically
+        # Apply to all text columns automatically
         df_clean3 = translate_categories(df)
 
+        # Only use some dictionaries, and see what was not matched
+        df_clean4, unmatched = translate_categories(df, dictionaries=["yes_no", "status"], report=True)
+
+        # Per-column dictionaries (names or inline mappings)
+        df_clean5 = translate_categories(df, columns={"response": "yes_no", "status": {"فعال": "Active"}})
+
     🧾 Output:
     -------------------
         ┌───────────┬────────────┬────────┐
@@ -62,58 +90,95 @@ def translate_categories(df, columns=None):
     """
 
     try:
-        # 🌍 Universal mapping for categorical normalization
-        auto_mapping = {
-            # Yes/No
-            "yes": "Yes", "y": "Yes", "true": "Yes", "1": "Yes",
-            "بلی": "Yes", "آره": "Yes", "ه": "Yes", "اووه": "Yes",
-            "no": "No", "n": "No", "false": "No", "0": "No",
-            "نخیر": "No", "نی": "No", "نه": "No",
-
-            # Gender
-            "male": "Male", "m": "Male", "آقا": "Male", "مرد": "Male",
-            "female": "Female", "f": "Female", "خانم": "Female", "زن": "Female",
-
-            # Status
-            "active": "Active", "فعال": "Active", "on": "Active",
-            "inactive": "Inactive", "غیرفعال": "Inactive", "off": "Inactive",
-
-            # Availability
-            "available": "Available", "در دسترس": "Available",
-            "unavailable": "Unavailable", "در دسترس نیست": "Unavailable",
-
-            # Quality
-            "poor": "Poor", "medium": "Medium", "good": "Good", "excellent": "Excellent",
-            "بد": "Poor", "متوسط": "Medium", "خوب": "Good", "عالی": "Excellent"
-        }
-
-        def normalize(val):
-            if val is None:
-                return None
-            key = str(val).strip().lower()  # safely convert anything to string
-            return auto_mapping.get(key, str(val))
-
-        # 🔍 Determine target columns
+        if isinstance(df, pl.LazyFrame):
+            raise TypeError("translate_categories expects an eager DataFrame; use translate_categories_expr for LazyFrames.")
+
+        # 🔍 Determine target columns (+ optional per-column dictionaries)
         if columns is None:
-            columns_to_process = df.columns  # All columns
+            # Only text-like columns: numeric 1/0 must not become "Yes"/"No"
+            column_dicts = {c: dictionaries for c, t in df.schema.items() if t in (pl.Utf8, pl.Categorical)}
         elif isinstance(columns, str):
-            columns_to_process = [columns]   # Single column
+            column_dicts = {columns: dictionaries}
+        elif isinstance(columns, dict):
+            column_dicts = {c: (d if d is not None else dictionaries) for c, d in columns.items()}
         else:
-            columns_to_process = columns     # Multiple columns
+            column_dicts = {c: dictionaries for c in columns}
 
-        # 🧹 Process each selected column
-        for col in columns_to_process:
+        unmatched_frames = []
+        replace_exprs = []
+        translated = []
+
+        for col, dicts in column_dicts.items():
             if col not in df.columns:
                 continue
 
-            # Apply normalization safely (Polars infers the dtype)
-            df = df.with_columns(
-                pl.col(col).map_elements(normalize).alias(col)
+            # ⚙️ Compiled once per dictionary set (cached in the registry)
+            lookup = compile_category_dictionaries(dicts)
+
+            # 🧮 Work on unique values only: normalize keys, then one native join
+            uniques = (
+                df.get_column(col).cast(pl.Utf8).value_counts()
+                .rename({col: "raw"})
+                .filter(pl.col("raw").is_not_null())
+                .with_columns(normalize_category_expr(pl.col("raw")).alias("key"))
+                .join(lookup, on="key", how="left")
             )
 
-        print(f"✅ Translated columns: {', '.join(columns_to_process)}")
+            matched = uniques.filter(pl.col("value").is_not_null())
+            replace_exprs.append(
+                pl.col(col).cast(pl.Utf8)
+                .replace(matched["raw"].to_list(), matched["value"].to_list())
+                .alias(col)
+            )
+            translated.append(col)
+
+            if report:
+                unmatched_frames.append(
+                    uniques.filter(pl.col("value").is_null())
+                    .select(pl.lit(col).alias("column"), pl.col("raw").alias("value"), pl.col("count"))
+                )
+
+        # 🧹 All columns replaced in a single pass
+        if replace_exprs:
+            df = df.with_columns(replace_exprs)
+
+        print(f"✅ Translated columns: {', '.join(translated)}")
+
+        if report:
+            unmatched = (
+                pl.concat(unmatched_frames).sort(["column", "count"], descending=[False, True])
+                if unmatched_frames
+                else pl.DataFrame(schema={"column": pl.Utf8, "value": pl.Utf8, "count": pl.UInt32})
+            )
+            if unmatched.height:
+                print(f"⚠️ {unmatched.height} unmatched value(s) left unchanged")
+            return df, unmatched
         return df
 
     except Exception as e:
         print("⚠️ Error while translating categories:", e)
-        return df
+        return (df, None) if report else df
+
+
+def translate_categories_expr(column: str, dictionaries=None) -> pl.Expr:
+    """
+    🧩 Expression form of `translate_categories` for one column.
+
+    Works on DataFrames and LazyFrames alike (no unmatched report).
+
+    Example:
+    --------
+        lf = pl.scan_csv("kobo_export.csv")
+        lf = lf.with_columns(translate_categories_expr("sex", ["sex"]))
+    """
+    lookup = compile_category_dictionaries(dictionaries)
+    return (
+        normalize_category_expr(pl.col(column))
+        .replace_strict(
+            lookup["key"].to_list(),
+            lookup["value"].to_list(),
+            default=pl.col(column).cast(pl.Utf8),
+            return_dtype=pl.Utf8,
+        )
+        .alias(column)
+    )
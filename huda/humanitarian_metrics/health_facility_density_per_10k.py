@@ -2,13 +2,20 @@ import polars as pl
 import pandas as pd
 from typing import Union, Optional, List
 import io
+from ..transformation.population_store import resolve_population_store
 
 
 def health_facility_density_per_10k(
     data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
     facility_count_col: str,
     population_col: str,
-    group_by: Optional[List[str]] = None
+    group_by: Optional[List[str]] = None,
+    population_store=None,
+    pcode_col: Optional[str] = None,
+    year_col: Optional[str] = None,
+    year: Optional[int] = None,
+    sex: str = "all",
+    age_group: str = "all",
 ) -> pl.DataFrame:
     """
     Health Facility Density per 10k
@@ -36,6 +43,10 @@ def health_facility_density_per_10k(
         Column with population.
     group_by : list[str] | None
         Optional grouping.
+    population_store : PopulationStore | str | None
+        Look the population up by `pcode_col` and `year_col` / `year`
+        (nearest available year), for `sex` and `age_group`, when
+        `population_col` is not in the data.
 
     Returns
     -------
@@ -53,6 +64,13 @@ def health_facility_density_per_10k(
     else:
         raise TypeError("Unsupported data type")
 
+    store = resolve_population_store(population_store)
+    if store is not None and population_col not in df.columns:
+        if pcode_col is None:
+            raise ValueError("A population store needs `pcode_col`.")
+        df = store.lookup(df, pcode_col, year_col=year_col, year=year,
+                          sex=sex, age_group=age_group, output_col=population_col)
+
     fac = pl.col(facility_count_col).cast(pl.Float64)
     pop = pl.col(population_col).cast(pl.Float64)
     density = (fac / pl.when(pop == 0).then(None).otherwise(pop)) * 10000.0
@@ -1,32 +1,44 @@
 from .region_based_data_aggregation import region_based_data_aggregation
+from .aggregate_cube import AggregateCube
 from .population_based_normalization import population_based_normalization
+from .population_store import PopulationStore
 from .percentage_calculation import percentage_calculation
+from .indicator_spec import IndicatorSpec
 from .adults_children_male_female_ratios import adults_children_male_female_ratios
 from .pivot_unpivot import pivot_unpivot
 from .average_rolling import average_rolling
 from .monthly_yearly_growth import monthly_yearly_growth
 from .severity_index_calculation import severity_index_calculation
 from .needs_coverage_calculation import needs_coverage_calculation
+from .coverage_engine import coverage_engine
 from .averages_weighted_population import averages_weighted_population
 from .age_group_standardization import age_group_standardization
 from .gender_group_standardization import gender_group_standardization
 from .categorical_code_to_label import categorical_code_to_label
+from .codebook import Codebook
 from .z_score_calculation import z_score_calculation
+from .running_stats import RunningStats
 
 
 __all__ = [
     "region_based_data_aggregation",
+    "AggregateCube",
     "population_based_normalization",
+    "PopulationStore",
     "percentage_calculation",
+    "IndicatorSpec",
     "adults_children_male_female_ratios",
     "pivot_unpivot",
     "average_rolling",
     "monthly_yearly_growth",
     "severity_index_calculation",
     "needs_coverage_calculation",
+    "coverage_engine",
     "averages_weighted_population",
     "age_group_standardization",
     "gender_group_standardization",
     "categorical_code_to_label",
+    "Codebook",
     "z_score_calculation",
+    "RunningStats",
 ]
@@ -82,12 +82,11 @@ def adults_children_male_female_ratios(
             if col not in df.columns:
                 raise ValueError(f"Column '{col}' not found in dataset!")
 
-        # ✅ Step 3: Calculate ratios
-        for num_col, denom_col in zip(numerator_columns, denominator_columns):
-            new_col = f"{num_col}_vs_{denom_col}{suffix}"
-            df = df.with_columns(
-                (pl.col(num_col) / pl.col(denom_col)).round(2).alias(new_col)
-            )
+        # ✅ Step 3: Calculate all ratios in one pass
+        df = df.with_columns([
+            (pl.col(num_col) / pl.col(denom_col)).round(2).alias(f"{num_col}_vs_{denom_col}{suffix}")
+            for num_col, denom_col in zip(numerator_columns, denominator_columns)
+        ])
 
         print("✅ Ratios calculated successfully.")
         return df
@@ -1,15 +1,29 @@
 import polars as pl
 import pandas as pd
-from typing import List, Union, Optional
+from typing import Dict, List, Tuple, Union, Optional
 import io
 
+# 📐 Ready-made bin schemes: (left-closed bin edges, labels). Ages at or above
+#    the last edge fall in the last group.
+AGE_GROUP_SCHEMES: Dict[str, Tuple[List[float], List[str]]] = {
+    "ocha": ([0, 5, 18, 60, 120], ["0-4", "5-17", "18-59", "60+"]),
+    "sadd": ([0, 5, 12, 18, 60, 120], ["0-4", "5-11", "12-17", "18-59", "60+"]),
+    "school_age": ([0, 7, 13, 16, 19, 120], ["0-6", "7-12", "13-15", "16-18", "19+"]),
+    "five_year": (
+        list(range(0, 85, 5)) + [120],
+        [f"{a}-{a + 4}" for a in range(0, 80, 5)] + ["80+"],
+    ),
+}
+
+
 def age_group_standardization(
-    data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
+    data: Union[str, pd.DataFrame, pl.DataFrame, pl.LazyFrame, io.BytesIO],
     age_column: str,
     age_bins: Optional[List[int]] = None,
     age_labels: Optional[List[str]] = None,
-    group_by_cols: Optional[List[str]] = None
-) -> pl.DataFrame:
+    group_by_cols: Optional[List[str]] = None,
+    schemes: Optional[Union[str, List[str], Dict[str, Union[str, Tuple[List[float], List[str]]]]]] = None,
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """
 🚨 Standardize Age Groups in Humanitarian Data
 ==============================================
@@ -55,12 +69,27 @@ age_column : str
 
 age_bins : List[int], optional  
     Bin edges for age groups. Default: `[0,5,18,60,120]`.  
+    Bins include their left edge: 5 → "5-17". Ages at or above the last edge
+    go to the last group, ages below the first edge (and nulls) become null.
 
 age_labels : List[str], optional  
     Labels for each age bin. Default: `["0-4","5-17","18-59","60+"]`.  
 
 group_by_cols : Optional[List[str]]  
     Columns to group by (like province, gender). If used, it will count how many people are in each age group per group.
+    Rows are first counted per (group, exact age) in the same lazy query, then
+    the few distinct ages are binned, so millions of roster rows are scanned once.
+
+schemes : str | List[str] | Dict[str, str | (bins, labels)], optional  
+    Several bin schemes at once, each in its own column `age_group_<name>`:
+    "ocha" (0-4, 5-17, 18-59, 60+), "sadd" (0-4, 5-11, 12-17, 18-59, 60+),
+    "school_age" (0-6, 7-12, 13-15, 16-18, 19+), "five_year" (0-4 … 80+),
+    or a dict {output column: scheme name or (bins, labels)}.
+    With `group_by_cols` and several schemes the counts come back in long format
+    (group columns, `scheme`, `age_group`, `count`).
+
+Age group columns are ordered Enums, so sorting follows the bin order.
+Bins and labels are validated before any data is read.
 
 🕒 When to Use:
 ---------------
@@ -108,40 +137,84 @@ Expected Output:
 │ Kandahar   ┆ 35  ┆ 18-59     │
 │ Balkh      ┆ 70  ┆ 60+       │
 └────────────┴─────┴───────────┘
+
+# Several schemes at once, counted per province (30M-row rosters: pass a LazyFrame)
+counts = age_group_standardization(
+    data=pl.scan_parquet("roster.parquet"),
+    age_column="age",
+    schemes=["ocha", "sadd", "school_age"],
+    group_by_cols=["province", "sex"],
+).collect()
 """
 
 
-    # --- 1. Convert data to Polars DataFrame ---
-    if isinstance(data, str):
-        df = pl.read_csv(data)
-    elif isinstance(data, io.BytesIO):
-        df = pl.read_csv(data)
+    # --- 1. Convert data to a Polars LazyFrame ---
+    if isinstance(data, (str, io.BytesIO)):
+        lf = pl.read_csv(data).lazy()
     elif isinstance(data, pd.DataFrame):
-        df = pl.from_pandas(data)
-    elif isinstance(data, pl.DataFrame):
-        df = data
+        lf = pl.from_pandas(data).lazy()
+    elif isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+        lf = data.lazy()
     else:
         raise TypeError("Unsupported data type")
 
-    # --- 2. Default bins and labels if not provided ---
-    if age_bins is None:
-        age_bins = [0, 5, 18, 60, 120]
-    if age_labels is None:
-        age_labels = ["0-4", "5-17", "18-59", "60+"]
-
-    # --- 3. Create a new age_group column ---
-    def map_age_group(age):
-        for i in range(len(age_bins)-1):
-            if age_bins[i] <= age < age_bins[i+1]:
-                return age_labels[i]
-        return age_labels[-1]
-
-    df = df.with_columns(
-        pl.col(age_column).map_elements(map_age_group).alias("age_group")
-    )
-
-    # --- 4. Optional grouping ---
-    if group_by_cols:
-        df = df.groupby(group_by_cols + ["age_group"]).agg(pl.count().alias("count"))
-
-    return df
\ No newline at end of file
+    # --- 2. Resolve and validate bin schemes up front ---
+    scheme_names = {}
+    if schemes is None:
+        default_bins, default_labels = AGE_GROUP_SCHEMES["ocha"]
+        resolved = {"age_group": (age_bins or default_bins, age_labels or default_labels)}
+    else:
+        if isinstance(schemes, str):
+            schemes = [schemes]
+        if not isinstance(schemes, dict):
+            schemes = {f"age_group_{name}": name for name in schemes}
+            scheme_names = {f"age_group_{name}": name for name in schemes.values()}
+        resolved = {}
+        for col, scheme in schemes.items():
+            if isinstance(scheme, str):
+                if scheme not in AGE_GROUP_SCHEMES:
+                    raise ValueError(f"❌ Unknown age scheme '{scheme}'. Use one of: {list(AGE_GROUP_SCHEMES)}")
+                scheme = AGE_GROUP_SCHEMES[scheme]
+            resolved[col] = scheme
+    for col, (bins, labels) in resolved.items():
+        _validate_bins(col, bins, labels)
+
+    # --- 3. Native binning into ordered Enums ---
+    def bin_expr(bins, labels):
+        age = pl.col(age_column)
+        group = age.cut(bins[1:-1], labels=labels, left_closed=True).cast(pl.Utf8) if len(labels) > 1 else pl.lit(labels[0])
+        return pl.when(age >= bins[0]).then(group).cast(pl.Enum(labels))
+
+    if not group_by_cols:
+        out = lf.with_columns([bin_expr(b, l).alias(col) for col, (b, l) in resolved.items()])
+        return out if isinstance(data, pl.LazyFrame) else out.collect()
+
+    # --- 4. Grouped counts: count per exact age first, then bin the few distinct ages ---
+    per_age = lf.group_by(group_by_cols + [age_column]).agg(pl.len().alias("count"))
+    parts = [
+        per_age.with_columns(bin_expr(b, l).alias("age_group"))
+        .group_by(group_by_cols + ["age_group"]).agg(pl.col("count").sum())
+        .sort(group_by_cols + ["age_group"])
+        for b, l in resolved.values()
+    ]
+    if len(parts) == 1:
+        out = parts[0]
+        (col,) = resolved
+        out = out.rename({"age_group": col}) if col != "age_group" else out
+    else:
+        out = pl.concat([
+            part.select(group_by_cols + [pl.lit(scheme_names.get(col, col)).alias("scheme"), pl.col("age_group").cast(pl.Utf8), "count"])
+            for col, part in zip(resolved, parts)
+        ])
+    return out if isinstance(data, pl.LazyFrame) else out.collect()
+
+
+def _validate_bins(column: str, bins: List[float], labels: List[str]):
+    if len(bins) < 2:
+        raise ValueError(f"❌ {column}: at least two bin edges are needed.")
+    if any(upper <= lower for lower, upper in zip(bins, bins[1:])):
+        raise ValueError(f"❌ {column}: bin edges must be strictly increasing: {bins}")
+    if len(labels) != len(bins) - 1:
+        raise ValueError(f"❌ {column}: {len(bins) - 1} bins need {len(bins) - 1} labels, got {len(labels)}.")
+    if len(set(labels)) != len(labels):
+        raise ValueError(f"❌ {column}: labels must be unique: {labels}")
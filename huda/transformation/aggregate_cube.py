@@ -0,0 +1,335 @@
+import hashlib
+import io
+import json
+import os
+import numpy as np
+import polars as pl
+from typing import Dict, List, Optional, Union
+from ..cleaning.lazy_io import scan_data
+
+CUBE_AGGREGATES = ("sum", "count", "mean", "min", "max", "distinct")
+
+# Hash behind the distinct-count sketches, saved with the cube: sketches built with
+# another hash cannot be merged (Polars' own hash may change between versions)
+HLL_HASH = "splitmix64+blake2b-v2"
+
+
+class AggregateCube:
+    """
+    🧊 Pre-aggregated cube of mergeable measures for fast, filtered dashboard queries.
+
+    💡 Simple Explanation:
+    ----------------------
+    Dashboards ask the same base table (millions of rows) for totals with
+    different filters: people reached by province, by month, by sector and sex …
+    Scanning everything for each question is slow. The cube scans the data ONCE
+    and keeps, for every combination of the chosen dimensions (a "cell"), only
+    numbers that can be combined again later:
+
+    - sum, count (→ mean), min, max
+    - "distinct": a small HyperLogLog sketch (≈3% error) for unique counts
+      (beneficiaries, households) that can be merged across cells, and across
+      Polars versions (values are hashed with a fixed, version-independent hash)
+
+    Queries (any filter, any grouping over the dimensions) are answered from
+    the cells in milliseconds. New partitions (a new month, a late partner
+    report) only update the cells they touch, and the cube is saved as Parquet.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.transformation import AggregateCube
+
+        cube = AggregateCube(
+            dimensions={"adm1": "adm1", "sector": "sector", "sex": "sex",
+                        "month": pl.col("date").dt.truncate("1mo")},
+            measures={"people_reached": ["sum", "mean"], "needs": ["sum"],
+                      "beneficiary_id": ["distinct"]},
+            path="cube_5w.parquet",
+        )
+        cube.build("5w/*.parquet")                          # one scan, saved
+        cube.update(new_month_df, replace_partition="month")  # only May cells rebuilt
+
+        cube.query(by=["adm1"], filters={"sector": ["WASH", "Health"], "sex": "female"})
+        ┌───────┬──────┬─────────────────────┬──────────────────────┬───────────┬───────────────────────────┐
+        │ adm1  ┆ rows ┆ people_reached_sum  ┆ people_reached_mean  ┆ needs_sum ┆ beneficiary_id_distinct   │
+        ╞═══════╪══════╪═════════════════════╪══════════════════════╪═══════════╪═══════════════════════════╡
+        │ Kabul ┆ 5120 ┆ 81234.0             ┆ 15.9                 ┆ 120500.0  ┆ 40210                     │
+        └───────┴──────┴─────────────────────┴──────────────────────┴───────────┴───────────────────────────┘
+
+        cube = AggregateCube.load("cube_5w.parquet")        # later, in the dashboard process
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Many filtered aggregate queries hit the same large table.
+    💡 Why:
+        - One scan to build, milliseconds per query, cheap incremental refresh.
+    """
+
+    def __init__(
+        self,
+        dimensions: Union[List[str], Dict[str, Union[str, pl.Expr]]],
+        measures: Dict[str, Union[str, List[str]]],
+        path: Optional[str] = None,
+        sketch_precision: int = 10,
+    ):
+        if isinstance(dimensions, (list, tuple)):
+            dimensions = {d: d for d in dimensions}
+        self.dimensions = {name: (pl.col(e) if isinstance(e, str) else e) for name, e in dimensions.items()}
+        self.measures = {c: [a] if isinstance(a, str) else list(a) for c, a in measures.items()}
+        for col, aggs in self.measures.items():
+            unknown = [a for a in aggs if a not in CUBE_AGGREGATES]
+            if unknown:
+                raise ValueError(f"❌ Unknown aggregate(s) for '{col}': {unknown}. Use: {', '.join(CUBE_AGGREGATES)}")
+        self.path = path
+        self.precision = sketch_precision
+        self.cells: Optional[pl.DataFrame] = None
+        self.hash_scheme = HLL_HASH
+
+    def __repr__(self):
+        cells = 0 if self.cells is None else self.cells.height
+        return f"AggregateCube({', '.join(self.dimensions)}; {cells} cells)"
+
+    # 🧱 Building -----------------------------------------------------------
+
+    def _partials(self) -> List[pl.Expr]:
+        exprs = [pl.len().cast(pl.Int64).alias("__rows")]
+        for col, aggs in self.measures.items():
+            x = pl.col(col)
+            if {"sum", "mean"} & set(aggs):
+                exprs.append(x.cast(pl.Float64).sum().alias(f"{col}__sum"))
+            if {"count", "mean"} & set(aggs):
+                exprs.append(x.count().cast(pl.Int64).alias(f"{col}__count"))
+            if "min" in aggs:
+                exprs.append(x.min().alias(f"{col}__min"))
+            if "max" in aggs:
+                exprs.append(x.max().alias(f"{col}__max"))
+        return exprs
+
+    def _aggregate(self, data) -> pl.DataFrame:
+        """Raw rows → cells (one grouped pass, plus one per distinct-count sketch)."""
+        lf = scan_data(data).with_columns([e.alias(name) for name, e in self.dimensions.items()])
+        dims = list(self.dimensions)
+        cells = lf.group_by(dims).agg(self._partials()).collect().sort(dims, nulls_last=True)
+
+        m = 1 << self.precision
+        for col, aggs in self.measures.items():
+            if "distinct" not in aggs:
+                continue
+            values = lf.filter(pl.col(col).is_not_null()).select(dims + [pl.col(col)]).collect()
+            registers, ranks = _hll_ranks(_stable_hash(values[col]), self.precision)
+            best = (
+                values.select(dims).with_columns(pl.Series("__reg", registers), pl.Series("__rank", ranks))
+                .group_by(dims + ["__reg"]).agg(pl.col("__rank").max())
+                .join(cells.select(dims).with_row_index("__cell"), on=dims, how="left", nulls_equal=True)
+            )
+            sketch = np.zeros((cells.height, m), dtype=np.uint8)
+            sketch[best["__cell"].to_numpy(), best["__reg"].to_numpy()] = best["__rank"].to_numpy()
+            cells = cells.with_columns(pl.Series(f"{col}__hll", sketch))
+        return cells
+
+    def build(self, data) -> "AggregateCube":
+        """Scan `data` (DataFrame, LazyFrame or file path / glob) and (re)build every cell."""
+        self.cells = self._aggregate(data)
+        self._save()
+        print(f"✅ Cube built: {self.cells.height} cells over {', '.join(self.dimensions)}")
+        return self
+
+    def update(self, data, replace_partition: Optional[str] = None) -> "AggregateCube":
+        """
+        🔄 Add new rows, touching only the cells they fall in.
+
+        replace_partition : a dimension (e.g. "month"): cells of the partitions present
+            in `data` are REPLACED (re-delivered data); otherwise new rows are merged
+            into existing cells (sums added, min/max and sketches combined).
+        """
+        if self.cells is None:
+            return self.build(data)
+        if self.hash_scheme != HLL_HASH and any("distinct" in a for a in self.measures.values()):
+            raise ValueError(
+                f"❌ Distinct-count sketches were built with hash '{self.hash_scheme}', not '{HLL_HASH}': "
+                "rebuild the cube with build() before updating it."
+            )
+        new = self._aggregate(data)
+        dims = list(self.dimensions)
+        if replace_partition is not None:
+            stale = pl.col(replace_partition).is_in(new[replace_partition].unique().to_list())
+            kept = self.cells.filter(~stale.fill_null(False))
+            merged = pl.concat([kept, new], how="vertical_relaxed")
+        else:
+            touched = self.cells.join(new.select(dims), on=dims, how="semi", nulls_equal=True)
+            untouched = self.cells.join(new.select(dims), on=dims, how="anti", nulls_equal=True)
+            merged = pl.concat([untouched, self._merge(pl.concat([touched, new], how="vertical_relaxed"))], how="vertical_relaxed")
+        changed = new.height
+        self.cells = merged.sort(dims, nulls_last=True)
+        self._save()
+        print(f"✅ Cube updated: {changed} cell(s) touched, {self.cells.height} cells in total")
+        return self
+
+    def _merge(self, cells: pl.DataFrame, by: Optional[List[str]] = None) -> pl.DataFrame:
+        """Combine cells sharing the same `by` keys (default: all dimensions)."""
+        by = list(self.dimensions) if by is None else by
+        exprs = []
+        for c in cells.columns:
+            if c in self.dimensions:
+                continue
+            if c.endswith("__min"):
+                exprs.append(pl.col(c).min())
+            elif c.endswith("__max"):
+                exprs.append(pl.col(c).max())
+            elif not c.endswith("__hll"):
+                exprs.append(pl.col(c).sum())
+        grouped = cells.group_by(by, maintain_order=True) if by else None
+        out = grouped.agg(exprs) if by else cells.select(exprs)
+
+        # Sketches: register-wise max over the merged cells
+        for c in [c for c in cells.columns if c.endswith("__hll")]:
+            matrix = cells[c].to_numpy()
+            if by:
+                codes = cells.select(by).join(
+                    out.select(by).with_row_index("__g"), on=by, how="left", nulls_equal=True
+                )["__g"].to_numpy()
+            else:
+                codes = np.zeros(cells.height, dtype=np.int64)
+            merged = np.zeros((out.height, matrix.shape[1]), dtype=np.uint8)
+            np.maximum.at(merged, codes, matrix)
+            out = out.with_columns(pl.Series(c, merged))
+        return out
+
+    # 🔎 Querying -----------------------------------------------------------
+
+    def query(
+        self,
+        by: Optional[Union[str, List[str]]] = None,
+        filters: Optional[Dict[str, object]] = None,
+        measures: Optional[List[str]] = None,
+    ) -> pl.DataFrame:
+        """
+        Answer an aggregate query from the cells.
+
+        by : dimensions to group by (None → one total row)
+        filters : {dimension: value or list of values}; None selects the cells whose
+            dimension is null (e.g. {"adm1": None}, {"adm1": ["Kabul", None]})
+        measures : limit the output to these measure columns
+        Output columns: rows, `{measure}_{aggregate}` (e.g. people_reached_sum, beneficiary_id_distinct).
+        """
+        if self.cells is None:
+            raise ValueError("❌ The cube is empty: call build() first.")
+        by = [by] if isinstance(by, str) else list(by or [])
+        cells = self.cells
+        for dim, value in (filters or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            known = [v for v in values if v is not None]
+            keep = pl.col(dim).is_in(known)
+            if len(known) < len(values):
+                keep = keep | pl.col(dim).is_null()
+            cells = cells.filter(keep)
+
+        merged = self._merge(cells, by)
+        outputs = [pl.col("__rows").alias("rows")]
+        for col, aggs in self.measures.items():
+            if measures is not None and col not in measures:
+                continue
+            for agg in aggs:
+                if agg == "sum":
+                    outputs.append(pl.col(f"{col}__sum").alias(f"{col}_sum"))
+                elif agg == "count":
+                    outputs.append(pl.col(f"{col}__count").alias(f"{col}_count"))
+                elif agg == "mean":
+                    n = pl.col(f"{col}__count")
+                    outputs.append(pl.when(n > 0).then(pl.col(f"{col}__sum") / n).alias(f"{col}_mean"))
+                elif agg in ("min", "max"):
+                    outputs.append(pl.col(f"{col}__{agg}").alias(f"{col}_{agg}"))
+                else:
+                    outputs.append(pl.Series(f"{col}_distinct", _hll_estimate(merged[f"{col}__hll"].to_numpy())))
+        result = merged.select(by + outputs)
+        return result.sort(by, nulls_last=True) if by else result
+
+    # 💾 Persistence --------------------------------------------------------
+
+    def _save(self):
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.cells.write_parquet(self.path, metadata={
+                "huda_cube_dimensions": json.dumps({n: e.meta.serialize(format="json") for n, e in self.dimensions.items()}),
+                "huda_cube_measures": ";".join(f"{c}:{','.join(a)}" for c, a in self.measures.items()),
+                "huda_cube_precision": str(self.precision),
+                "huda_cube_hash": self.hash_scheme,
+            })
+
+    @classmethod
+    def load(cls, path: str) -> "AggregateCube":
+        """Open a cube saved by build() / update() (dimension expressions included, so it can be updated)."""
+        meta = pl.read_parquet_metadata(path)
+        measures = dict(item.split(":") for item in meta["huda_cube_measures"].split(";") if item)
+        dimensions = {
+            name: pl.Expr.deserialize(io.StringIO(expr), format="json")
+            for name, expr in json.loads(meta["huda_cube_dimensions"]).items()
+        }
+        cube = cls(
+            dimensions,
+            {c: a.split(",") for c, a in measures.items()},
+            path=path,
+            sketch_precision=int(meta["huda_cube_precision"]),
+        )
+        cube.hash_scheme = meta.get("huda_cube_hash", "polars")
+        cube.cells = pl.read_parquet(path)
+        return cube
+
+
+def _stable_hash(values: pl.Series) -> np.ndarray:
+    """
+    64-bit hash of non-null values that is identical across Polars versions: splitmix64
+    over the 64-bit integer value of integers / dates (and of whole floats, so 5 and 5.0
+    agree), over the Float64 bits of other floats, and blake2b over the UTF-8 bytes of
+    anything else (computed once per distinct value).
+    """
+    if values.dtype.is_integer() or values.dtype == pl.Boolean:
+        target = pl.UInt64 if values.dtype == pl.UInt64 else pl.Int64
+        return _splitmix64(values.cast(target).to_numpy().view(np.uint64))
+    if values.dtype.is_numeric():
+        # +0.0 folds -0.0 into 0.0; whole floats hash as the integer they hold
+        floats = values.cast(pl.Float64).to_numpy() + 0.0
+        whole = np.isfinite(floats) & (floats == np.floor(floats)) & (np.abs(floats) < 2.0**63)
+        as_int = np.where(whole, floats, 0.0).astype(np.int64).view(np.uint64)
+        return _splitmix64(np.where(whole, as_int, np.ascontiguousarray(floats).view(np.uint64)))
+    if values.dtype.is_temporal():
+        return _splitmix64(values.to_physical().cast(pl.Int64).to_numpy().view(np.uint64))
+    text = values.cast(pl.Utf8)
+    uniques = text.unique()
+    codes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(v.encode("utf-8"), digest_size=8).digest(), "little") for v in uniques),
+        dtype=np.uint64,
+        count=len(uniques),
+    )
+    lookup = pl.DataFrame([uniques.alias("v"), pl.Series("h", codes, dtype=pl.UInt64)])
+    return text.alias("v").to_frame().join(lookup, on="v", how="left", maintain_order="left")["h"].to_numpy()
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 arithmetic wraps modulo 2**64 by design)."""
+    x = x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hll_ranks(hashes: np.ndarray, precision: int):
+    """HyperLogLog update: register = first `precision` hash bits, rank = leading zeros of the rest + 1."""
+    hashes = hashes.astype(np.uint64, copy=False)
+    registers = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = (hashes << np.uint64(precision)) | np.uint64(1 << (precision - 1))
+    ranks = pl.Series(rest).bitwise_leading_zeros().to_numpy().astype(np.uint8) + 1
+    return registers, ranks
+
+
+def _hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """HyperLogLog cardinality estimate per row of registers (with small-range correction)."""
+    registers = np.atleast_2d(registers).astype(np.float64)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.power(2.0, -registers).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    with np.errstate(divide="ignore"):
+        small = m * np.log(m / np.maximum(zeros, 1))
+    return np.round(np.where((raw <= 2.5 * m) & (zeros > 0), small, raw)).astype(np.int64)
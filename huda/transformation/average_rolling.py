@@ -1,11 +1,15 @@
 import polars as pl
-from typing import Union
+from typing import List, Optional, Union
 
 def average_rolling(
     data: Union[str, "pd.DataFrame", pl.DataFrame],
     value_columns: list = None,
-    window: int = 3,
-    min_periods: int = 1
+    window: Union[int, str] = 3,
+    min_periods: int = 1,
+    group_by: Optional[Union[str, List[str]]] = None,
+    date_column: Optional[str] = None,
+    state: Optional[pl.DataFrame] = None,
+    return_state: bool = False,
 ) -> pl.DataFrame:
     """
     📈 Calculate Rolling Averages (Moving Mean)
@@ -14,24 +18,41 @@ def average_rolling(
     What it does:
     -------------
     - Computes the average of values over a sliding window
-    - Useful for smoothing time-series data
+    - Row windows (`window=3`) or calendar windows (`window="30d"`) over a date column
+    - Separately per group (district, indicator …), all columns in one pass
+    - Incremental mode: update a daily feed from a saved tail state, without
+      recomputing the whole history
     - Works automatically with CSV, Pandas DataFrame, or Polars DataFrame
 
     Parameters:
     -----------
     data : str | pd.DataFrame | pl.DataFrame
         CSV path, Pandas DataFrame, or Polars DataFrame
+        (in incremental mode: only the NEW rows)
     value_columns : list of str, optional
         Columns to calculate rolling averages for. If None, all numeric columns are used
-    window : int, default=3
-        Number of rows to include in each moving average window
+    window : int | str, default=3
+        int → number of rows in each moving average window
+        str → time span ending at each row's date, e.g. "7d", "30d", "2w", "3mo"
+              (needs `date_column`)
     min_periods : int, default=1
         Minimum number of values in the window required to calculate a mean
+    group_by : str | list of str, optional
+        Compute windows separately per group (e.g. "district")
+    date_column : str, optional
+        Orders the rows of each series (row windows) / defines time windows.
+        None → current row order.
+    state : pl.DataFrame, optional
+        Tail state returned by a previous call with `return_state=True`.
+        Rolling averages of `data` then continue from that history.
+    return_state : bool, default=False
+        Also return the tail rows needed to continue next time: (result, state)
 
     Returns:
     --------
     pl.DataFrame
         Original table with additional columns named `{col}_rolling` for each value column
+        (or (table, state) when return_state=True)
 
     Example Usage:
     --------------
@@ -56,6 +77,19 @@ def average_rolling(
     │ Kabul     ┆ 170          ┆ 50            ┆ 160.0             ┆ 45.0             │
     │ Herat     ┆ 200          ┆ 60            ┆ 185.0             ┆ 55.0             │
     │ Herat     ┆ 180          ┆ 55            ┆ 190.0             ┆ 57.5             │
+
+    30-day averages per district, then a daily incremental update:
+    ---------------------------------------------------------------
+    history, state = average_rolling(incidents, ["incidents"], window="30d",
+                                     group_by="district", date_column="date", return_state=True)
+
+    # next day: only the new rows + the saved state
+    today, state = average_rolling(new_incidents, ["incidents"], window="30d",
+                                   group_by="district", date_column="date",
+                                   state=state, return_state=True)
+
+    Incremental results equal a full recomputation as long as new rows are
+    not older than the rows already processed for their group.
     """
 
     try:
@@ -70,18 +104,53 @@ def average_rolling(
         else:
             raise TypeError("Input must be CSV path, Pandas DataFrame, or Polars DataFrame")
 
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        time_window = isinstance(window, str)
+        if time_window and date_column is None:
+            raise ValueError(f"A time window ('{window}') needs a `date_column`.")
+
         # Step 2: Identify numeric columns if not provided
         if value_columns is None:
-            value_columns = [c for c, dt in df.schema.items() if dt in (pl.Int64, pl.Float64)]
+            value_columns = [
+                c for c, dt in df.schema.items() if dt.is_numeric() and c not in group_by and c != date_column
+            ]
 
-        # Step 3: Calculate rolling averages
+        # Step 3: Saved history first (incremental mode), new rows flagged
+        if state is not None:
+            df = pl.concat([state.with_columns(pl.lit(False).alias("__new")), df.with_columns(pl.lit(True).alias("__new"))], how="diagonal_relaxed")
+
+        # Step 4: Calculate all rolling averages in ONE pass
+        exprs = []
         for col in value_columns:
-            df = df.with_columns(
-                pl.col(col).rolling_mean(window_size=window, min_periods=min_periods).alias(f"{col}_rolling")
-            )
+            if time_window:
+                expr = pl.col(col).rolling_mean_by(date_column, window_size=window, min_samples=min_periods)
+            else:
+                expr = pl.col(col).rolling_mean(window_size=window, min_samples=min_periods)
+            if group_by:
+                expr = expr.over(group_by, order_by=None if time_window else date_column)
+            elif date_column and not time_window:
+                expr = expr.over(pl.lit(0), order_by=date_column)
+            exprs.append(expr.alias(f"{col}_rolling"))
+        df = df.with_columns(exprs)
+
+        # Step 5: Tail rows the next update needs (last window-1 rows / last time span per group)
+        if return_state:
+            outputs = {f"{col}_rolling" for col in value_columns}
+            keep = [c for c in df.columns if c != "__new" and c not in outputs]
+            if time_window:
+                latest = pl.col(date_column).max()
+                tail = pl.col(date_column) > (latest.over(group_by) if group_by else latest).dt.offset_by(f"-{window}")
+            else:
+                rank = pl.int_range(pl.len())
+                rank = rank.over(group_by, order_by=date_column) if group_by else (rank.over(pl.lit(0), order_by=date_column) if date_column else rank)
+                tail = rank >= (pl.len().over(group_by) if group_by else pl.len()) - (window - 1)
+            new_state = df.filter(tail).select(keep)
+
+        if state is not None:
+            df = df.filter(pl.col("__new")).drop("__new")
 
         print(f"✅ Rolling averages calculated with window={window}")
-        return df
+        return (df, new_state) if return_state else df
 
     except Exception as e:
         print("⚠️ Error calculating rolling averages:", e)
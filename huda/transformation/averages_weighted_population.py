@@ -2,6 +2,7 @@ import polars as pl
 import pandas as pd
 from typing import List, Dict, Union, Optional
 import io
+from .coverage_engine import coverage_engine
 
 def averages_weighted_population(
     data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
@@ -44,7 +45,10 @@ def averages_weighted_population(
 
     - Weighted by population (so Kabul counts more in averages)
     - Overall combined coverage for all needs
-    - Optional grouping (e.g., by province or month)
+    - Optional grouping (e.g., by province or month): coverage of a group is
+      Σ provided / Σ needs, and `population_weighted_avg_pct` is the
+      population-weighted average of the rows' total coverage within each group
+      (without grouping: over the whole table). Runs on `coverage_engine`.
 
     📊 Expected Output:
     -------------------
@@ -92,69 +96,16 @@ def averages_weighted_population(
     - NGO planning and coverage assessments
     """
 
-    # --- 1. Convert data to Polars DataFrame ---
-    if isinstance(data, str):
-        df = pl.read_csv(data)
-    elif isinstance(data, io.BytesIO):
-        df = pl.read_csv(data)
-    elif isinstance(data, pd.DataFrame):
-        df = pl.from_pandas(data)
-    elif isinstance(data, pl.DataFrame):
-        df = data
-    else:
-        raise TypeError("Unsupported data type")
-
-    # --- 2. Calculate per-need coverage ---
-    for need_col, provided_col in zip(needs_columns, provided_columns):
-        cov_col = f"{need_col}_coverage_pct"
-        df = df.with_columns(
-            pl.when(pl.col(need_col) > 0)
-            .then(pl.col(provided_col) / pl.col(need_col) * 100)
-            .otherwise(None)
-            .alias(cov_col)
-        )
-
-    # --- 3. Group if requested ---
-    if group_by_cols:
-        agg_exprs = []
-
-        for col in needs_columns + provided_columns:
-            agg_exprs.append(pl.sum(col).alias(col))
-
-        for need_col in needs_columns:
-            cov_col = f"{need_col}_coverage_pct"
-            agg_exprs.append(pl.mean(cov_col).alias(cov_col))
-
-        if population_column:
-            agg_exprs.append(pl.sum(population_column).alias(population_column))
-
-        df = df.group_by(group_by_cols).agg(agg_exprs)
-
-    # --- 4. Weighted by need-type importance ---
-    if weights:
-        total_weight = sum(weights.values())
-        weighted_sum = sum(pl.col(f"{col}_coverage_pct") * w for col, w in weights.items())
-        df = df.with_columns((weighted_sum / total_weight).alias(output_coverage_col))
-
-    # --- 5. ✅ Total combined coverage across all needs ---
-    df = df.with_columns([
-        (pl.sum_horizontal([pl.col(c) for c in provided_columns]) /
-         pl.sum_horizontal([pl.col(c) for c in needs_columns]) * 100)
-        .alias("total_needs_coverage_pct")
-    ])
-
-    # --- 6. ✅ Weighted average by population (if available) ---
-    if population_column and population_column in df.columns:
-        df = df.with_columns(
-            (pl.col("total_needs_coverage_pct") * pl.col(population_column))
-            .alias("_weighted_cov")
-        )
-        total_pop = df.select(pl.sum(population_column)).item()
-        weighted_avg = df.select(pl.sum("_weighted_cov")).item() / total_pop
-        df = df.with_columns(pl.lit(weighted_avg).alias("population_weighted_avg_pct"))
-        df = df.drop("_weighted_cov")
-
-    return df
+    # One lazy aggregation for every sector (Σ provided / Σ needs per group)
+    return coverage_engine(
+        data,
+        needs_columns,
+        provided_columns,
+        group_by_cols=group_by_cols,
+        population_column=population_column,
+        weights=weights,
+        output_coverage_col=output_coverage_col,
+    )
 
 
 # ✅ Example Test
@@ -9,7 +9,8 @@ def categorical_code_to_label(
     code_column: str,
     mapping: Optional[Dict[Union[int, str], str]] = None,
     new_column_name: Optional[str] = None,
-    group_by_cols: Optional[List[str]] = None
+    group_by_cols: Optional[List[str]] = None,
+    codebook=None,
 ) -> pl.DataFrame:
     """
     🏷️ Convert Categorical Codes to Human-Readable Labels
@@ -77,6 +78,11 @@ def categorical_code_to_label(
     group_by_cols : List[str], optional  
         Optional list of columns to group by and count how many entries exist for each label.
 
+    codebook : Codebook, optional  
+        Take the mapping for `code_column` from a `Codebook` (XLSForm choices /
+        SPSS value labels) instead of passing it by hand. To label many columns
+        at once, use `codebook.apply(df)` directly.
+
     🕒 When to Use:
     ---------------
     - When datasets store category information as numeric codes  
@@ -163,6 +169,11 @@ def categorical_code_to_label(
         raise TypeError("Unsupported data type")
 
     # --- 2. Default mapping handling ---
+    codes = pl.col(code_column)
+    if mapping is None and codebook is not None and code_column in codebook.columns:
+        # Codebook codes are text ("1"); 1.0 from Excel/SPSS float columns → "1"
+        mapping = codebook.lists[codebook.columns[code_column]["list"]]
+        codes = (codes.cast(pl.Int64, strict=False) if df.schema[code_column].is_float() else codes).cast(pl.Utf8)
     if mapping is None:
         mapping = {}
 
@@ -170,15 +181,15 @@ def categorical_code_to_label(
     if new_column_name is None:
         new_column_name = f"{code_column}_label"
 
-    # --- 4. Convert codes to labels ---
+    # --- 4. Convert codes to labels (native lookup, no per-row Python) ---
     df = df.with_columns(
-        pl.col(code_column)
-        .map_elements(lambda x: mapping.get(x, "Unknown"))
+        codes
+        .replace_strict(list(mapping.keys()), list(mapping.values()), default="Unknown", return_dtype=pl.Utf8)
         .alias(new_column_name)
     )
 
     # --- 5. Optional grouping ---
     if group_by_cols:
-        df = df.group_by(group_by_cols + [new_column_name]).agg(pl.count().alias("count"))
+        df = df.group_by(group_by_cols + [new_column_name]).agg(pl.len().alias("count"))
 
     return df
@@ -0,0 +1,216 @@
+import io
+import os
+import polars as pl
+from typing import Dict, List, Optional, Union
+
+# 🗂️ Codebooks loaded from files, keyed by (path, modified time, label column)
+_LOADED_CODEBOOKS = {}
+
+
+class Codebook:
+    """
+    📒 Registry of value labels (XLSForm choices / SPSS value labels) for coded columns.
+
+    💡 Simple Explanation:
+    ----------------------
+    A KoBo / ODK export stores answers as choice codes ("1", "yes", "hh_head")
+    and multi-select answers as space-separated codes ("food cash shelter").
+    The form itself (XLSForm `survey` + `choices` sheets, or SPSS value labels)
+    already says what every code means. Load it once into a Codebook, then
+    label every coded column of an export in ONE native Polars pass:
+
+    - select_one columns → labels as a compact Enum (or Categorical)
+    - select_multiple columns → one 0/1 dummy column per choice (`column/code`)
+
+    🧾 Building a codebook:
+    ------------------------
+    - Codebook.from_xlsform("form.xlsx", label_column="label::English (en)")
+    - Codebook.from_spss("survey.sav")          (needs `pyreadstat`)
+    - Codebook().add_list("sectors", {1: "Food", 2: "Shelter"}).assign("sector", "sectors")
+
+    🧠 Example Usage:
+    -----------------
+        from huda.transformation import Codebook
+
+        codebook = Codebook.from_xlsform("hh_survey.xlsx")
+        labeled = codebook.apply(kobo_export)                  # all known columns, one pass
+        labeled = codebook.apply(kobo_export, dtype="categorical", keep_codes=True)
+
+    🧾 Output (one select_one + one select_multiple column):
+    ---------------------------------------------------------
+        ┌──────────┬───────────────┬────────────┬────────────┬────────────────┐
+        │ hh_head  ┆ needs         ┆ needs/food ┆ needs/cash ┆ needs/shelter  │
+        ╞══════════╪═══════════════╪════════════╪════════════╪════════════════╡
+        │ Female   ┆ food cash     ┆ 1          ┆ 1          ┆ 0              │
+        │ Male     ┆ shelter       ┆ 0          ┆ 0          ┆ 1              │
+        └──────────┴───────────────┴────────────┴────────────┴────────────────┘
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Labeling KoBo / ODK / SPSS exports with hundreds of coded columns.
+    💡 Why:
+        - The form is read once, not a mapping dict per column per call.
+        - One vectorized pass, Enum labels use a few bytes per row.
+    """
+
+    def __init__(self):
+        self.lists: Dict[str, Dict[str, str]] = {}
+        self.columns: Dict[str, dict] = {}
+
+    def __repr__(self):
+        return f"Codebook({len(self.lists)} choice lists, {len(self.columns)} columns)"
+
+    # 🧱 Building ---------------------------------------------------------
+
+    def add_list(self, name: str, mapping: Dict[Union[int, str], str]):
+        """Add (or replace) a choice list {code: label}. Codes are stored as text."""
+        self.lists[name] = {_code_text(code): str(label) for code, label in mapping.items()}
+        return self
+
+    def assign(self, column: str, list_name: str, multiple: bool = False):
+        """Link a data column to a choice list (multiple=True → space-separated multi-select)."""
+        if list_name not in self.lists:
+            raise KeyError(f"❌ Unknown choice list '{list_name}'. Known lists: {list(self.lists)}")
+        self.columns[column] = {"list": list_name, "multiple": multiple}
+        return self
+
+    @classmethod
+    def from_xlsform(
+        cls,
+        form: Union[str, io.BytesIO, None] = None,
+        label_column: Optional[str] = None,
+        survey: Optional[pl.DataFrame] = None,
+        choices: Optional[pl.DataFrame] = None,
+    ) -> "Codebook":
+        """
+        📥 Load an XLSForm: `choices` sheet → lists, `survey` sheet → select_one / select_multiple columns.
+
+        form : path or bytes of the .xlsx (or pass the `survey` / `choices` sheets as DataFrames)
+        label_column : which label to use, e.g. "label::Dari (prs)" (default: "label",
+                       else the first "label::…" column). Files are cached per path + modified time.
+        """
+        cache_key = None
+        if isinstance(form, str):
+            cache_key = (os.path.abspath(form), os.path.getmtime(form), label_column)
+            if cache_key in _LOADED_CODEBOOKS:
+                return _LOADED_CODEBOOKS[cache_key]
+        if form is not None:
+            choices = pl.read_excel(form, sheet_name="choices")
+            if isinstance(form, io.BytesIO):
+                form.seek(0)
+            survey = pl.read_excel(form, sheet_name="survey")
+        if choices is None:
+            raise ValueError("❌ Pass an XLSForm file or a `choices` DataFrame.")
+
+        if label_column is None:
+            labels = [c for c in choices.columns if c == "label" or c.startswith("label::")]
+            if not labels:
+                raise ValueError("❌ No 'label' column found in the choices sheet.")
+            label_column = labels[0]
+
+        codebook = cls()
+        rows = choices.select([
+            pl.col("list_name").cast(pl.Utf8).str.strip_chars(),
+            pl.col("name").cast(pl.Utf8).str.strip_chars(),
+            pl.col(label_column).cast(pl.Utf8).fill_null(pl.col("name").cast(pl.Utf8)),
+        ]).drop_nulls(["list_name", "name"])
+        for (list_name,), group in rows.partition_by("list_name", as_dict=True, maintain_order=True).items():
+            codebook.add_list(list_name, dict(zip(group["name"].to_list(), group[label_column].to_list())))
+
+        if survey is not None:
+            questions = survey.select([
+                pl.col("type").cast(pl.Utf8).str.strip_chars().str.split_exact(" ", 1).struct.rename_fields(["kind", "list"]),
+                pl.col("name").cast(pl.Utf8),
+            ]).unnest("type").filter(pl.col("kind").is_in(["select_one", "select_multiple"]))
+            for kind, list_name, name in questions.iter_rows():
+                if list_name in codebook.lists and name:
+                    codebook.assign(name, list_name, multiple=kind == "select_multiple")
+
+        if cache_key:
+            _LOADED_CODEBOOKS[cache_key] = codebook
+        print(f"✅ Codebook loaded: {len(codebook.lists)} choice lists, {len(codebook.columns)} coded columns")
+        return codebook
+
+    @classmethod
+    def from_spss(cls, path: str) -> "Codebook":
+        """📥 Load SPSS (.sav) value labels: one choice list per labeled variable (needs `pyreadstat`)."""
+        import pyreadstat
+
+        _, meta = pyreadstat.read_sav(path, metadataonly=True)
+        codebook = cls()
+        for column, labels in meta.variable_value_labels.items():
+            codebook.add_list(column, labels).assign(column, column)
+        print(f"✅ Codebook loaded from SPSS: {len(codebook.columns)} labeled columns")
+        return codebook
+
+    # 🏷️ Labeling ----------------------------------------------------------
+
+    def label_expr(self, column: str, dtype: str = "enum", alias: Optional[str] = None, source_dtype=pl.Utf8) -> pl.Expr:
+        """Expression labeling one select_one column (unknown codes → null)."""
+        mapping = self.lists[self.columns[column]["list"]]
+        codes, expr = list(mapping), pl.col(column)
+        # Numeric columns are looked up on numbers (no per-row cast to text)
+        if source_dtype.is_numeric() and all(c.lstrip("-").isdigit() for c in codes):
+            codes = [int(c) for c in codes]
+            expr = expr.cast(pl.Int64, strict=False) if source_dtype.is_float() else expr
+        else:
+            expr = expr.cast(pl.Utf8)
+        if dtype == "enum":
+            return_dtype = pl.Enum(list(dict.fromkeys(mapping.values())))
+        else:
+            return_dtype = pl.Utf8
+        expr = expr.replace_strict(codes, list(mapping.values()), default=None, return_dtype=return_dtype)
+        if dtype == "categorical":
+            expr = expr.cast(pl.Categorical)
+        return expr.alias(alias or column)
+
+    def dummy_exprs(self, column: str) -> List[pl.Expr]:
+        """Expressions splitting one select_multiple column into 0/1 columns `column/code`."""
+        codes = pl.col(column).cast(pl.Utf8).str.strip_chars().str.split(" ")
+        return [
+            codes.list.contains(code).cast(pl.UInt8).alias(f"{column}/{code}")
+            for code in self.lists[self.columns[column]["list"]]
+        ]
+
+    def apply(
+        self,
+        df: Union[pl.DataFrame, pl.LazyFrame],
+        columns: Optional[List[str]] = None,
+        dtype: str = "enum",
+        keep_codes: bool = False,
+        split_multiple: bool = True,
+    ):
+        """
+        ▶️ Label all coded columns (default: every codebook column present) in one pass.
+
+        dtype : "enum" (compact, ordered as in the form), "categorical" or "str"
+        keep_codes : keep the original codes and add `<column>_label` instead of replacing
+        split_multiple : add `column/code` dummy columns for select_multiple questions
+        """
+        try:
+            schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+            columns = [c for c in (columns or self.columns) if c in schema and c in self.columns]
+            exprs = []
+            for col in columns:
+                if self.columns[col]["multiple"]:
+                    if split_multiple:
+                        exprs += self.dummy_exprs(col)
+                else:
+                    alias = f"{col}_label" if keep_codes else col
+                    exprs.append(self.label_expr(col, dtype, alias=alias, source_dtype=schema[col]))
+
+            out = df.with_columns(exprs)
+            print(f"✅ Labeled {len(columns)} coded column(s) in one pass")
+            return out
+        except Exception as e:
+            print("⚠️ Error while applying codebook:", e)
+            return df
+
+
+def _code_text(code) -> str:
+    """1 / 1.0 / "1" → "1" (codes are compared as text)."""
+    if isinstance(code, float) and code.is_integer():
+        code = int(code)
+    return str(code).strip()
+
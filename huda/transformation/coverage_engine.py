@@ -0,0 +1,148 @@
+import polars as pl
+import pandas as pd
+from typing import List, Dict, Union, Optional
+import io
+
+
+def coverage_engine(
+    data: Union[str, pd.DataFrame, pl.DataFrame, pl.LazyFrame, io.BytesIO],
+    needs_columns: List[str],
+    provided_columns: List[str],
+    group_by_cols: Optional[Union[str, List[str]]] = None,
+    population_column: Optional[str] = None,
+    weights: Optional[Dict[str, Union[int, float]]] = None,
+    output_coverage_col: str = "weighted_coverage_pct",
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    🎯 Needs Coverage Engine (per sector, total, population-weighted, any admin level)
+    ===================================================================================
+
+    🧭 What it does:
+    ----------------
+    One query that computes, for every row or for every group (province,
+    district, month …):
+
+    - `{need}_coverage_pct` per sector  → Σ provided / Σ needs × 100
+    - `total_needs_coverage_pct`        → Σ all provided / Σ all needs × 100
+    - `output_coverage_col` (optional)  → sector coverages averaged with `weights`
+    - `population_weighted_avg_pct` (optional) → average of the rows' total
+      coverage, weighted by `population_column`, within each group
+
+    Groups are aggregated correctly: coverage of a province is the sum of what
+    was provided over the sum of what was needed in its districts, NOT the mean
+    of the district percentages (a tiny district at 100% would otherwise weigh
+    as much as Kabul). All sectors are computed in ONE (lazy) aggregation, so
+    100+ sector columns cost a single pass.
+
+    🧮 Parameters:
+    --------------
+    data : str | pandas.DataFrame | polars.DataFrame | polars.LazyFrame | io.BytesIO
+        Input dataset (LazyFrame in → LazyFrame out)
+    needs_columns : List[str]
+        Columns with needs (e.g. ["food_needs", "water_needs"])
+    provided_columns : List[str]
+        Columns with aid provided, in the same order as `needs_columns`
+    group_by_cols : str | List[str], optional
+        Admin level / grouping (e.g. "province" or ["adm1", "month"]).
+        None → one result per row.
+    population_column : str, optional
+        Population for `population_weighted_avg_pct` (summed per group)
+    weights : Dict[str, float], optional
+        Importance of each need column for `output_coverage_col`
+    output_coverage_col : str
+        Name of the sector-weighted coverage column
+
+    🧪 Example:
+    -----------
+    df = pl.DataFrame({
+        "province": ["Kabul", "Kabul", "Herat"],
+        "district": ["Paghman", "Bagrami", "Injil"],
+        "population": [400000, 100000, 300000],
+        "food_needs": [1000, 100, 800],
+        "food_provided": [500, 100, 600],
+        "water_needs": [5000, 400, 4000],
+        "water_provided": [2500, 400, 3200],
+    })
+
+    coverage_engine(df, ["food_needs", "water_needs"], ["food_provided", "water_provided"],
+                    group_by_cols="province", population_column="population")
+
+    ┌──────────┬─────────────────────────┬──────────────────────────┬──────────────────────────┬─────────────────────────────┐
+    │ province ┆ food_needs_coverage_pct ┆ water_needs_coverage_pct ┆ total_needs_coverage_pct ┆ population_weighted_avg_pct │
+    ╞══════════╪═════════════════════════╪══════════════════════════╪══════════════════════════╪═════════════════════════════╡
+    │ Kabul    ┆ 54.5                    ┆ 53.7                     ┆ 53.8                     ┆ 60.0                        │
+    │ Herat    ┆ 75.0                    ┆ 80.0                     ┆ 79.2                     ┆ 79.2                        │
+    └──────────┴─────────────────────────┴──────────────────────────┴──────────────────────────┴─────────────────────────────┘
+    (the needs / provided / population sums are returned too)
+
+    🕒 When to Use:
+    ---------------
+    - Coverage monitoring by sector at district, province or national level
+    - Dashboards with many cluster / sector indicators
+    """
+
+    # --- 1. Convert data to Polars ---
+    if isinstance(data, (str, io.BytesIO)):
+        df = pl.read_csv(data)
+    elif isinstance(data, pd.DataFrame):
+        df = pl.from_pandas(data)
+    elif isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+        df = data
+    else:
+        raise TypeError("Unsupported data type")
+
+    if len(needs_columns) != len(provided_columns):
+        raise ValueError("needs_columns and provided_columns must have the same length")
+    if weights and any(col not in needs_columns for col in weights):
+        raise ValueError("weights keys must be columns of needs_columns")
+    group_by_cols = [group_by_cols] if isinstance(group_by_cols, str) else list(group_by_cols or [])
+    pairs = list(zip(needs_columns, provided_columns))
+
+    def ratio(provided, needs):
+        return pl.when(needs > 0).then(provided / needs * 100)
+
+    # --- 2. Rows → group totals (ONE aggregation for every sector) ---
+    lf = df.lazy()
+    if population_column:
+        # Population-weighted average of each row's total coverage: Σ pop × cov / Σ pop (rows with a coverage)
+        row_total = ratio(pl.sum_horizontal(provided_columns), pl.sum_horizontal(needs_columns))
+        has_cov = row_total.is_not_null() & pl.col(population_column).is_not_null()
+        pop_weighted = [
+            (row_total * pl.col(population_column)).filter(has_cov).sum().alias("__pop_cov"),
+            pl.col(population_column).filter(has_cov).sum().alias("__pop_with_cov"),
+        ]
+    else:
+        pop_weighted = []
+
+    if group_by_cols:
+        totals = lf.group_by(group_by_cols, maintain_order=True).agg(
+            [pl.col(c).sum() for c in needs_columns + provided_columns]
+            + ([pl.col(population_column).sum()] if population_column else [])
+            + pop_weighted
+        )
+    elif population_column:
+        # Row level: the population-weighted average covers the whole table (window, no extra pass)
+        totals = lf.with_columns([e.over(pl.lit(1)) for e in pop_weighted])
+    else:
+        totals = lf
+
+    # --- 3. Coverage columns from the totals ---
+    coverage = [ratio(pl.col(p), pl.col(n)).alias(f"{n}_coverage_pct") for n, p in pairs]
+    coverage.append(
+        ratio(pl.sum_horizontal(provided_columns), pl.sum_horizontal(needs_columns)).alias("total_needs_coverage_pct")
+    )
+    result = totals.with_columns(coverage)
+
+    if weights:
+        total_weight = sum(weights.values())
+        weighted_sum = sum(pl.col(f"{col}_coverage_pct") * w for col, w in weights.items())
+        result = result.with_columns((weighted_sum / total_weight).alias(output_coverage_col))
+
+    if population_column:
+        result = result.with_columns(
+            pl.when(pl.col("__pop_with_cov") > 0)
+            .then(pl.col("__pop_cov") / pl.col("__pop_with_cov"))
+            .alias("population_weighted_avg_pct")
+        ).drop(["__pop_cov", "__pop_with_cov"])
+
+    return result if isinstance(df, pl.LazyFrame) else result.collect()
@@ -0,0 +1,201 @@
+import json
+import polars as pl
+from typing import Dict, List, Optional, Union
+
+# 🧾 Keys an indicator definition may use
+INDICATOR_KEYS = ("numerator", "denominator", "scale", "round", "null_on_zero", "level", "description")
+
+
+class IndicatorSpec:
+    """
+    📐 Declarative indicator framework compiled into ONE Polars expression plan.
+
+    💡 Simple Explanation:
+    ----------------------
+    Indicator frameworks (HNO, cluster monitoring, MSNA) define hundreds of
+    derived indicators: "% of households with improved water", "children per
+    adult", "IDPs per 1,000 people" … Instead of calling a helper per indicator
+    (one `with_columns` each), write them down once as data (dict, JSON or YAML)
+    and compute them all together:
+
+    - numerator / denominator : a column (any name, e.g. "hh-total"), a list of
+                                columns (summed), a number, or a SQL expression
+                                ("boys_u5 + girls_u5") when it is not a column name
+    - scale                   : multiply the ratio (100 → %, 1000 → per 1,000)
+    - round                   : decimals
+    - null_on_zero            : denominator 0 → null instead of inf (default True)
+    - level                   : admin level to compute at (e.g. ["adm1"]); the
+                                numerator and denominator are SUMMED per group
+                                first (ratio of sums, never a mean of ratios)
+
+    Every distinct numerator / denominator is compiled once and shared by all
+    indicators that use it; all indicators of a level are evaluated in a single
+    pass (one `with_columns` for row level, one `group_by().agg()` per level).
+
+    🧠 Example Usage:
+    -----------------
+        from huda.transformation import IndicatorSpec
+
+        spec = IndicatorSpec({
+            "pct_improved_water": {"numerator": "hh_improved_water", "denominator": "hh_total", "scale": 100, "round": 1},
+            "children_per_adult": {"numerator": ["boys_u18", "girls_u18"], "denominator": ["men", "women"], "round": 2},
+            "idps_per_1000":      {"numerator": "idps", "denominator": "population", "scale": 1000, "level": ["adm1"]},
+        })
+        results = spec.compute(df)          # {"row": df + 2 columns, "adm1": one row per province}
+
+        spec = IndicatorSpec.from_file("msna_indicators.yaml")   # YAML needs `pyyaml`
+
+    🧾 YAML:
+    ---------
+        pct_improved_water:
+          numerator: hh_improved_water
+          denominator: hh_total
+          scale: 100
+          round: 1
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Computing a full indicator framework (tens to hundreds of indicators).
+    💡 Why:
+        - One optimized pass instead of one round trip per indicator.
+        - The framework lives in a reviewable file, not scattered in code.
+    """
+
+    def __init__(self, indicators: Union[Dict[str, dict], List[dict]]):
+        if isinstance(indicators, list):
+            indicators = {item["name"]: {k: v for k, v in item.items() if k != "name"} for item in indicators}
+        self.indicators: Dict[str, dict] = {}
+        for name, definition in indicators.items():
+            unknown = [k for k in definition if k not in INDICATOR_KEYS]
+            if unknown:
+                raise ValueError(f"❌ Indicator '{name}': unknown key(s) {unknown}. Use: {', '.join(INDICATOR_KEYS)}")
+            if "numerator" not in definition:
+                raise ValueError(f"❌ Indicator '{name}' needs a numerator.")
+            self.indicators[name] = definition
+
+    def __repr__(self):
+        return f"IndicatorSpec({len(self.indicators)} indicators, levels: {', '.join(self.levels)})"
+
+    def __len__(self):
+        return len(self.indicators)
+
+    @classmethod
+    def from_file(cls, path: str) -> "IndicatorSpec":
+        """📥 Load a spec from .json or .yaml / .yml ({name: definition} or a list with `name` keys)."""
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                import yaml
+
+                return cls(yaml.safe_load(f))
+            return cls(json.load(f))
+
+    @property
+    def levels(self) -> List[str]:
+        """Level names used in the spec ("row" = one value per row)."""
+        return list(dict.fromkeys(_level_name(d.get("level")) for d in self.indicators.values()))
+
+    # 🧩 Compilation --------------------------------------------------------
+
+    def _compile(self, columns: Optional[List[str]] = None):
+        """
+        Deduplicated parts (numerators / denominators) and one plan entry per indicator.
+        A term that names a column of `columns` is that column, whatever characters it
+        contains ("hh-total", "Pop 2024"); anything else is parsed as a SQL expression.
+        """
+        columns = set(columns or ())
+        parts: Dict[str, pl.Expr] = {}
+
+        def part(term) -> Union[str, float]:
+            if isinstance(term, (int, float)):
+                return float(term)
+            if isinstance(term, (list, tuple)):
+                key = "sum(" + ",".join(sorted(str(t) for t in term)) + ")"
+                expr = pl.sum_horizontal([pl.col(t) for t in term])
+            elif str(term) in columns or str(term).isidentifier():
+                key = str(term)
+                expr = pl.col(key)
+            else:
+                key = " ".join(str(term).split())
+                expr = pl.sql_expr(key)
+            if key not in parts:
+                parts[key] = expr.cast(pl.Float64)
+            return key
+
+        plan = {}
+        for name, d in self.indicators.items():
+            plan[name] = {
+                "numerator": part(d["numerator"]),
+                "denominator": part(d["denominator"]) if d.get("denominator") is not None else None,
+                "scale": d.get("scale", 1),
+                "round": d.get("round"),
+                "null_on_zero": d.get("null_on_zero", True),
+                "level": _level(d.get("level")),
+            }
+        return parts, plan
+
+    def compute(self, data: Union[pl.DataFrame, pl.LazyFrame]):
+        """
+        ▶️ Evaluate every indicator.
+
+        Returns the data with the row-level indicators added when the spec has
+        only row-level indicators, otherwise a dict {level name: frame}:
+        "row" → data + row-level indicators, "adm1" / "adm1,month" → one row per group.
+        LazyFrame input gives LazyFrames (one plan, collect when you want).
+        """
+        try:
+            lf = data.lazy()
+            parts, plan = self._compile(lf.collect_schema().names())
+            aliases = {key: f"__part_{i}" for i, key in enumerate(parts)}
+            results = {}
+
+            for level in dict.fromkeys(p["level"] for p in plan.values()):
+                names = [n for n, p in plan.items() if p["level"] == level]
+                used = list(dict.fromkeys(
+                    k for n in names for k in (plan[n]["numerator"], plan[n]["denominator"]) if isinstance(k, str)
+                ))
+                if level:
+                    # Parts summed per group in ONE aggregation (ratio of sums)
+                    frame = lf.group_by(list(level), maintain_order=True).agg([parts[k].sum().alias(aliases[k]) for k in used])
+                else:
+                    frame = lf.with_columns([parts[k].alias(aliases[k]) for k in used])
+                frame = frame.with_columns([_indicator_expr(plan[n], aliases).alias(n) for n in names])
+                frame = frame.drop([aliases[k] for k in used])
+                results[_level_name(level)] = frame if isinstance(data, pl.LazyFrame) else frame.collect()
+
+            print(f"✅ {len(plan)} indicator(s) computed from {len(parts)} shared part(s) at level(s): {', '.join(results)}")
+            if list(results) == ["row"]:
+                return results["row"]
+            return results
+
+        except Exception as e:
+            print("⚠️ Error while computing indicators:", e)
+            return None
+
+
+def _level(level) -> tuple:
+    if level is None:
+        return ()
+    return (level,) if isinstance(level, str) else tuple(level)
+
+
+def _level_name(level) -> str:
+    level = _level(level)
+    return ",".join(level) if level else "row"
+
+
+def _indicator_expr(entry: dict, aliases: Dict[str, str]) -> pl.Expr:
+    def term(key):
+        return pl.lit(key) if isinstance(key, float) else pl.col(aliases[key])
+
+    value = term(entry["numerator"])
+    if entry["denominator"] is not None:
+        denominator = term(entry["denominator"])
+        value = value / denominator
+        if entry["null_on_zero"]:
+            value = pl.when(denominator != 0).then(value)
+    if entry["scale"] != 1:
+        value = value * entry["scale"]
+    if entry["round"] is not None:
+        value = value.round(entry["round"])
+    return value
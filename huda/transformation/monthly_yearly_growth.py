@@ -1,80 +1,97 @@
 import polars as pl
 import pandas as pd  # Import pandas for type hinting and internal use with plot libs
-from typing import Union
+from typing import List, Optional, Union
 import io  # To handle file uploads as a buffer
+from ..cleaning.date_parser import parse_dates, detect_date_formats, parse_dates_expr
+
+# 📅 Calendar periods: (bucket, previous period offset, same period one year earlier)
+GROWTH_FREQUENCIES = {
+    "weekly": ("1w", "-1w", "-52w"),
+    "monthly": ("1mo", "-1mo", "-1y"),
+    "quarterly": ("1q", "-1q", "-1y"),
+}
+
 
-# Your original monthly_yearly_growth function definition
-# ----------------------------------------------------------------------------------
 def monthly_yearly_growth(
-    data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
+    data: Union[str, pd.DataFrame, pl.DataFrame, pl.LazyFrame, io.BytesIO],
     value_column: str = "beneficiaries",
     date_column: str = "date",
-    period: str = "monthly"
-) -> pl.DataFrame:
+    period: str = "monthly",
+    group_by: Optional[Union[str, List[str]]] = None,
+    frequency: str = "monthly",
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """
     📊 Calculate Growth Rates (Month-over-Month, Year-over-Year)
     ============================================================
     What it does:
     -------------
-    - Calculates growth of a numeric column over time
-    - Supports monthly (MoM) or yearly (YoY) growth
-    - Automatically converts CSV path, Pandas DF, Polars DF, or bytes buffer to Polars DF
-    
+    - Calculates growth of a numeric column over time, per series (`group_by`)
+    - Compares each period with its CALENDAR predecessor: the previous
+      week / month / quarter, or the same period one year earlier
+    - A missing predecessor period gives null growth (never a wrong row)
+    - Automatically converts CSV path, Pandas DF, Polars DF, LazyFrame or bytes buffer
+
     Parameters:
     -----------
-    data : str | pd.DataFrame | pl.DataFrame | io.BytesIO
-        CSV path, Pandas DataFrame, Polars DataFrame, or a bytes buffer (e.g., from a file upload).
+    data : str | pd.DataFrame | pl.DataFrame | pl.LazyFrame | io.BytesIO
+        CSV path, Pandas DataFrame, Polars DataFrame / LazyFrame, or a bytes buffer (e.g., from a file upload).
     value_column : str
         Numeric column to calculate growth on (e.g., beneficiaries)
     date_column : str
         Column containing dates
     period : str, default="monthly"
-        "monthly" → Month-over-Month
-        "yearly"  → Year-over-Year
+        "monthly" (or "previous") → growth vs. the previous period (MoM, QoQ, WoW)
+        "yearly"                  → growth vs. the same period one year earlier (YoY)
+    group_by : str | list[str], optional
+        Series columns (e.g. ["province", "indicator"]). Each series is compared
+        only with its own history. None → one series.
+    frequency : str, default="monthly"
+        Calendar period of the data: "weekly", "monthly" or "quarterly".
+        Several rows of the same series in one period are summed first.
 
     Returns:
     --------
-    pl.DataFrame
-        Original data with new column "growth_rate_pct"
+    pl.DataFrame (pl.LazyFrame for LazyFrame input)
+        Original data (sorted by series and date) with "year", "month" and "growth_rate_pct"
     
     Example Usage (Afghan survey):
     -------------------------------
     import polars as pl
-    from your_library_name import monthly_yearly_growth # Assuming this function is in 'your_library_name'
+    from huda.transformation import monthly_yearly_growth
 
     df = pl.DataFrame({
-        "province": ["Kabul", "Kabul", "Herat", "Herat", "Kandahar", "Kandahar"],
-        "date": ["2024-01-01","2024-02-01","2024-01-01","2024-02-01","2024-01-01","2024-02-01"],
-        "beneficiaries": [100, 150, 200, 250, 120, 180]
+        "province": ["Kabul", "Kabul", "Kabul", "Herat", "Herat"],
+        "date": ["2024-01-01", "2024-02-01", "2024-04-01", "2024-01-01", "2024-02-01"],
+        "beneficiaries": [100, 150, 180, 200, 250]
     })
     
-    df_growth = monthly_yearly_growth(df, value_column="beneficiaries", date_column="date", period="monthly")
+    df_growth = monthly_yearly_growth(df, value_column="beneficiaries", date_column="date",
+                                      period="monthly", group_by="province")
     print(df_growth)
 
-    Output Table:
-    -------------
-    ┌────────────┬───────────────┬────────┬───────┬────────────────┐
-    │ date       ┆ beneficiaries ┆ year   ┆ month ┆ growth_rate_pct│
-    ├────────────┼───────────────┼────────┼───────┼────────────────┤
-    │ 2024-01-01 ┆ 100           ┆ 2024   ┆ 1     ┆ NaN            │
-    │ 2024-02-01 ┆ 150           ┆ 2024   ┆ 2     ┆ 50.0           │
-    │ 2024-01-01 ┆ 200           ┆ 2024   ┆ 1     ┆ NaN            │
-    │ 2024-02-01 ┆ 250           ┆ 2024   ┆ 2     ┆ 25.0           │
-    │ 2024-01-01 ┆ 120           ┆ 2024   ┆ 1     ┆ NaN            │
-    │ 2024-02-01 ┆ 180           ┆ 2024   ┆ 2     ┆ 50.0           │
-    └────────────┴───────────────┴────────┴───────┴────────────────┘
+    Output Table (Kabul has no March → April has no predecessor):
+    --------------------------------------------------------------
+    ┌──────────┬────────────┬───────────────┬──────┬───────┬─────────────────┐
+    │ province ┆ date       ┆ beneficiaries ┆ year ┆ month ┆ growth_rate_pct │
+    ├──────────┼────────────┼───────────────┼──────┼───────┼─────────────────┤
+    │ Herat    ┆ 2024-01-01 ┆ 200           ┆ 2024 ┆ 1     ┆ null            │
+    │ Herat    ┆ 2024-02-01 ┆ 250           ┆ 2024 ┆ 2     ┆ 25.0            │
+    │ Kabul    ┆ 2024-01-01 ┆ 100           ┆ 2024 ┆ 1     ┆ null            │
+    │ Kabul    ┆ 2024-02-01 ┆ 150           ┆ 2024 ┆ 2     ┆ 50.0            │
+    │ Kabul    ┆ 2024-04-01 ┆ 180           ┆ 2024 ┆ 4     ┆ null            │
+    └──────────┴────────────┴───────────────┴──────┴───────┴─────────────────┘
 
     When to Use:
     ------------
-    - You have time-series survey data (monthly or yearly)
-    - Want to see how numbers change over time
+    - You have time-series survey data (weekly, monthly or quarterly)
+    - Want to see how numbers change over time, per province / indicator
     - Track trends for beneficiaries, cases, or aid delivery
 
     Why It Is Useful:
     -----------------
     - Quickly identifies growth or decline
-    - Helps plan interventions in Afghan provinces
-    - Makes dashboards and reports clearer
+    - Gaps in reporting never shift the comparison to the wrong period
+    - Thousands of series are computed together in one lazy query
 
     Where to Use:
     -------------
@@ -83,65 +100,74 @@ def monthly_yearly_growth(
     - Any dataset with numeric measures over time
     """
 
-    # ---- Step 1: Convert input to Polars DF ----
-    if isinstance(data, io.BytesIO):
-        df = pl.read_csv(data)
-    elif isinstance(data, str):
+    # ---- Step 1: Convert input to Polars (lazy) ----
+    if isinstance(data, (io.BytesIO, str)):
         df = pl.read_csv(data)
     elif "pandas" in str(type(data)):  # This will match pd.DataFrame
         df = pl.from_pandas(data)
-    elif isinstance(data, pl.DataFrame):
+    elif isinstance(data, (pl.DataFrame, pl.LazyFrame)):
         df = data
     else:
-        raise TypeError("Input 'data' must be CSV path (str), Pandas DataFrame, Polars DataFrame, or an io.BytesIO object.")
-
-    # ---- Step 2: Validate and convert date column ----
-    if date_column not in df.columns:
-        raise ValueError(f"Date column '{date_column}' not found in your data.")
-
-    if df.schema[date_column] == pl.Utf8:
-        try:
-            # Try common YYYY-MM-DD
-            df = df.with_columns(
-                pl.col(date_column).str.strptime(pl.Date, "%Y-%m-%d", strict=True).alias(date_column)
-            )
-        except Exception:
-            try:  # Try MM/DD/YYYY
-                df = df.with_columns(
-                    pl.col(date_column).str.strptime(pl.Date, "%m/%d/%Y", strict=True).alias(date_column)
-                )
-            except Exception:
+        raise TypeError("Input 'data' must be CSV path (str), Pandas DataFrame, Polars DataFrame / LazyFrame, or an io.BytesIO object.")
+    is_lazy = isinstance(df, pl.LazyFrame)
+    schema = df.collect_schema() if is_lazy else df.schema
+
+    # ---- Step 2: Validate options and columns ----
+    period = period.lower()
+    if period not in ("monthly", "previous", "yearly"):
+        raise ValueError("Parameter 'period' must be 'monthly' (previous period) or 'yearly'.")
+    if frequency not in GROWTH_FREQUENCIES:
+        raise ValueError(f"Parameter 'frequency' must be one of: {', '.join(GROWTH_FREQUENCIES)}.")
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    missing = [c for c in [date_column, value_column] + group_by if c not in schema]
+    if missing:
+        raise ValueError(f"Columns not found in your data: {', '.join(missing)}")
+
+    # Ensure value column is numeric
+    if not schema[value_column].is_numeric():
+        raise TypeError(f"Value column '{value_column}' must be a numeric type. Found: {schema[value_column]}.")
+
+    # ---- Step 3: Parse dates ----
+    if schema[date_column] == pl.Utf8:
+        if is_lazy:
+            # Formats detected on a sample, parsed inside the lazy query
+            sample = df.select(date_column).head(2000).collect().to_series()
+            df = df.with_columns(parse_dates_expr(date_column, detect_date_formats(sample)))
+        else:
+            # Detect the formats present (ISO, US, EU, Solar Hijri) and parse them vectorized
+            df, report = parse_dates(df, date_column)
+            if df[date_column].is_null().all():
                 raise ValueError(
-                    f"Could not parse date column '{date_column}'. Please ensure it's in "
-                    f"YYYY-MM-DD or MM/DD/YYYY format. Column type is: {df.schema[date_column]}"
+                    f"Could not parse date column '{date_column}'. Parse report: {report.to_dicts()}"
                 )
-    elif df.schema[date_column] != pl.Date:
+    elif isinstance(schema[date_column], pl.Datetime):
+        df = df.with_columns(pl.col(date_column).cast(pl.Date))
+    elif schema[date_column] != pl.Date:
         raise TypeError(
             f"Date column '{date_column}' is not in a recognized date or string format. "
-            f"Found: {df.schema[date_column]}. Expected Utf8 or Date."
+            f"Found: {schema[date_column]}. Expected Utf8 or Date."
         )
 
-    # Ensure value column is numeric
-    if df.schema[value_column] not in [pl.Int64, pl.Float64]:
-        raise TypeError(f"Value column '{value_column}' must be a numeric type. Found: {df.schema[value_column]}.")
-
-    # ---- Step 3: Extract year/month for grouping and sorting ----
-    df = df.with_columns([
+    # ---- Step 4: Period totals per series, joined to their calendar predecessor ----
+    bucket, previous, year_ago = GROWTH_FREQUENCIES[frequency]
+    offset = year_ago if period == "yearly" else previous
+    lf = df.lazy().with_columns([
         pl.col(date_column).dt.year().alias("year"),
-        pl.col(date_column).dt.month().alias("month")
+        pl.col(date_column).dt.month().alias("month"),
+        pl.col(date_column).dt.truncate(bucket).alias("__period"),
     ])
-    df = df.sort(date_column)
-
-    # ---- Step 4: Calculate growth rate ----
-    if period.lower() == "monthly":
-        df = df.with_columns([
-            ((pl.col(value_column) - pl.col(value_column).shift(1)) / pl.col(value_column).shift(1) * 100).alias("growth_rate_pct")
-        ])
-    elif period.lower() == "yearly":
-        df = df.with_columns([
-            ((pl.col(value_column) - pl.col(value_column).shift(12)) / pl.col(value_column).shift(12) * 100).alias("growth_rate_pct")
-        ])
-    else:
-        raise ValueError("Parameter 'period' must be 'monthly' or 'yearly'.")
+    totals = lf.group_by(group_by + ["__period"]).agg(pl.col(value_column).sum().alias("__value"))
+    earlier = totals.select(
+        group_by + [pl.col("__period").dt.offset_by(offset[1:]).alias("__period"), pl.col("__value").alias("__previous")]
+    )
+    growth = totals.join(earlier, on=group_by + ["__period"], how="left", nulls_equal=True).select(
+        group_by + ["__period", ((pl.col("__value") - pl.col("__previous")) / pl.col("__previous") * 100).alias("growth_rate_pct")]
+    )
 
-    return df
+    # ---- Step 5: Growth back on every row ----
+    result = (
+        lf.join(growth, on=group_by + ["__period"], how="left", nulls_equal=True)
+        .drop("__period")
+        .sort(group_by + [date_column], maintain_order=True)
+    )
+    return result if is_lazy else result.collect()
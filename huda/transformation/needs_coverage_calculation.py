@@ -2,6 +2,7 @@ import polars as pl
 import pandas as pd
 from typing import List, Dict, Union, Optional
 import io
+from .coverage_engine import coverage_engine
 
 def needs_coverage_calculation(
     data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
@@ -46,6 +47,9 @@ def needs_coverage_calculation(
     🧩 Formula for total coverage:
         total_needs_coverage_pct = (Σ all provided) / (Σ all needs) × 100
 
+    With `group_by_cols`, per-need coverage of a group is also Σ provided / Σ needs
+    (not the mean of the rows' percentages). Runs on `coverage_engine`.
+
     🧪 Example:
     -----------
     df = pl.DataFrame({
@@ -67,63 +71,15 @@ def needs_coverage_calculation(
     print(df_out)
     """
 
-    # --- 1. Convert data to Polars DataFrame ---
-    if isinstance(data, str):
-        df = pl.read_csv(data)
-    elif isinstance(data, io.BytesIO):
-        df = pl.read_csv(data)
-    elif isinstance(data, pd.DataFrame):
-        df = pl.from_pandas(data)
-    elif isinstance(data, pl.DataFrame):
-        df = data
-    else:
-        raise TypeError("Unsupported data type")
-
-    # --- 2. Calculate individual coverage for each need ---
-    for need_col, provided_col in zip(needs_columns, provided_columns):
-        coverage_col_name = f"{need_col}_coverage_pct"
-        df = df.with_columns(
-            pl.when(pl.col(need_col) > 0)
-            .then((pl.col(provided_col) / pl.col(need_col) * 100))
-            .otherwise(None)
-            .alias(coverage_col_name)
-        )
-
-    # --- 3. Grouping (if provided) ---
-    if group_by_cols:
-        agg_exprs = []
-
-        # Sum up totals for needs and provided
-        for col in needs_columns + provided_columns:
-            agg_exprs.append(pl.sum(col).alias(col))
-
-        # Mean of coverage percentages
-        for need_col in needs_columns:
-            cov_col = f"{need_col}_coverage_pct"
-            agg_exprs.append(pl.mean(cov_col).alias(cov_col))
-
-        df = df.group_by(group_by_cols).agg(agg_exprs)
-
-    # --- 4. Weighted overall coverage ---
-    if weights:
-        weighted_exprs = []
-        total_weight = sum(weights.values())
-        for need_col, weight in weights.items():
-            cov_col = f"{need_col}_coverage_pct"
-            weighted_exprs.append(pl.col(cov_col) * weight)
-
-        df = df.with_columns(
-            (sum(weighted_exprs) / total_weight).alias(output_coverage_col)
-        )
-
-    # --- 5. ✅ Total (overall) combined coverage ---
-    df = df.with_columns([
-        (pl.sum_horizontal([pl.col(c) for c in provided_columns]) /
-         pl.sum_horizontal([pl.col(c) for c in needs_columns]) * 100)
-        .alias("total_needs_coverage_pct")
-    ])
-
-    return df
+    # One lazy aggregation for every sector (Σ provided / Σ needs per group)
+    return coverage_engine(
+        data,
+        needs_columns,
+        provided_columns,
+        group_by_cols=group_by_cols,
+        weights=weights,
+        output_coverage_col=output_coverage_col,
+    )
 
 
 # ✅ Example test
@@ -83,15 +83,14 @@ def percentage_calculation(
         if denominator_column not in df.columns:
             raise ValueError(f"Column '{denominator_column}' not found!")
 
-        # ✅ Step 3: Calculate percentages for each numerator
-        for col in numerator_columns:
-            if col not in df.columns:
-                print(f"⚠️ Column '{col}' not found — skipping.")
-                continue
-            new_col = f"{col}{suffix}"
-            df = df.with_columns(
-                (pl.col(col) / pl.col(denominator_column) * 100).round(2).alias(new_col)
-            )
+        # ✅ Step 3: Calculate percentages for all numerators in one pass
+        missing = [col for col in numerator_columns if col not in df.columns]
+        for col in missing:
+            print(f"⚠️ Column '{col}' not found — skipping.")
+        df = df.with_columns([
+            (pl.col(col) / pl.col(denominator_column) * 100).round(2).alias(f"{col}{suffix}")
+            for col in numerator_columns if col not in missing
+        ])
 
         print("✅ Percentages calculated successfully.")
         return df
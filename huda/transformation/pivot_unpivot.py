@@ -1,13 +1,30 @@
+import numpy as np
 import polars as pl
-from typing import Union
+from typing import Optional, Union
+
+# 🧮 Aggregations for pivot cells
+PIVOT_AGGREGATES = {
+    "first": lambda e: e.first(),
+    "last": lambda e: e.last(),
+    "sum": lambda e: e.sum(),
+    "mean": lambda e: e.mean(),
+    "median": lambda e: e.median(),
+    "min": lambda e: e.min(),
+    "max": lambda e: e.max(),
+    "count": lambda e: e.count(),
+}
+
 
 def pivot_unpivot(
-    data: Union[str, "pd.DataFrame", pl.DataFrame],
+    data: Union[str, "pd.DataFrame", pl.DataFrame, pl.LazyFrame],
     index: list = None,
     columns: str = None,
     values: list = None,
-    operation: str = "pivot"
-) -> pl.DataFrame:
+    operation: str = "pivot",
+    aggregate: str = "first",
+    column_values: Optional[list] = None,
+    output_path: Optional[str] = None,
+):
     """
     🔄 Pivot / Unpivot Data (Wide ↔ Long)
     ====================================
@@ -15,13 +32,16 @@ def pivot_unpivot(
     What it does:
     -------------
     - Converts your dataset from wide format to long format or vice versa
-    - Works automatically on CSV, Pandas DF, or Polars DF
+    - Works automatically on CSV, Pandas DF, Polars DF or LazyFrame
     - Useful for time-series, survey results, or indicator analysis
+    - Pivots with DECLARED output columns run lazily (no scan for distinct values)
+    - Sparse mode: very wide, mostly empty tables (indicators × admin units)
+      go straight to a compact sparse matrix instead of a dense frame
 
     Parameters:
     -----------
-    data : str | pd.DataFrame | pl.DataFrame
-        CSV path, Pandas DataFrame, or Polars DataFrame
+    data : str | pd.DataFrame | pl.DataFrame | pl.LazyFrame
+        CSV path, Pandas DataFrame, Polars DataFrame or LazyFrame
     index : list of str, optional
         Columns to keep as identifier (for pivot or unpivot)
     columns : str, optional
@@ -31,11 +51,25 @@ def pivot_unpivot(
     operation : str, default="pivot"
         "pivot" → wide format
         "unpivot" → long format
+        "sparse" → wide format as a SciPy sparse matrix (one value column)
+    aggregate : str, default="first"
+        How several rows of the same cell are combined:
+        "first", "last", "sum", "mean", "median", "min", "max", "count"
+    column_values : list, optional
+        The output columns (values of `columns`) you want, in order.
+        Declaring them lets the pivot run lazily and skip unwanted values;
+        None → every distinct value found in the data.
+    output_path : str, optional
+        Sparse mode: also save the matrix to this .npz file (scipy.sparse.save_npz).
 
     Returns:
     --------
-    pl.DataFrame
-        Pivoted or unpivoted table
+    pl.DataFrame (pl.LazyFrame for LazyFrame input)
+        Pivoted or unpivoted table. Pivot columns are named after the column
+        values, or `{value}_{column value}` when several value columns are given.
+    Sparse mode → (matrix, row_index, column_labels): a scipy.sparse CSR
+        matrix, a DataFrame with the `index` columns of each matrix row and
+        the list of column labels.
 
     Example Usage:
     --------------
@@ -66,40 +100,76 @@ def pivot_unpivot(
         operation="unpivot"
     )
 
+    # Long indicator table → wide, summed, only the declared indicators, lazily
+    wide = pivot_unpivot(
+        pl.scan_parquet("indicators_long.parquet"),
+        index=["adm2_pcode"], columns="indicator", values=["value"],
+        aggregate="sum", column_values=["idp_hh", "returnee_hh", "food_insecure"],
+    ).collect()
+
+    # 2,000 indicators × 400 districts, 95% empty → sparse matrix
+    matrix, rows, labels = pivot_unpivot(
+        long_df, index=["adm2_pcode"], columns="indicator", values=["value"],
+        operation="sparse", aggregate="sum",
+    )
+
     """
 
     try:
-        # Step 1: Convert input to Polars DataFrame if needed
+        # Step 1: Convert input to Polars (Lazy)Frame if needed
         if isinstance(data, str):
             df = pl.read_csv(data)
         elif "pandas" in str(type(data)):
             import pandas as pd
             df = pl.from_pandas(data)
-        elif isinstance(data, pl.DataFrame):
+        elif isinstance(data, (pl.DataFrame, pl.LazyFrame)):
             df = data
         else:
-            raise TypeError("Input must be CSV path, Pandas DataFrame, or Polars DataFrame")
+            raise TypeError("Input must be CSV path, Pandas DataFrame, or Polars DataFrame / LazyFrame")
+        is_lazy = isinstance(df, pl.LazyFrame)
+        values = [values] if isinstance(values, str) else values
+        index = [index] if isinstance(index, str) else index
 
         # Step 2: Decide operation
         op = operation.lower()
-        if op == "pivot":
+        if op in ("pivot", "sparse"):
             if not index or not columns or not values:
-                raise ValueError("For pivot, provide index, columns, and values")
-            df_wide = df.pivot(
-                values=values,
-                index=index,
-                columns=columns,
-                aggregate_fn="first"  # use first if no aggregation needed
+                raise ValueError(f"For {op}, provide index, columns, and values")
+            if aggregate not in PIVOT_AGGREGATES:
+                raise ValueError(f"aggregate must be one of: {', '.join(PIVOT_AGGREGATES)}")
+
+            # One row per cell: duplicates aggregated in ONE grouped pass
+            cells = df.lazy().group_by(index + [columns]).agg(
+                [PIVOT_AGGREGATES[aggregate](pl.col(v)).alias(v) for v in values]
             )
-            print("✅ Data pivoted to wide format")
-            return df_wide
+            if column_values is not None:
+                cells = cells.filter(pl.col(columns).is_in(list(column_values)))
+
+            if op == "sparse":
+                return _sparse_pivot(cells, index, columns, values, column_values, output_path)
+
+            if column_values is None:
+                # Output columns not declared → discover them (one small query)
+                column_values = cells.select(pl.col(columns).unique().sort()).collect().to_series().to_list()
+            names = [str(cv) if len(values) == 1 else f"{v}_{cv}" for v in values for cv in column_values]
+            schema = cells.collect_schema()
+            if not is_lazy and all(schema[v].is_numeric() for v in values):
+                # Eager numeric pivot: cells scattered straight into one NumPy block per value
+                wide = _dense_pivot(cells.collect(), index, columns, values, column_values, names)
+            else:
+                wide = cells.group_by(index, maintain_order=True).agg([
+                    pl.col(v).filter(pl.col(columns) == cv).first().alias(name)
+                    for (v, cv), name in zip([(v, cv) for v in values for cv in column_values], names)
+                ]).sort(index)
+            print(f"✅ Data pivoted to wide format ({len(column_values)} column value(s), aggregate='{aggregate}')")
+            return wide.collect() if isinstance(wide, pl.LazyFrame) and not is_lazy else wide
 
         elif op == "unpivot":
             if not index or not values:
                 raise ValueError("For unpivot, provide index and values")
-            df_long = df.melt(
-                id_vars=index,
-                value_vars=values,
+            df_long = df.unpivot(
+                index=index,
+                on=values,
                 variable_name="variable",
                 value_name="value"
             )
@@ -107,8 +177,59 @@ def pivot_unpivot(
             return df_long
 
         else:
-            raise ValueError("operation must be 'pivot' or 'unpivot'")
+            raise ValueError("operation must be 'pivot', 'unpivot' or 'sparse'")
 
     except Exception as e:
         print("⚠️ Error in pivot/unpivot operation:", e)
         return None
+
+
+def _cell_coordinates(cells: pl.DataFrame, index, columns, column_values):
+    """Row number (sorted index keys) and column number of every cell."""
+    rows = cells.select(index).unique().sort(index)
+    labels = pl.DataFrame({columns: list(column_values)}, schema={columns: cells.schema[columns]})
+    coords = cells.join(rows.with_row_index("__row"), on=index, how="left", nulls_equal=True).join(
+        labels.with_row_index("__col"), on=columns, how="inner",
+    )
+    return rows, coords
+
+
+def _dense_pivot(cells: pl.DataFrame, index, columns, values, column_values, names) -> pl.DataFrame:
+    rows, coords = _cell_coordinates(cells, index, columns, column_values)
+    r, c = coords["__row"].to_numpy(), coords["__col"].to_numpy()
+    series = []
+    for v in values:
+        # Block in the value's own dtype (no Float64 round trip: Int64 above 2**53
+        # and real NaN survive) plus a separate mask of the filled cells
+        dtype = cells.schema[v]
+        filled = coords[v].fill_null(0).to_numpy()
+        block = np.zeros((rows.height, len(column_values)), dtype=filled.dtype)
+        present = np.zeros(block.shape, dtype=bool)
+        block[r, c] = filled
+        present[r, c] = coords[v].is_not_null().to_numpy()
+        series += [
+            pl.Series(block[:, j], dtype=dtype).scatter(np.flatnonzero(~present[:, j]), None)
+            for j in range(len(column_values))
+        ]
+    wide = pl.DataFrame([s.alias(n) for s, n in zip(series, names)])
+    return pl.concat([rows, wide], how="horizontal")
+
+
+def _sparse_pivot(cells: pl.LazyFrame, index, columns, values, column_values, output_path):
+    """Pre-aggregated long cells → (CSR matrix, row index table, column labels)."""
+    from scipy import sparse
+
+    if len(values) != 1:
+        raise ValueError("Sparse mode takes exactly one value column")
+    cells = cells.filter(pl.col(values[0]).is_not_null()).collect()
+    labels = list(column_values) if column_values is not None else cells[columns].unique().sort().to_list()
+    rows, coords = _cell_coordinates(cells, index, columns, labels)
+    matrix = sparse.csr_matrix(
+        (coords[values[0]].to_numpy(), (coords["__row"].to_numpy(), coords["__col"].to_numpy())),
+        shape=(rows.height, len(labels)),
+    )
+    if output_path:
+        sparse.save_npz(output_path, matrix)
+    density = matrix.nnz / max(rows.height * len(labels), 1)
+    print(f"✅ Sparse pivot: {rows.height} rows × {len(labels)} columns, {matrix.nnz} filled cells ({density:.1%})")
+    return matrix, rows, labels
@@ -1,11 +1,18 @@
 import polars as pl
-from typing import Union
+from typing import Optional, Union
+from .population_store import resolve_population_store
 
 def population_based_normalization(
     data: Union[str, "pd.DataFrame", pl.DataFrame],
     value_columns: list,
     population_column: str,
-    per: int = 1000
+    per: int = 1000,
+    population_store=None,
+    pcode_column: Optional[str] = None,
+    year_column: Optional[str] = None,
+    year: Optional[int] = None,
+    sex: str = "all",
+    age_group: str = "all",
 ) -> pl.DataFrame:
     """
     📊 Normalize survey indicators per population size
@@ -27,6 +34,11 @@ def population_based_normalization(
         Column name containing the population for each region
     per : int, default=1000
         Number of people to normalize per (1000, 10000, 1, etc.)
+    population_store : PopulationStore | str, optional
+        Take the population from a `PopulationStore` (or its Parquet path)
+        instead of an existing column: matched on `pcode_column` and the
+        nearest available year to `year_column` / `year`, for `sex` and
+        `age_group`. The denominator is added as `population_column`.
 
     Returns:
     --------
@@ -73,12 +85,19 @@ def population_based_normalization(
         else:
             raise TypeError("Input must be CSV path, Pandas DataFrame, or Polars DataFrame")
 
-        # Step 2: Add normalized columns
-        for col in value_columns:
-            norm_col_name = f"{col}_per_{per}"
-            df = df.with_columns(
-                (pl.col(col) / pl.col(population_column) * per).alias(norm_col_name)
-            )
+        # Step 2: Population denominators from the store (nearest available year)
+        store = resolve_population_store(population_store)
+        if store is not None and population_column not in df.columns:
+            if pcode_column is None:
+                raise ValueError("A population store needs `pcode_column`.")
+            df = store.lookup(df, pcode_column, year_col=year_column, year=year,
+                              sex=sex, age_group=age_group, output_col=population_column)
+
+        # Step 3: Add normalized columns (one pass)
+        df = df.with_columns([
+            (pl.col(col) / pl.col(population_column) * per).alias(f"{col}_per_{per}")
+            for col in value_columns
+        ])
 
         print(f"✅ Normalized columns per {per} population: {', '.join(value_columns)}")
         return df
@@ -0,0 +1,170 @@
+import os
+import polars as pl
+from typing import Dict, Optional, Tuple, Union
+from ..cleaning.lazy_io import normalize_key_expr
+
+DEFAULT_POPULATION_STORE = os.path.join(os.path.expanduser("~"), ".cache", "huda", "population.parquet")
+
+_SCHEMA = {"pcode": pl.Utf8, "year": pl.Int32, "sex": pl.Utf8, "age_group": pl.Utf8, "population": pl.Float64}
+
+# 🗂️ Stores opened in this process, keyed by absolute path
+_OPEN_STORES: Dict[str, "PopulationStore"] = {}
+
+
+class PopulationStore:
+    """
+    👥 Local Parquet store of population by P-code, year, sex and age group.
+
+    💡 Simple Explanation:
+    ----------------------
+    Indicators per 1,000 or per 10,000 people need the right denominator: the
+    population of the same admin unit, for the same year (or the closest year
+    available), sex and age group. Load your population tables (CSO / OCHA COD-PS
+    estimates) into the store once; it is saved to Parquet and reused. Lookups
+    match P-codes in canonical form ("af-0101" = "AF0101") and take the NEAREST
+    available year with an as-of join. Resolved (P-code, year) pairs are cached
+    in memory, so repeated calls in the same process only look up new pairs.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.transformation import PopulationStore
+
+        store = PopulationStore()                         # ~/.cache/huda/population.parquet
+        store.add(cso_2023, pcode_col="adm2_pcode", year_col="year",
+                  population_col="total", sex_col="sex", age_col="age_group")
+
+        df = store.lookup(survey, pcode_col="adm2_pcode", year_col="survey_year")
+        # → adds `population` and `population_year` (the year actually used)
+
+        # Or let the metric functions do it:
+        population_based_normalization(survey, ["cases"], "population",
+                                       population_store=store, pcode_column="adm2_pcode", year=2024)
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Normalizing indicators per population across many admin units and years.
+    💡 Why:
+        - One trusted denominator table instead of ad-hoc joins (often for the wrong year).
+    """
+
+    def __init__(self, path: str = DEFAULT_POPULATION_STORE):
+        self.path = path
+        self._table: Optional[pl.DataFrame] = None
+        self._resolved: Dict[Tuple[str, str], pl.DataFrame] = {}
+
+    def __repr__(self):
+        return f"PopulationStore({self.path!r}, {self.table.height} rows)"
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_POPULATION_STORE) -> "PopulationStore":
+        """Shared store for `path` (one instance, and one lookup cache, per process)."""
+        key = os.path.abspath(path)
+        if key not in _OPEN_STORES:
+            _OPEN_STORES[key] = cls(path)
+        return _OPEN_STORES[key]
+
+    @property
+    def table(self) -> pl.DataFrame:
+        """The population table (read from Parquet once)."""
+        if self._table is None:
+            if os.path.exists(self.path):
+                self._table = pl.read_parquet(self.path)
+            else:
+                self._table = pl.DataFrame(schema=_SCHEMA)
+        return self._table
+
+    def add(
+        self,
+        data: pl.DataFrame,
+        pcode_col: str = "pcode",
+        year_col: str = "year",
+        population_col: str = "population",
+        sex_col: Optional[str] = None,
+        age_col: Optional[str] = None,
+    ) -> "PopulationStore":
+        """Add (or replace) population figures and save the store. Missing sex / age → "all"."""
+        rows = data.select([
+            normalize_key_expr(pl.col(pcode_col), ["trim", "pcode"]).alias("pcode"),
+            pl.col(year_col).cast(pl.Int32).alias("year"),
+            (pl.col(sex_col).cast(pl.Utf8).str.strip_chars().str.to_lowercase() if sex_col else pl.lit("all")).alias("sex"),
+            (pl.col(age_col).cast(pl.Utf8).str.strip_chars() if age_col else pl.lit("all")).alias("age_group"),
+            pl.col(population_col).cast(pl.Float64).alias("population"),
+        ]).drop_nulls(["pcode", "year", "population"])
+
+        keys = ["pcode", "year", "sex", "age_group"]
+        table = pl.concat([self.table.join(rows, on=keys, how="anti"), rows]).sort(keys)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            table.write_parquet(self.path)
+        self._table = table
+        self._resolved.clear()
+        print(f"✅ Population store: {rows.height} rows added ({table.height} in total)")
+        return self
+
+    def _resolve(self, keys: pl.DataFrame, sex: str, age_group: str) -> pl.DataFrame:
+        """(pcode, year) → population of the nearest available year; cached per sex / age group."""
+        cached = self._resolved.get((sex, age_group))
+        if cached is None:
+            cached = pl.DataFrame(schema={"pcode": pl.Utf8, "year": pl.Int32, "population": pl.Float64, "population_year": pl.Int32})
+        keys = keys.join(cached, on=["pcode", "year"], how="anti")
+        if keys.height:
+            reference = (
+                self.table.filter((pl.col("sex") == sex) & (pl.col("age_group") == age_group))
+                .select("pcode", pl.col("year").alias("population_year"), "population")
+                .sort("population_year")
+            )
+            found = keys.sort("year").join_asof(
+                reference, left_on="year", right_on="population_year", by="pcode", strategy="nearest",
+                check_sortedness=False,  # both sides are sorted by year above
+            ).select("pcode", "year", "population", "population_year")
+            cached = pl.concat([cached, found])
+            self._resolved[(sex, age_group)] = cached
+        return cached
+
+    def lookup(
+        self,
+        df: pl.DataFrame,
+        pcode_col: str,
+        year_col: Optional[str] = None,
+        year: Optional[int] = None,
+        sex: str = "all",
+        age_group: str = "all",
+        output_col: str = "population",
+    ) -> pl.DataFrame:
+        """
+        🔎 Add the population (nearest available year) for each row's P-code and year.
+
+        year_col : column with the year (or a Date column), or give one `year` for all rows.
+        Adds `output_col` and `{output_col}_year` (the year of the figure used).
+        """
+        if year_col is None and year is None:
+            raise ValueError("❌ Give `year_col` or `year`.")
+        if year_col is not None:
+            dtype = df.schema[year_col]
+            year_expr = pl.col(year_col).dt.year() if dtype == pl.Date or isinstance(dtype, pl.Datetime) else pl.col(year_col)
+        else:
+            year_expr = pl.lit(year)
+
+        key_exprs = [
+            normalize_key_expr(pl.col(pcode_col), ["trim", "pcode"]).alias("__pcode"),
+            year_expr.cast(pl.Int32).alias("__year"),
+        ]
+        df = df.with_columns(key_exprs)
+        keys = df.select(pl.col("__pcode").alias("pcode"), pl.col("__year").alias("year")).drop_nulls().unique()
+        resolved = self._resolve(keys, sex.lower(), age_group).rename({
+            "pcode": "__pcode", "year": "__year",
+            "population": output_col, "population_year": f"{output_col}_year",
+        })
+        out = df.join(resolved, on=["__pcode", "__year"], how="left", maintain_order="left").drop(["__pcode", "__year"])
+        missing = out[output_col].null_count()
+        if missing:
+            print(f"⚠️ No population found for {missing} row(s) (unknown P-code, sex or age group)")
+        return out
+
+
+def resolve_population_store(store: Union[str, PopulationStore, None]) -> Optional[PopulationStore]:
+    """A store instance, a path (shared per process) or None."""
+    if store is None or isinstance(store, PopulationStore):
+        return store
+    return PopulationStore.open(store)
@@ -1,6 +1,16 @@
 import polars as pl
+from typing import Dict, List, Optional, Union
 
-def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
+ROLLUP_AGGREGATES = ("sum", "mean", "count", "max", "min", "median", "weighted_mean")
+
+def region_based_data_aggregation(
+    df,
+    region_col="province",
+    agg_method="mean",
+    hierarchy: Optional[List[str]] = None,
+    aggregations: Optional[Dict[str, Union[str, tuple, list]]] = None,
+    grand_total: bool = True,
+):
     """
     📊 Aggregate Data by Region
     ===========================
@@ -19,6 +29,20 @@ def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
         The column name representing regions (e.g., 'province', 'district').
     agg_method : str
         Aggregation method: 'mean', 'sum', 'median', or 'count'.
+    hierarchy : list of str, optional
+        Admin levels from top to bottom, e.g. ["adm0", "adm1", "adm2"].
+        → ROLLUP: one row per ADM2, per ADM1, per ADM0 (and a grand total),
+        stacked in one table with an `admin_level` column. Finer admin columns
+        are null on the rolled-up rows.
+    aggregations : dict, optional
+        Aggregation per column (default: `agg_method` for every numeric column):
+            "sum", "mean", "count", "max", "min", "median",
+            ("weighted_mean", "population") → population-weighted mean
+        A list (e.g. ["sum", "max"]) gives one column per aggregation (`people_sum`, `people_max`).
+        Means and weighted means stay exact at every level: they are rebuilt
+        from sums and counts / weights, never averaged from averages.
+    grand_total : bool
+        With `hierarchy`: also add the overall total row (admin_level = "total").
 
     🧠 Example Usage:
     -----------------
@@ -44,6 +68,27 @@ def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
     │ Balkh     ┆ 800000.0   ┆ 4000.0   ┆ 7000.0   │
     └───────────┴────────────┴──────────┴──────────┘
 
+    🧭 Admin rollup (ADM2 → ADM1 → ADM0 in one call):
+    ---------------------------------------------------
+    totals = region_based_data_aggregation(
+        df,
+        hierarchy=["adm0", "adm1", "adm2"],
+        aggregations={
+            "people_in_need": "sum",
+            "gam_rate": ("weighted_mean", "population"),
+            "severity": "max",
+        },
+    )
+    ┌──────┬───────┬───────┬─────────────┬────────────────┬──────────┬──────────┐
+    │ adm0 ┆ adm1  ┆ adm2  ┆ admin_level ┆ people_in_need ┆ gam_rate ┆ severity │
+    ╞══════╪═══════╪═══════╪═════════════╪════════════════╪══════════╪══════════╡
+    │ AF   ┆ Kabul ┆ KBL01 ┆ adm2        ┆ 12000          ┆ 0.08     ┆ 3        │
+    │ …    ┆ …     ┆ …     ┆ …           ┆ …              ┆ …        ┆ …        │
+    │ AF   ┆ Kabul ┆ null  ┆ adm1        ┆ 310000         ┆ 0.07     ┆ 4        │
+    │ AF   ┆ null  ┆ null  ┆ adm0        ┆ 9800000        ┆ 0.10     ┆ 5        │
+    │ null ┆ null  ┆ null  ┆ total       ┆ 9800000        ┆ 0.10     ┆ 5        │
+    └──────┴───────┴───────┴─────────────┴────────────────┴──────────┴──────────┘
+
     📅 When & Why:
     ---------------
     ✅ Use when:
@@ -54,10 +99,15 @@ def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
         - Helps simplify analysis (1 record per region)
         - Makes it easier to visualize regional patterns
         - Saves memory and makes datasets lighter
+        - Rollup: every admin level from ONE grouped pass over the data (coarser
+          levels are computed from the finest level's partial sums)
     """
     try:
+        if hierarchy is not None or aggregations is not None:
+            return _rollup(df, hierarchy or [region_col], aggregations, agg_method, grand_total and hierarchy is not None)
+
         # Detect numeric columns
-        numeric_cols = [c for c, t in zip(df.columns, df.dtypes) if t in [pl.Int64, pl.Float64]]
+        numeric_cols = [c for c, t in zip(df.columns, df.dtypes) if t.is_numeric() and c != region_col]
 
         if not numeric_cols:
             print("⚠️ No numeric columns to aggregate.")
@@ -70,7 +120,7 @@ def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
         elif agg_method == "median":
             df_agg = df.group_by(region_col).agg([pl.col(c).median().alias(c) for c in numeric_cols])
         elif agg_method == "count":
-            df_agg = df.group_by(region_col).agg([pl.count().alias("records_count")])
+            df_agg = df.group_by(region_col).agg([pl.len().alias("records_count")])
         else:
             raise ValueError("❌ Invalid aggregation method. Use 'mean', 'sum', 'median', or 'count'.")
 
@@ -80,3 +130,85 @@ def region_based_data_aggregation(df, region_col="province", agg_method="mean"):
     except Exception as e:
         print("⚠️ Error during aggregation:", e)
         return df
+
+
+def _rollup(df, hierarchy, aggregations, agg_method, grand_total):
+    """Grouping sets (finest level, each parent level, grand total) from one partial aggregation."""
+    schema = df.collect_schema() if isinstance(df, pl.LazyFrame) else df.schema
+    if aggregations is None:
+        aggregations = {c: agg_method for c, t in schema.items() if t.is_numeric() and c not in hierarchy}
+
+    # 🧾 (output name, column, aggregation, weight column)
+    specs = []
+    for col, spec in aggregations.items():
+        many = isinstance(spec, list)
+        for one in (spec if many else [spec]):
+            kind, weight = one if isinstance(one, tuple) else (one, None)
+            if kind not in ROLLUP_AGGREGATES:
+                raise ValueError(f"❌ Invalid aggregation '{kind}' for '{col}'. Use one of: {', '.join(ROLLUP_AGGREGATES)}.")
+            if kind == "weighted_mean" and weight is None:
+                raise ValueError(f"❌ Give the weight column for '{col}': ('weighted_mean', 'population').")
+            specs.append((f"{col}_{kind}" if many else col, col, kind, weight))
+
+    # ➕ Partial aggregates at the finest level: sums, counts, max, min (all re-aggregatable)
+    partials, rollups, finals = {}, {}, []
+    for name, col, kind, weight in specs:
+        x = pl.col(col)
+        if kind in ("sum", "mean", "count"):
+            partials[f"__n_{col}"] = x.count()
+            if kind != "count":
+                partials[f"__s_{col}"] = x.sum()
+        elif kind in ("max", "min"):
+            partials[f"__{kind}_{col}"] = getattr(x, kind)()
+        elif kind == "weighted_mean":
+            valid = x.is_not_null() & pl.col(weight).is_not_null()
+            partials[f"__sxw_{col}_{weight}"] = (x * pl.col(weight)).filter(valid).sum()
+            partials[f"__sw_{col}_{weight}"] = pl.col(weight).filter(valid).sum()
+
+        if kind == "sum":
+            finals.append(pl.col(f"__s_{col}").alias(name))
+        elif kind == "mean":
+            finals.append(pl.when(pl.col(f"__n_{col}") > 0).then(pl.col(f"__s_{col}") / pl.col(f"__n_{col}")).alias(name))
+        elif kind == "count":
+            finals.append(pl.col(f"__n_{col}").alias(name))
+        elif kind in ("max", "min"):
+            finals.append(pl.col(f"__{kind}_{col}").alias(name))
+        elif kind == "weighted_mean":
+            sw = pl.col(f"__sw_{col}_{weight}")
+            finals.append(pl.when(sw != 0).then(pl.col(f"__sxw_{col}_{weight}") / sw).alias(name))
+        else:
+            finals.append(pl.col(f"__median_{col}").alias(name))
+    for key in partials:
+        rollups[key] = getattr(pl.col(key), "max" if key.startswith("__max_") else "min" if key.startswith("__min_") else "sum")()
+
+    lf = df.lazy()
+    base = lf.group_by(hierarchy).agg([e.alias(k) for k, e in partials.items()])
+    medians = sorted({col for _, col, kind, _ in specs if kind == "median"})
+
+    levels = []
+    for depth in range(len(hierarchy), -1 if grand_total else 0, -1):
+        keys = hierarchy[:depth]
+        if keys:
+            level = base.group_by(keys).agg([e.alias(k) for k, e in rollups.items()])
+        else:
+            level = base.select([e.alias(k) for k, e in rollups.items()])
+        if medians:
+            # Medians cannot be rebuilt from partials → computed from the rows for this level
+            exact = lf.group_by(keys).agg([pl.col(c).median().alias(f"__median_{c}") for c in medians]) if keys \
+                else lf.select([pl.col(c).median().alias(f"__median_{c}") for c in medians])
+            level = level.join(exact, on=keys, how="left", nulls_equal=True) if keys else pl.concat([level, exact], how="horizontal")
+        level = level.select(
+            keys
+            + [pl.lit(None, dtype=schema[c]).alias(c) for c in hierarchy[depth:]]
+            + [pl.lit(hierarchy[depth - 1] if depth else "total").alias("admin_level")]
+            + finals
+        ).sort(keys) if keys else level.select(
+            [pl.lit(None, dtype=schema[c]).alias(c) for c in hierarchy]
+            + [pl.lit("total").alias("admin_level")]
+            + finals
+        )
+        levels.append(level)
+
+    result = pl.concat(levels, how="vertical_relaxed")
+    print(f"✅ Rollup over {' → '.join(hierarchy)}{' + total' if grand_total else ''} for {len(specs)} aggregate(s).")
+    return result if isinstance(df, pl.LazyFrame) else result.collect()
@@ -0,0 +1,134 @@
+import polars as pl
+from typing import List, Optional, Union
+
+
+class RunningStats:
+    """
+    🧮 Mergeable running mean / standard deviation per group (Welford / Chan).
+
+    💡 Simple Explanation:
+    ----------------------
+    A large survey arrives in batches (files, KoBo pages, streaming chunks).
+    To score each batch against STABLE statistics, you do not need the whole
+    dataset in memory: keep, per group and column, only the count, the mean
+    and the sum of squared deviations (M2). Every batch is reduced in one
+    grouped aggregation and merged into these running moments exactly, so the
+    result equals the mean / std of all rows seen so far. Two accumulators
+    (e.g. built on two machines) can be merged the same way, and the state is a
+    small table that can be saved to Parquet and loaded again.
+
+    🧠 Example Usage:
+    -----------------
+        from huda.transformation import RunningStats, z_score_calculation
+
+        stats = RunningStats(["amount", "hh_size"], group_by=["province"])
+        for batch in batches:                      # first pass, batch by batch
+            stats.update(batch)
+        stats.save("amount_stats.parquet")
+
+        stats = RunningStats.load("amount_stats.parquet")
+        scored = z_score_calculation(new_batch, ["amount", "hh_size"],
+                                     group_by=["province"], stats=stats)
+
+    🧾 Statistics table (`stats.to_frame()`):
+    -----------------------------------------
+        ┌──────────┬───────────┬──────────────┬─────────────┐
+        │ province ┆ amount__n ┆ amount__mean ┆ amount__std │
+        ╞══════════╪═══════════╪══════════════╪═════════════╡
+        │ Kabul    ┆ 120000    ┆ 205.3        ┆ 41.2        │
+        │ Herat    ┆ 80000     ┆ 187.9        ┆ 36.8        │
+        └──────────┴───────────┴──────────────┴─────────────┘
+
+    📅 When & Why:
+    -----------------
+    ✅ Use when:
+        - Data is too large to hold at once, or arrives over time.
+    💡 Why:
+        - One pass, constant memory per group, numerically stable updates.
+    """
+
+    def __init__(self, columns: Union[str, List[str]], group_by: Optional[Union[str, List[str]]] = None):
+        self.columns = [columns] if isinstance(columns, str) else list(columns)
+        self.group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        self.state: Optional[pl.DataFrame] = None
+
+    def __repr__(self):
+        groups = 0 if self.state is None else self.state.height
+        return f"RunningStats({', '.join(self.columns)}; {groups} group(s))"
+
+    def _moments(self, df) -> pl.DataFrame:
+        """Count, mean and M2 of one batch per group (one aggregation)."""
+        exprs = []
+        for col in self.columns:
+            x = pl.col(col).cast(pl.Float64)
+            exprs += [
+                x.count().cast(pl.Int64).alias(f"{col}__n"),
+                x.mean().alias(f"{col}__mean"),
+                ((x - x.mean()) ** 2).sum().alias(f"{col}__m2"),
+            ]
+        if self.group_by:
+            moments = df.group_by(self.group_by).agg(exprs)
+        else:
+            moments = df.select(exprs)
+        return moments.collect() if isinstance(moments, pl.LazyFrame) else moments
+
+    def _combine(self, other: pl.DataFrame) -> pl.DataFrame:
+        """Chan et al. parallel merge of two moment tables."""
+        if self.state is None:
+            return other
+        if self.group_by:
+            joined = self.state.join(other, on=self.group_by, how="full", coalesce=True, suffix="__b")
+        else:
+            joined = pl.concat([self.state, other.rename({c: f"{c}__b" for c in other.columns})], how="horizontal")
+        exprs = []
+        for col in self.columns:
+            na, ma, m2a = (pl.col(f"{col}__{k}").fill_null(0) for k in ("n", "mean", "m2"))
+            nb, mb, m2b = (pl.col(f"{col}__{k}__b").fill_null(0) for k in ("n", "mean", "m2"))
+            n = na + nb
+            delta = mb - ma
+            exprs += [
+                n.alias(f"{col}__n"),
+                pl.when(n > 0).then(ma + delta * nb / n).alias(f"{col}__mean"),
+                pl.when(n > 0).then(m2a + m2b + delta ** 2 * na * nb / n).otherwise(0.0).alias(f"{col}__m2"),
+            ]
+        return joined.select(self.group_by + exprs)
+
+    def update(self, batch: Union[pl.DataFrame, pl.LazyFrame]) -> "RunningStats":
+        """Add one batch of rows."""
+        self.state = self._combine(self._moments(batch))
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge another accumulator over the same columns and groups."""
+        if other.columns != self.columns or other.group_by != self.group_by:
+            raise ValueError("❌ Only accumulators with the same columns and group_by can be merged.")
+        if other.state is not None:
+            self.state = self._combine(other.state)
+        return self
+
+    def to_frame(self) -> pl.DataFrame:
+        """Count, mean and sample standard deviation per group and column."""
+        if self.state is None:
+            raise ValueError("❌ No data yet: call update() first.")
+        exprs = []
+        for col in self.columns:
+            n = pl.col(f"{col}__n")
+            exprs += [n, pl.col(f"{col}__mean"), pl.when(n > 1).then((pl.col(f"{col}__m2") / (n - 1)).sqrt()).alias(f"{col}__std")]
+        return self.state.select(self.group_by + exprs)
+
+    def save(self, path: str) -> str:
+        """Persist the running moments (Parquet; group_by is stored as metadata)."""
+        if self.state is None:
+            raise ValueError("❌ No data yet: call update() first.")
+        self.state.write_parquet(path, metadata={"huda_group_by": ",".join(self.group_by)})
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "RunningStats":
+        """Load moments saved with `save`, ready for more updates or scoring."""
+        group_by = pl.read_parquet_metadata(path).get("huda_group_by", "")
+        state = pl.read_parquet(path)
+        columns = [c[: -len("__n")] for c in state.columns if c.endswith("__n")]
+        stats = cls(columns, group_by=[g for g in group_by.split(",") if g])
+        stats.state = state
+        return stats
@@ -2,6 +2,10 @@ import polars as pl
 import pandas as pd
 from typing import List, Dict, Union, Optional
 import io
+import warnings
+import numpy as np
+
+NORMALIZE_METHODS = ("min_max", "z_score", "rank")
 
 def severity_index_calculation(
     data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
@@ -11,7 +15,10 @@ def severity_index_calculation(
     normalize_method: str = "min_max",
     target_min: float = 1.0,
     target_max: float = 5.0,
-    reverse_indicators: Optional[List[str]] = None
+    reverse_indicators: Optional[List[str]] = None,
+    group_by: Optional[Union[str, List[str]]] = None,
+    scenarios=None,
+    return_scenarios: bool = False,
 ) -> pl.DataFrame:
     """
     🚨 Calculate a Humanitarian Severity Index
@@ -62,7 +69,11 @@ def severity_index_calculation(
 
     normalize_method : str, default="min_max"
         How the function should put all your different indicator numbers on the same scale.
-        Currently, only "min_max" is supported. This method scales numbers from 0 (least severe) to 1 (most severe).
+        - "min_max": scales numbers from 0 (least severe) to 1 (most severe).
+        - "z_score": distance from the average, in standard deviations.
+        - "rank":    position among all places, from 0 (least severe) to 1 (most severe).
+        In scenario mode you can pass a list, e.g. ["min_max", "rank"]: every weight
+        scenario is then evaluated with every method.
 
     target_min : float, default=1.0
         The smallest number you want for your final scaled severity score (e.g., 1 for a 1-5 scale, or 0 for a 0-100 scale).
@@ -75,6 +86,25 @@ def severity_index_calculation(
         For example, if "access_to_water" is an indicator, a higher percentage means less severe.
         The function will automatically flip these numbers during scaling so they fit the "higher value = worse" pattern for severity.
 
+    group_by : str | List[str], optional
+        Normalize and scale WITHIN groups (e.g. "country"): each country's
+        places are compared with each other only. Ranks are also per group.
+
+    scenarios : optional
+        Sensitivity analysis: many weighting scenarios computed at once.
+        - a 2D array / list of lists (one row per scenario, one weight per indicator),
+        - a list of weight dicts, or
+        - a DataFrame with one column per indicator (one row per scenario).
+        The indicator block is normalized once per method and ALL scenario
+        indices come from one matrix product. The output then gets, instead of
+        one index: `{output_index_col}_mean`, `_p05`, `_p95` and the rank
+        stability of each place: `_rank_median`, `_rank_min`, `_rank_max`,
+        `_rank_p05`, `_rank_p95` (rank 1 = most severe).
+
+    return_scenarios : bool, default=False
+        In scenario mode, also return every scenario's index (one column per
+        scenario): (df, scenario_scores)
+
     Returns (What you get back):
     --------
     polars.DataFrame
@@ -146,7 +176,19 @@ def severity_index_calculation(
     # │ Province D ┆ 1500          ┆ 4.0           ┆ 90               ┆ 0.3             ┆ 2024-01-01 ┆ 32.765957        │
     # └────────────┴───────────────┴───────────────┴──────────────────┴─────────────────┴────────────┴──────────────────┘
 
-    # Note: Example 3 (CSV input) and the edge cases (constant values) are omitted from the
+    print("\n--- Example 3: 1,000 weighting scenarios, ranked within each country ---")
+    import numpy as np
+    weight_matrix = np.random.dirichlet(np.ones(4), size=1000)   # 1000 x 4 weights
+    df_stability = severity_index_calculation(
+        data=data_example,
+        indicator_columns=["affected_people", "food_insecurity_score", "water_access_pct", "displacement_rate"],
+        reverse_indicators=["water_access_pct"],
+        scenarios=weight_matrix,
+        normalize_method=["min_max", "rank"],     # → 2,000 scenario indices
+    )
+    # Province B: severity_index_rank_median = 1, rank_min = rank_max = 1 → robust to the weights
+
+    # Note: Example 4 (CSV input) and the edge cases (constant values) are omitted from the
     # docstring for brevity and focus on core examples, but would be good to include in
     # a separate 'examples.py' file for the library.
 
@@ -180,11 +222,21 @@ def severity_index_calculation(
     for col in indicator_columns:
         if col not in df.columns:
             raise ValueError(f"The indicator column '{col}' was not found in your data. Please check the name.")
-        if df.schema[col] not in [pl.Int64, pl.Float64, pl.Int32, pl.Float32]:
+        if not df.schema[col].is_numeric():
             raise TypeError(f"The indicator column '{col}' must be a number type (like whole numbers or decimals). It's currently: {df.schema[col]}.")
+    reverse_indicators = reverse_indicators or []
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    methods = [normalize_method] if isinstance(normalize_method, str) else list(normalize_method)
+    for method in methods:
+        if method not in NORMALIZE_METHODS:
+            raise ValueError(f"The normalization method '{method}' is not supported. Use one of: {', '.join(NORMALIZE_METHODS)}.")
+    if scenarios is None and len(methods) > 1:
+        raise ValueError("Several normalization methods can only be compared in scenario mode (pass `scenarios`).")
 
     # --- Step 3: Prepare the weights (how important each indicator is) ---
-    if weights is None:
+    if scenarios is not None:
+        weight_matrix = _scenario_matrix(scenarios, indicator_columns)
+    elif weights is None:
         # If you didn't give any weights, all indicators are treated as equally important.
         weights = {col: 1.0 for col in indicator_columns}
     else:
@@ -192,78 +244,128 @@ def severity_index_calculation(
         if not all(col in weights for col in indicator_columns):
             raise ValueError("You provided weights, but not for all indicator columns. Please make sure every indicator column has a weight.")
         # It also makes sure your weights add up correctly (usually to 1.0). If they don't, it adjusts them.
-        weight_sum = sum(weights.values())
+        weight_sum = sum(weights[col] for col in indicator_columns)
         if weight_sum == 0:
             raise ValueError("The sum of your weights cannot be zero. Please check your weights.")
-        if weight_sum != 1.0: # Only normalize if sum is not already 1 to avoid tiny floating point errors
-            weights = {k: v / weight_sum for k, v in weights.items()}
+        weights = {col: weights[col] / weight_sum for col in indicator_columns}
 
     # --- Step 4: Put all indicator numbers on the same scale (Normalization) ---
     # This is like converting different currencies into one standard currency.
-    # For example, if "affected_people" goes from 100 to 10,000, and "food_insecurity_score" from 1 to 5,
-    # this step changes them all to be between 0 and 1.
-    normalized_cols_exprs = []
-    if normalize_method == "min_max":
-        for col in indicator_columns:
-            min_val = df[col].min() # Find the smallest number in this column
-            max_val = df[col].max() # Find the largest number in this column
-
-            if max_val == min_val:
-                # If all numbers in this column are the same, we just give it a 0.
-                normalized_cols_exprs.append(pl.lit(0.0).alias(f"{col}_normalized"))
-                continue
-
-            if reverse_indicators and col in reverse_indicators:
-                # If this indicator is one where *higher* means *less severe* (like "water access"):
-                # We flip the score so that higher original numbers become lower normalized scores (closer to 0, meaning less severe).
-                normalized_expr = (max_val - pl.col(col)) / (max_val - min_val)
-            else:
-                # For normal indicators (where higher means *more severe*):
-                # Higher numbers stay higher, scaled between 0 and 1.
-                normalized_expr = (pl.col(col) - min_val) / (max_val - min_val)
-            
-            normalized_cols_exprs.append(normalized_expr.alias(f"{col}_normalized"))
-        df = df.with_columns(normalized_cols_exprs) # Add these new normalized columns to your data
+    # All indicators of all groups are normalized in ONE pass (0 = least severe).
+    if scenarios is None:
+        normalized = _normalized_exprs(indicator_columns, methods[0], reverse_indicators, group_by)
+
+        # --- Step 5: Combine the normalized indicators into a single raw score ---
+        raw = sum(expr * weights[col] for col, expr in zip(indicator_columns, normalized))
+
+        # --- Step 6: Scale the raw score to your desired final range (e.g., 1 to 5) ---
+        # If all raw scores of a group are the same, they get the middle of your target range.
+        low, high = raw.min(), raw.max()
+        if group_by:
+            low, high = low.over(group_by), high.over(group_by)
+        scaled = (
+            pl.when(high == low)
+            .then(pl.lit((target_min + target_max) / 2.0))
+            .otherwise((raw - low) / (high - low) * (target_max - target_min) + target_min)
+        )
+        return df.with_columns(scaled.alias(output_index_col))
+
+    # --- Scenario mode: every weighting x normalization scenario in one matrix product per method ---
+    if group_by:
+        group_codes = df.select(pl.struct(group_by).rank("dense") - 1).to_series().to_numpy()
     else:
-        raise ValueError(f"The normalization method '{normalize_method}' is not supported yet. Only 'min_max' works.")
-
-    # --- Step 5: Combine the normalized indicators into a single raw score ---
-    # Now that all indicators are on the same 0-1 scale, and they have their "importance levels" (weights), the function adds them all up for each place.
-    # This gives you a "raw" severity score.
-    weighted_sum_expr = sum(
-        [
-            (pl.col(col) * weights.get(col, 1))
-            for col in indicator_columns
-            if col not in reverse_indicators
-        ]
-    )
-    
-    df = df.with_columns(weighted_sum_expr.alias("raw_severity_index"))
-
-    # --- Step 6: Scale the raw score to your desired final range (e.g., 1 to 5) ---
-    # The 'raw_severity_index' might still be on a weird scale (like 0.2 to 0.8).
-    # This step adjusts it so it fits exactly between your 'target_min' and 'target_max' (e.g., 1 to 5).
-    min_raw = df["raw_severity_index"].min()
-    max_raw = df["raw_severity_index"].max()
-
-    if max_raw == min_raw:
-        # If all raw scores are the same (very rare), we just assign the middle of your target range.
-        scaled_expr = pl.lit((target_min + target_max) / 2.0)
+        group_codes = np.zeros(df.height, dtype=np.int64)
+    order = np.argsort(group_codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(group_codes[order]) != 0])
+
+    blocks, names = [], []
+    for method in methods:
+        block = df.select(_normalized_exprs(indicator_columns, method, reverse_indicators, group_by)).to_numpy().astype(np.float64)
+        blocks.append(block @ weight_matrix.T)  # rows x scenarios
+        names += [f"{method}_{i}" if len(methods) > 1 else f"scenario_{i}" for i in range(len(weight_matrix))]
+    raw = np.hstack(blocks)
+
+    # Scale every scenario to the target range (per group), vectorized over scenarios
+    sorted_raw = raw[order]
+    low = np.fmin.reduceat(sorted_raw, starts, axis=0)
+    high = np.fmax.reduceat(sorted_raw, starts, axis=0)
+    group_of_row = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+    span = (high - low)[group_of_row]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores_sorted = np.where(
+            span == 0, (target_min + target_max) / 2.0,
+            (sorted_raw - low[group_of_row]) / span * (target_max - target_min) + target_min,
+        )
+
+    # Ranks per group (1 = most severe), all scenarios at once
+    ranks_sorted = np.empty_like(scores_sorted)
+    for start, end in zip(starts, np.r_[starts[1:], len(order)]):
+        keyed = np.where(np.isnan(scores_sorted[start:end]), -np.inf, scores_sorted[start:end])
+        ranks_sorted[start:end] = np.argsort(np.argsort(-keyed, axis=0, kind="stable"), axis=0) + 1
+    scores, ranks = np.empty_like(scores_sorted), np.empty_like(ranks_sorted)
+    scores[order], ranks[order] = scores_sorted, ranks_sorted
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # rows with missing indicators → null
+        summary = [np.nanmean(scores, axis=1), np.nanpercentile(scores, 5, axis=1), np.nanpercentile(scores, 95, axis=1)]
+    out = df.with_columns([
+        pl.Series(f"{output_index_col}_mean", summary[0]),
+        pl.Series(f"{output_index_col}_p05", summary[1]),
+        pl.Series(f"{output_index_col}_p95", summary[2]),
+        pl.Series(f"{output_index_col}_rank_median", np.median(ranks, axis=1)),
+        pl.Series(f"{output_index_col}_rank_min", ranks.min(axis=1)),
+        pl.Series(f"{output_index_col}_rank_max", ranks.max(axis=1)),
+        pl.Series(f"{output_index_col}_rank_p05", np.percentile(ranks, 5, axis=1)),
+        pl.Series(f"{output_index_col}_rank_p95", np.percentile(ranks, 95, axis=1)),
+    ]).with_columns(pl.col(f"^{output_index_col}_(mean|p05|p95)$").fill_nan(None))
+    print(f"✅ Severity index computed for {raw.shape[1]} scenarios ({len(weight_matrix)} weightings x {len(methods)} normalization(s))")
+    if return_scenarios:
+        return out, pl.DataFrame(scores, schema=names).fill_nan(None)
+    return out
+
+
+def _normalized_exprs(indicator_columns, method, reverse_indicators, group_by):
+    """One expression per indicator: normalized so that 0 = least severe (constant → 0)."""
+    exprs = []
+    for col in indicator_columns:
+        x = pl.col(col).cast(pl.Float64)
+        if method == "min_max":
+            low, high = x.min(), x.max()
+            spread = high - low
+            value = (x - low) / spread
+            reversed_value = (high - x) / spread
+        elif method == "z_score":
+            spread = x.std()
+            value = (x - x.mean()) / spread
+            reversed_value = -value
+        else:
+            spread = x.count() - 1
+            value = (x.rank("average") - 1) / spread
+            reversed_value = 1 - value
+        if group_by:
+            spread = spread.over(group_by)
+            value = value.over(group_by)
+            reversed_value = reversed_value.over(group_by)
+        value = reversed_value if col in reverse_indicators else value
+        exprs.append(pl.when((spread == 0).fill_null(True)).then(0.0).otherwise(value).alias(col))
+    return exprs
+
+
+def _scenario_matrix(scenarios, indicator_columns) -> np.ndarray:
+    """Scenarios (array, list of dicts or DataFrame) → weights matrix, each row summing to 1."""
+    if isinstance(scenarios, pl.DataFrame):
+        matrix = scenarios.select(indicator_columns).to_numpy()
+    elif len(scenarios) and isinstance(scenarios[0], dict):
+        matrix = np.array([[s[col] for col in indicator_columns] for s in scenarios])
     else:
-        # This formula smoothly stretches or shrinks the raw scores to fit your target range.
-        scaled_expr = (
-            (pl.col("raw_severity_index") - min_raw) / (max_raw - min_raw)
-        ) * (target_max - target_min) + target_min
-    
-    df = df.with_columns(scaled_expr.alias(output_index_col))
-
-    # --- Step 7: Clean up (remove temporary columns) ---
-    # We remove the temporary "_normalized" columns and the "raw_severity_index" column
-    # because the user usually only wants the final "severity_index" column.
-    normalized_temp_cols = [f"{col}_normalized" for col in indicator_columns]
-    df = df.drop(normalized_temp_cols + ["raw_severity_index"])
-
-    return df
+        matrix = np.asarray(scenarios)
+    matrix = np.atleast_2d(matrix.astype(np.float64))
+    if matrix.shape[1] != len(indicator_columns):
+        raise ValueError(f"Each scenario needs {len(indicator_columns)} weights (one per indicator), got {matrix.shape[1]}.")
+    sums = matrix.sum(axis=1, keepdims=True)
+    if (sums == 0).any():
+        raise ValueError("The weights of a scenario cannot sum to zero. Please check your scenarios.")
+    return matrix / sums
 
 # ----------------------------------------------------------------------------------
 
@@ -5,10 +5,12 @@ import io
 
 def z_score_calculation(
     data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
-    column: str,
+    column: Union[str, List[str]],
     threshold: float = 3.0,
     group_by: Optional[List[str]] = None,
-    add_flag: bool = True
+    add_flag: bool = True,
+    method: str = "standard",
+    stats=None,
 ) -> pl.DataFrame:
     """
     📊 Calculate Z-Scores for Anomaly Detection
@@ -44,8 +46,9 @@ def z_score_calculation(
     data : str | pandas.DataFrame | polars.DataFrame | io.BytesIO  
         Input dataset (file path, dataframe, or file bytes)
 
-    column : str  
-        Name of the numeric column to analyze.
+    column : str | list of str  
+        Name of the numeric column to analyze, or several columns at once
+        (then scored in one pass into `<column>_zscore` / `<column>_is_anomaly`).
 
     threshold : float, default = 3.0  
         The z-score cutoff for flagging anomalies.  
@@ -59,6 +62,21 @@ def z_score_calculation(
     add_flag : bool, default = True  
         Whether to add a boolean “is_anomaly” column.
 
+    method : str, default = "standard"  
+        - "standard" → (value - mean) / standard deviation  
+        - "robust"   → (value - median) / (1.4826 × MAD), where MAD is the median
+          absolute deviation. A few extreme values barely move the median and
+          MAD, so they cannot hide themselves (or each other) as they do with
+          mean / std. When more than half the values are equal (MAD = 0), the
+          scale falls back to 1.253314 × mean absolute deviation; a constant
+          group gets a null z-score.
+
+    stats : RunningStats, optional  
+        Score against saved running statistics (mean / std per group built
+        batch by batch with `RunningStats`) instead of the statistics of `data`.
+        Lets you score streamed batches against stable group statistics
+        without a second full pass. Only with method="standard".
+
     🕒 When to Use:
     ---------------
     - Detecting abnormal values in survey or operational data  
@@ -108,6 +126,17 @@ def z_score_calculation(
 
     This will calculate z-scores **within each province group** separately.
 
+    🧾 Robust, several columns, and batches against running statistics:
+    --------------------------------------------------------------------
+    ```python
+    result = z_score_calculation(df, ["amount", "hh_size"], method="robust")
+
+    stats = RunningStats(["amount"], group_by=["province"])
+    for batch in batches:
+        stats.update(batch)
+    scored = z_score_calculation(next_batch, "amount", group_by=["province"], stats=stats)
+    ```
+
     🔒 Returns:
     ------------
     pl.DataFrame – same as input but with:
@@ -127,26 +156,56 @@ def z_score_calculation(
     else:
         raise TypeError("Unsupported data type.")
 
-    # --- 2. Ensure numeric column exists ---
-    if column not in df.columns:
-        raise ValueError(f"Column '{column}' not found in dataset.")
-
-    # --- 3. Calculate z-scores ---
-    if group_by:
-        df = df.with_columns([
-            ((pl.col(column) - pl.col(column).mean().over(group_by)) /
-             pl.col(column).std().over(group_by)).alias("zscore")
-        ])
+    # --- 2. Ensure numeric columns exist ---
+    columns = [column] if isinstance(column, str) else list(column)
+    for col in columns:
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found in dataset.")
+    if method not in ("standard", "robust"):
+        raise ValueError("Parameter 'method' must be 'standard' or 'robust'.")
+    if stats is not None and method != "standard":
+        raise ValueError("Running statistics only support method='standard' (median / MAD cannot be merged exactly).")
+    group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+
+    def output(col, name):
+        return name if isinstance(column, str) else f"{col}_{name}"
+
+    # --- 3. Calculate z-scores (all columns in one pass) ---
+    if stats is not None:
+        # Centre and scale come from the running statistics of each group
+        if stats.group_by != group_by:
+            raise ValueError(f"The running statistics are grouped by {stats.group_by}, not {group_by}.")
+        reference = stats.to_frame().select(
+            group_by + [pl.col(f"{c}__{k}").alias(f"__{k}_{c}") for c in columns for k in ("mean", "std")]
+        )
+        df = df.join(reference, on=group_by, how="left", maintain_order="left") if group_by else df.join(reference, how="cross")
+        centres = {c: pl.col(f"__mean_{c}") for c in columns}
+        scales = {c: pl.col(f"__std_{c}") for c in columns}
     else:
-        df = df.with_columns([
-            ((pl.col(column) - pl.col(column).mean()) /
-             pl.col(column).std()).alias("zscore")
-        ])
+        centres, scales = {}, {}
+        for col in columns:
+            x = pl.col(col)
+            if method == "robust":
+                centre = x.median().over(group_by) if group_by else x.median()
+                mad = (x - centre).abs().median() * 1.4826
+                # MAD = 0 (over half the values equal) → mean absolute deviation; all equal → null
+                meanad = (x - centre).abs().mean() * 1.253314
+                scale = pl.when(mad > 0).then(mad).when(meanad > 0).then(meanad)
+            else:
+                centre, scale = x.mean(), x.std()
+            centres[col] = centre.over(group_by) if group_by and method == "standard" else centre
+            scales[col] = scale.over(group_by) if group_by else scale
+
+    df = df.with_columns([
+        ((pl.col(col) - centres[col]) / scales[col]).alias(output(col, "zscore")) for col in columns
+    ])
+    if stats is not None:
+        df = df.drop([f"__{k}_{c}" for c in columns for k in ("mean", "std")])
 
     # --- 4. Optional anomaly flag ---
     if add_flag:
-        df = df.with_columns(
-            (pl.col("zscore").abs() > threshold).alias("is_anomaly")
-        )
+        df = df.with_columns([
+            (pl.col(output(col, "zscore")).abs() > threshold).alias(output(col, "is_anomaly")) for col in columns
+        ])
 
     return df
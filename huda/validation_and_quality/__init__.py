@@ -6,6 +6,7 @@ from .targeted_vs_reached_inconsistency_detection import targeted_vs_reached_inc
 from .generate_summary_statistics_per_dataset import generate_summary_statistics_per_dataset
 from .humanatarian_index_validation_against_standards import humanatarian_index_validation_against_standards
 from .automatic_data_profiling_report import automatic_data_profiling_report
+from .streaming_profiling_report import StreamingProfiler, streaming_profiling_report
 
 
 __all__ = [
@@ -17,5 +18,7 @@ __all__ = [
     "generate_summary_statistics_per_dataset",
     "humanatarian_index_validation_against_standards",
     "automatic_data_profiling_report",
+    "StreamingProfiler",
+    "streaming_profiling_report",
 
 ]
@@ -1,12 +1,25 @@
 import polars as pl
 import pandas as pd
-from typing import Union, Dict
+from typing import Union, Dict, Optional
 import io
+from ..cleaning.lazy_io import sample_data
 
+# Quantiles reported in `numeric_details`
+_QUANTILES = {"q01": 0.01, "q05": 0.05, "q25": 0.25, "q50": 0.50, "q75": 0.75, "q95": 0.95}
+
+# Non-null values per text column tried as dates before parsing the whole column
+_DATE_PROBE_ROWS = 1000
+
+_SUMMARY_SCHEMA = {
+    "column": pl.Utf8, "dtype": pl.Utf8, "count": pl.Int64, "null_count": pl.Int64, "unique_count": pl.Int64,
+    "min": pl.Float64, "max": pl.Float64, "mean": pl.Float64, "median": pl.Float64, "std": pl.Float64,
+}
 
 def automatic_data_profiling_report(
-    data: Union[str, pd.DataFrame, pl.DataFrame, io.BytesIO],
+    data: Union[str, pd.DataFrame, pl.DataFrame, pl.LazyFrame, io.BytesIO],
     top_k: int = 10,
+    sample: Optional[Union[int, float]] = None,
+    seed: Optional[int] = None,
 ) -> Dict[str, pl.DataFrame]:
     """
     Create an automatic data profiling report with multiple tidy tables.
@@ -26,12 +39,24 @@ def automatic_data_profiling_report(
     - Surfaces missingness, ranges, and dominant categories early.
     - Guides cleaning (imputation, capping) and indicator selection.
 
+    How it runs:
+    - All statistics of all columns (counts, uniques, moments, quantiles, top-k,
+      date ranges) are computed in ONE combined `select`, which Polars evaluates
+      in parallel across columns: one pass over the data instead of several per column.
+    - Date-like text columns are detected on a small probe of each column and
+      parsed together, without copying the frame.
+    - `sample` profiles a random subset for a quick preview of very large tables.
+
     Where to apply:
     - Afghanistan assessments and activity tracking (e.g., Kabul/Herat/Balkh surveys).
 
     Parameters:
-    - data: CSV path, pandas.DataFrame, polars.DataFrame, or CSV bytes.
+    - data: CSV path, pandas.DataFrame, polars.DataFrame / LazyFrame, or CSV bytes.
     - top_k: number of most frequent categories to report per categorical column.
+    - sample: profile only a random sample: a number of rows (e.g. 100_000) or a
+      fraction in (0, 1] (e.g. 0.05). A CSV path or LazyFrame is sampled before it
+      is collected. Counts and frequencies then describe the sample.
+    - seed: random seed for reproducible samples.
 
     Returns:
     - dict[str, pl.DataFrame] with keys:
@@ -53,6 +78,7 @@ def automatic_data_profiling_report(
     })
 
     report = automatic_data_profiling_report(df)
+    preview = automatic_data_profiling_report("msna_2025.csv", sample=100_000, seed=1)
     for name, tbl in report.items():
         print(f"\n=== {name} ===")
         print(tbl)
@@ -94,117 +120,102 @@ def automatic_data_profiling_report(
     │ assessment_date ┆ 2025-05-01 ┆ 2025-05-04 │
     └─────────────────┴────────────┴────────────┘
     """
-    # Normalize input
+    # Normalize input (files and LazyFrames stay lazy until after sampling)
     if isinstance(data, str):
-        df = pl.read_csv(data)
+        lf = pl.scan_csv(data)
     elif isinstance(data, io.BytesIO):
-        df = pl.read_csv(data)
+        lf = pl.read_csv(data).lazy()
     elif isinstance(data, pd.DataFrame):
-        df = pl.from_pandas(data)
-    elif isinstance(data, pl.DataFrame):
-        df = data
+        lf = pl.from_pandas(data).lazy()
+    elif isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+        lf = data.lazy()
     else:
         raise TypeError("Unsupported data type")
 
+    # Quick preview: a random sample (fraction in (0, 1] or number of rows), drawn
+    # inside the lazy plan so only the sample is read into memory
+    if sample is not None:
+        lf = sample_data(lf, sample, seed=seed)
+    df = lf.collect(engine="streaming")
+
     n_rows = df.height
 
-    # Detect types
-    numeric_types = {
-        pl.Int8, pl.Int16, pl.Int32, pl.Int64,
-        pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
-        pl.Float32, pl.Float64
-    }
+    # Detect date-like text columns on a small probe, then parse them all in one pass
+    parse_cols = _date_like_columns(df)
+    df_cast = df.with_columns([pl.col(c).str.strptime(pl.Date, strict=False) for c in parse_cols]) if parse_cols else df
+    datetime_cols = [c for c, t in df_cast.schema.items() if t == pl.Date or isinstance(t, pl.Datetime)]
+
+    numeric_cols = [c for c, t in df_cast.schema.items() if t.is_numeric()]
+    categorical_cols = [c for c in df_cast.columns if c not in numeric_cols and c not in datetime_cols]
 
-    # Try to parse datelike strings into Date for profiling
-    df_cast = df.clone()
-    datetime_cols: list[str] = []
+    # ONE select computes every statistic; Polars evaluates the expressions in parallel
+    exprs = []
     for c in df_cast.columns:
-        s = df_cast.get_column(c)
-        # Try parsing only if Utf8 and looks date-like in some rows
-        if s.dtype == pl.Utf8:
-            try:
-                parsed = pl.Series(c, pl.Series(s).str.strptime(pl.Date, strict=False))
-                if parsed.drop_nulls().len() > 0:
-                    df_cast = df_cast.with_columns(parsed)
-                    datetime_cols.append(c)
-            except Exception:
-                pass
-        elif s.dtype in (pl.Date, pl.Datetime):
-            datetime_cols.append(c)
+        x = pl.col(c)
+        exprs += [x.null_count().alias(f"{c}\x00null_count"), x.n_unique().alias(f"{c}\x00unique_count")]
+    for c in numeric_cols:
+        x = pl.col(c)
+        exprs += [
+            x.min().cast(pl.Float64).alias(f"{c}\x00min"),
+            x.max().cast(pl.Float64).alias(f"{c}\x00max"),
+            x.mean().alias(f"{c}\x00mean"),
+            x.median().cast(pl.Float64).alias(f"{c}\x00median"),
+            x.std().alias(f"{c}\x00std"),
+        ]
+        exprs += [
+            x.quantile(q, interpolation="nearest").cast(pl.Float64).alias(f"{c}\x00{name}")
+            for name, q in _QUANTILES.items()
+        ]
+    for c in datetime_cols:
+        exprs += [pl.col(c).min().alias(f"{c}\x00min_date"), pl.col(c).max().alias(f"{c}\x00max_date")]
+    for c in categorical_cols:
+        # Nested values (lists from KoBo select_multiple, structs) are counted as they
+        # are and shown as text afterwards: they cannot be cast to Utf8
+        x = pl.col(c) if df_cast.schema[c].is_nested() else pl.col(c).cast(pl.Utf8)
+        exprs.append(x.value_counts(sort=True, name="count").head(top_k).implode().alias(f"{c}\x00top"))
+    stats = df_cast.select(exprs).row(0, named=True) if exprs else {}
+
+    def stat(c, name):
+        return stats.get(f"{c}\x00{name}")
 
     # Summary per column
     rows = []
-    for col in df_cast.columns:
-        s = df_cast.get_column(col)
-        dtype = s.dtype
-        null_count = s.null_count()
-        unique_count = s.n_unique()
-        count = n_rows - null_count
-        if dtype in numeric_types:
-            agg = df_cast.select(
-                pl.col(col).min().alias("min"),
-                pl.col(col).max().alias("max"),
-                pl.col(col).mean().alias("mean"),
-                pl.col(col).median().alias("median"),
-                pl.col(col).std().alias("std"),
-            ).row(0)
-            min_v, max_v, mean_v, median_v, std_v = agg
-        else:
-            min_v = max_v = mean_v = median_v = std_v = None
+    for col, dtype in df_cast.schema.items():
+        null_count = stat(col, "null_count")
         rows.append({
             "column": col,
             "dtype": str(dtype),
-            "count": count,
+            "count": n_rows - null_count,
             "null_count": null_count,
-            "unique_count": unique_count,
-            "min": min_v,
-            "max": max_v,
-            "mean": mean_v,
-            "median": median_v,
-            "std": std_v,
+            "unique_count": stat(col, "unique_count"),
+            "min": stat(col, "min"),
+            "max": stat(col, "max"),
+            "mean": stat(col, "mean"),
+            "median": stat(col, "median"),
+            "std": stat(col, "std"),
         })
-
-    summary_per_column = pl.DataFrame(rows)
+    summary_per_column = pl.DataFrame(rows, schema=_SUMMARY_SCHEMA)
 
     # Numeric details with quantiles
-    numeric_cols = [c for c in df_cast.columns if df_cast.get_column(c).dtype in numeric_types]
-    numeric_tables = []
-    for c in numeric_cols:
-        q = df_cast.select([
-            pl.col(c).quantile(0.01, interpolation="nearest").alias("q01"),
-            pl.col(c).quantile(0.05, interpolation="nearest").alias("q05"),
-            pl.col(c).quantile(0.25, interpolation="nearest").alias("q25"),
-            pl.col(c).quantile(0.50, interpolation="nearest").alias("q50"),
-            pl.col(c).quantile(0.75, interpolation="nearest").alias("q75"),
-            pl.col(c).quantile(0.95, interpolation="nearest").alias("q95"),
-        ])
-        numeric_tables.append(q.with_columns(pl.lit(c).alias("column")).select(["column", "q01", "q05", "q25", "q50", "q75", "q95"]))
-    numeric_details = pl.concat(numeric_tables, how="vertical") if numeric_tables else pl.DataFrame({"column": [], "q01": [], "q05": [], "q25": [], "q50": [], "q75": [], "q95": []})
+    numeric_details = pl.DataFrame(
+        [{"column": c, **{name: stat(c, name) for name in _QUANTILES}} for c in numeric_cols],
+        schema={"column": pl.Utf8, **{name: pl.Float64 for name in _QUANTILES}},
+    )
 
     # Categorical details: top-k frequencies
-    categorical_cols = [
-        c for c in df_cast.columns
-        if (df_cast.get_column(c).dtype not in numeric_types) and (c not in datetime_cols)
+    cat_rows = [
+        {"column": c, "value": _as_text(item[c]), "count": item["count"], "freq": item["count"] / n_rows}
+        for c in categorical_cols
+        for item in (stat(c, "top") or [])
     ]
-    cat_tables = []
-    for c in categorical_cols:
-        freq = df_cast.group_by(c).agg(pl.len().alias("count")).sort("count", descending=True).with_columns((pl.col("count") / n_rows).alias("freq")).head(top_k)
-        if freq.height:
-            # Rename value column to 'value'
-            freq = freq.rename({c: "value"})
-            freq = freq.with_columns(pl.lit(c).alias("column")).select(["column", "value", "count", "freq"])
-            cat_tables.append(freq)
-    categorical_details = pl.concat(cat_tables, how="vertical") if cat_tables else pl.DataFrame({"column": [], "value": [], "count": [], "freq": []})
+    categorical_details = pl.DataFrame(
+        cat_rows, schema={"column": pl.Utf8, "value": pl.Utf8, "count": pl.Int64, "freq": pl.Float64}
+    )
 
     # Datetime details
-    dt_tables = []
-    for c in datetime_cols:
-        dt = df_cast.select([
-            pl.col(c).min().alias("min_date"),
-            pl.col(c).max().alias("max_date"),
-        ])
-        dt_tables.append(dt.with_columns(pl.lit(c).alias("column")).select(["column", "min_date", "max_date"]))
-    datetime_details = pl.concat(dt_tables, how="vertical") if dt_tables else pl.DataFrame({"column": [], "min_date": [], "max_date": []})
+    datetime_details = pl.DataFrame(
+        [{"column": c, "min_date": stat(c, "min_date"), "max_date": stat(c, "max_date")} for c in datetime_cols]
+    ) if datetime_cols else pl.DataFrame({"column": [], "min_date": [], "max_date": []})
 
     return {
         "summary_per_column": summary_per_column,
@@ -212,3 +223,24 @@ def automatic_data_profiling_report(
         "categorical_details": categorical_details,
         "datetime_details": datetime_details,
     }
+
+
+def _as_text(value):
+    """Top-k value as text (nested values arrive as Python lists / dicts)."""
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _date_like_columns(df: pl.DataFrame) -> list:
+    """Text columns whose first non-null values parse as dates (probe of `_DATE_PROBE_ROWS` per column)."""
+    text_cols = [c for c, t in df.schema.items() if t == pl.Utf8]
+    if not text_cols:
+        return []
+    probe = df.select([pl.col(c).drop_nulls().head(_DATE_PROBE_ROWS).implode() for c in text_cols]).row(0)
+    date_cols = []
+    for c, values in zip(text_cols, probe):
+        try:
+            if values and pl.Series(c, values).str.strptime(pl.Date, strict=False).drop_nulls().len() > 0:
+                date_cols.append(c)
+        except Exception:
+            pass
+    return date_cols
@@ -0,0 +1,370 @@
+import copy
+import numpy as np
+import polars as pl
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from ..cleaning.lazy_io import scan_data
+from ..transformation.aggregate_cube import _hll_ranks, _hll_estimate, _stable_hash
+from ..transformation.running_stats import RunningStats
+from .automatic_data_profiling_report import _QUANTILES, _SUMMARY_SCHEMA, _date_like_columns
+
+
+class _QuantileSketch:
+    """
+    KLL-style quantile sketch: a stack of compactors where level h keeps items of
+    weight 2**h. A full level is sorted and every other item (random offset) is
+    promoted, so memory stays around 3·k values whatever the number of rows.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "_QuantileSketch"):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level
+                self.levels[level] = items[len(items) - len(items) % 2:]
+                promoted = items[: len(items) - len(items) % 2][self.rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, qs: List[float]) -> List[Optional[float]]:
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return [None] * len(qs)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        ranks = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side="left")
+        return [float(v) for v in values[order][np.minimum(ranks, len(values) - 1)]]
+
+
+class _HeavyHitters:
+    """
+    Misra–Gries frequent-items summary: at most `capacity` counters; counts are
+    lower bounds off by at most rows / (capacity + 1), and summaries merge exactly.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = pl.DataFrame(schema={"value": pl.Utf8, "count": pl.Int64})
+
+    def update(self, counts: pl.DataFrame):
+        counts = pl.concat([self.counts, counts]).group_by("value").agg(pl.col("count").sum()).sort("count", descending=True)
+        if counts.height > self.capacity:
+            # Subtract the (capacity+1)-th count from every counter, keep what stays positive
+            threshold = counts["count"][self.capacity]
+            counts = counts.head(self.capacity).with_columns(pl.col("count") - threshold).filter(pl.col("count") > 0)
+        self.counts = counts
+
+    def top(self, k: int) -> pl.DataFrame:
+        return self.counts.sort(["count", "value"], descending=[True, False], nulls_last=True).head(k)
+
+
+class StreamingProfiler:
+    """
+    Profile a dataset batch by batch with bounded memory (mergeable sketches).
+
+    What this does:
+    - Reads a source in batches and keeps, per column, small summaries that can be
+      updated and merged instead of the data itself:
+      - exact: row / null counts, min / max, mean and std (running moments)
+      - HyperLogLog: approximate distinct counts (≈1.6% error, 4 KB per column)
+      - KLL quantile sketch: median and quantiles (≈1% rank error)
+      - Misra–Gries heavy hitters: top-k categories with their counts
+    - `report()` returns the same tables as `automatic_data_profiling_report`.
+
+    When to use:
+    - Multi-year archives, or anything larger than memory (100 GB on a laptop).
+    - Profiles built on several machines / per year and merged with `merge()`.
+
+    Why important:
+    - Memory depends on the number of columns, not the number of rows.
+
+    Where to apply:
+    - Afghanistan multi-year 5W / distribution archives, KoBo exports split in files.
+
+    Parameters:
+    - top_k: number of most frequent categories to report per categorical column.
+    - precision: HyperLogLog precision (2**precision registers per column).
+    - quantile_k: KLL accuracy parameter (larger → more accurate, more memory).
+    - heavy_hitters: counters kept per categorical column (default 10 × top_k).
+    - seed: random seed of the quantile sketches (reproducible reports).
+
+    Afghanistan example:
+    ```python
+    from huda.validation_and_quality import StreamingProfiler
+
+    profiler = StreamingProfiler(top_k=10)
+    profiler.update_from("archive/distributions_*.parquet", batch_size=200_000)
+    profiler.update_from(open_csv(path) for path in monthly_csv_files)
+    report = profiler.report()
+    print(report["summary_per_column"])
+    ```
+    """
+
+    def __init__(
+        self,
+        top_k: int = 10,
+        precision: int = 12,
+        quantile_k: int = 200,
+        heavy_hitters: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.top_k = top_k
+        self.precision = precision
+        self.quantile_k = quantile_k
+        self.capacity = heavy_hitters or max(100, 10 * top_k)
+        self.seed = seed
+        self.rows = 0
+        self.schema: Dict[str, pl.DataType] = {}
+        self.date_columns: List[str] = []
+        self.columns: Dict[str, dict] = {}
+        self.moments: Optional[RunningStats] = None
+
+    def __repr__(self):
+        return f"StreamingProfiler({len(self.columns)} columns, {self.rows} rows)"
+
+    def _start(self, batch: pl.DataFrame):
+        """Column kinds and sketches, from the first batch."""
+        self.date_columns = _date_like_columns(batch)
+        parsed = [pl.col(c).str.strptime(pl.Date, strict=False) for c in self.date_columns]
+        self.schema = dict((batch.with_columns(parsed) if parsed else batch).schema)
+        for col, dtype in self.schema.items():
+            if dtype.is_numeric():
+                kind = "numeric"
+            elif dtype == pl.Date or isinstance(dtype, pl.Datetime):
+                kind = "datetime"
+            else:
+                kind = "categorical"
+            self.columns[col] = {
+                "kind": kind,
+                "nulls": 0,
+                "min": None,
+                "max": None,
+                "registers": np.zeros(1 << self.precision, dtype=np.uint8),
+                "quantiles": _QuantileSketch(self.quantile_k, self.seed) if kind == "numeric" else None,
+                "top": _HeavyHitters(self.capacity) if kind == "categorical" else None,
+            }
+        numeric = [c for c, s in self.columns.items() if s["kind"] == "numeric"]
+        self.moments = RunningStats(numeric) if numeric else None
+
+    def _conform(self, batch: pl.DataFrame) -> pl.DataFrame:
+        """
+        Bring a batch to the first batch's columns (schema drift between files is normal):
+        numerics → Float64 and categories → text (same hashes in every batch), dates parsed,
+        values that do not convert ("n/a" in a numeric column) → null, missing columns → null,
+        extra columns dropped.
+        """
+        exprs = []
+        for col, dtype in self.schema.items():
+            kind = self.columns[col]["kind"]
+            target = pl.Float64 if kind == "numeric" else (dtype if kind == "datetime" else pl.Utf8)
+            if col not in batch.columns:
+                exprs.append(pl.lit(None, dtype=target).alias(col))
+            elif kind == "datetime" and batch.schema[col] == pl.Utf8:
+                exprs.append(pl.col(col).str.strptime(target, strict=False))
+            else:
+                exprs.append(pl.col(col).cast(target, strict=False))
+        return batch.select(exprs)
+
+    def update(self, batch: Union[pl.DataFrame, pd.DataFrame]) -> "StreamingProfiler":
+        """Add one batch of rows."""
+        if isinstance(batch, pd.DataFrame):
+            batch = pl.from_pandas(batch)
+        if not self.columns:
+            self._start(batch)
+        raw, batch = batch, self._conform(batch)
+        self.rows += batch.height
+
+        # Exact counts and ranges of every column in one select
+        ranged = [c for c in batch.columns if self.columns[c]["kind"] != "categorical"]
+        stats = batch.select(
+            [pl.col(c).null_count().alias(f"{c}\x00nulls") for c in batch.columns]
+            + [pl.col(c).min().alias(f"{c}\x00min") for c in ranged]
+            + [pl.col(c).max().alias(f"{c}\x00max") for c in ranged]
+        ).row(0, named=True)
+        if self.moments is not None:
+            self.moments.update(batch.select(self.moments.columns))
+
+        for col in batch.columns:
+            sketch = self.columns[col]
+            sketch["nulls"] += stats[f"{col}\x00nulls"]
+            if col in ranged:
+                low, high = stats[f"{col}\x00min"], stats[f"{col}\x00max"]
+                if low is not None:
+                    sketch["min"] = low if sketch["min"] is None else min(sketch["min"], low)
+                    sketch["max"] = high if sketch["max"] is None else max(sketch["max"], high)
+            values = batch[col].drop_nulls()
+            # Integer IDs are hashed as they came (Float64 would merge ids above 2**53)
+            exact = raw[col].drop_nulls() if col in raw.columns and raw.schema[col].is_integer() else values
+            registers, ranks = _hll_ranks(_stable_hash(exact), self.precision)
+            np.maximum.at(sketch["registers"], registers, ranks)
+            if sketch["quantiles"] is not None:
+                sketch["quantiles"].update(values.to_numpy())
+            if sketch["top"] is not None:
+                counts = batch[col].value_counts(name="count").rename({col: "value"})
+                sketch["top"].update(counts.with_columns(pl.col("count").cast(pl.Int64)))
+        return self
+
+    def update_from(self, source, batch_size: int = 100_000) -> "StreamingProfiler":
+        """
+        Add every batch of a source:
+        - a file path or glob (Parquet / CSV / IPC, read in `batch_size` batches by the streaming engine)
+        - a LazyFrame (e.g. a filtered scan), a DataFrame (sliced)
+        - an iterable of any of these, e.g. `open_csv(f) for f in files` (None entries are skipped)
+        """
+        batches = 0
+        for batch in _iter_batches(source, batch_size):
+            self.update(batch)
+            batches += 1
+        print(f"✅ Profiled {batches} batch(es), {self.rows} rows so far")
+        return self
+
+    def merge(self, other: "StreamingProfiler") -> "StreamingProfiler":
+        """Merge a profile of other rows with the same columns (e.g. built per year, in parallel)."""
+        if not other.columns:
+            return self
+        if not self.columns:
+            # A copy: later updates of either profiler must not change the other
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if list(other.columns) != list(self.columns) or other.precision != self.precision:
+            raise ValueError("❌ Only profiles with the same columns and precision can be merged.")
+        self.rows += other.rows
+        if self.moments is not None:
+            self.moments.merge(other.moments)
+        for col, sketch in self.columns.items():
+            theirs = other.columns[col]
+            sketch["nulls"] += theirs["nulls"]
+            for bound, pick in (("min", min), ("max", max)):
+                values = [v for v in (sketch[bound], theirs[bound]) if v is not None]
+                sketch[bound] = pick(values) if values else None
+            np.maximum(sketch["registers"], theirs["registers"], out=sketch["registers"])
+            if sketch["quantiles"] is not None:
+                sketch["quantiles"].merge(theirs["quantiles"])
+            if sketch["top"] is not None:
+                sketch["top"].update(theirs["top"].counts)
+        return self
+
+    def report(self) -> Dict[str, pl.DataFrame]:
+        """
+        The profile as the tables of `automatic_data_profiling_report`:
+        "summary_per_column", "numeric_details", "categorical_details", "datetime_details".
+        unique_count, median, quantiles and top-k counts are estimates.
+        """
+        moments = {}
+        if self.moments is not None and self.moments.state is not None:
+            moments = self.moments.to_frame().row(0, named=True)
+
+        rows, numeric_rows, cat_rows, dt_rows = [], [], [], []
+        for col, sketch in self.columns.items():
+            nulls = sketch["nulls"]
+            distinct = int(_hll_estimate(sketch["registers"])[0]) + (1 if nulls else 0)
+            row = {
+                "column": col,
+                "dtype": str(self.schema[col]),
+                "count": self.rows - nulls,
+                "null_count": nulls,
+                "unique_count": distinct,
+                "min": None, "max": None, "mean": None, "median": None, "std": None,
+            }
+            if sketch["kind"] == "numeric":
+                estimates = sketch["quantiles"].quantiles([0.5] + list(_QUANTILES.values()))
+                row.update({
+                    "min": sketch["min"], "max": sketch["max"], "median": estimates[0],
+                    "mean": moments.get(f"{col}__mean"), "std": moments.get(f"{col}__std"),
+                })
+                numeric_rows.append({"column": col, **dict(zip(_QUANTILES, estimates[1:]))})
+            elif sketch["kind"] == "datetime":
+                dt_rows.append({"column": col, "min_date": sketch["min"], "max_date": sketch["max"]})
+            else:
+                for value, count in sketch["top"].top(self.top_k).iter_rows():
+                    cat_rows.append({"column": col, "value": value, "count": count, "freq": count / self.rows})
+            rows.append(row)
+
+        return {
+            "summary_per_column": pl.DataFrame(rows, schema=_SUMMARY_SCHEMA),
+            "numeric_details": pl.DataFrame(
+                numeric_rows, schema={"column": pl.Utf8, **{name: pl.Float64 for name in _QUANTILES}}
+            ),
+            "categorical_details": pl.DataFrame(
+                cat_rows, schema={"column": pl.Utf8, "value": pl.Utf8, "count": pl.Int64, "freq": pl.Float64}
+            ),
+            "datetime_details": pl.DataFrame(dt_rows) if dt_rows else pl.DataFrame({"column": [], "min_date": [], "max_date": []}),
+        }
+
+
+def _iter_batches(source, batch_size: int) -> Iterator[pl.DataFrame]:
+    if source is None:
+        print("⚠️ Skipping an empty source (None)")
+        return
+    if isinstance(source, pd.DataFrame):
+        source = pl.from_pandas(source)
+    if isinstance(source, pl.DataFrame):
+        yield from source.iter_slices(batch_size)
+    elif isinstance(source, (str, pl.LazyFrame)):
+        yield from scan_data(source).collect_batches(chunk_size=batch_size)
+    else:
+        for item in source:
+            yield from _iter_batches(item, batch_size)
+
+
+def streaming_profiling_report(
+    source: Union[str, pl.LazyFrame, pl.DataFrame, Iterable],
+    batch_size: int = 100_000,
+    top_k: int = 10,
+    precision: int = 12,
+    seed: Optional[int] = None,
+) -> Dict[str, pl.DataFrame]:
+    """
+    Profile a larger-than-memory dataset in one streaming pass.
+
+    What this does:
+    - Reads `source` batch by batch (see `StreamingProfiler.update_from`) and
+      returns the tables of `automatic_data_profiling_report`, with distinct
+      counts, median / quantiles and top-k categories estimated from sketches.
+
+    When to use:
+    - Archives that do not fit in memory, or a first look at a very large file.
+
+    Why important:
+    - Bounded memory: a few KB per column, whatever the number of rows.
+
+    Afghanistan example:
+    ```python
+    from huda.validation_and_quality import streaming_profiling_report
+
+    report = streaming_profiling_report("archive/5w_2018_2025/*.parquet", batch_size=250_000)
+    print(report["summary_per_column"])
+    print(report["categorical_details"])
+    ```
+    """
+    try:
+        profiler = StreamingProfiler(top_k=top_k, precision=precision, seed=seed)
+        return profiler.update_from(source, batch_size=batch_size).report()
+    except Exception as e:
+        print("⚠️ Error while profiling the source:", e)
+        return None